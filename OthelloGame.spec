@@ -6,7 +6,12 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=['pygame', 'pygame.mixer', 'pygame.font', 'pygame.freetype'],
+    # AIのモジュールは ai.registry が importlib で遅延読み込みするため明示する
+    hiddenimports=[
+        'pygame', 'pygame.mixer', 'pygame.font', 'pygame.freetype',
+        'ai.random_ai', 'ai.minimax_ai', 'ai.stronger_ai', 'ai.world_class_ai',
+        'ai.mcts_ai',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
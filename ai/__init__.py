@@ -1,7 +1,22 @@
-from ai.ai_strategy import AIStrategy
-from ai.random_ai import RandomAI
-from ai.minimax_ai import MinimaxAI
-from ai.stronger_ai import StrongerAI
-from ai.world_class_ai import WorldAI
+import importlib
 
-__all__ = ["AIStrategy", "RandomAI", "MinimaxAI", "StrongerAI", "WorldAI"]
+# 各AIは初回アクセス時に読み込む（使わないAIのモジュールを読み込まないため）
+_EXPORTS = {
+    "AIStrategy": "ai.ai_strategy",
+    "RandomAI": "ai.random_ai",
+    "MinimaxAI": "ai.minimax_ai",
+    "StrongerAI": "ai.stronger_ai",
+    "WorldAI": "ai.world_class_ai",
+    "MCTSAI": "ai.mcts_ai",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -1,9 +1,3 @@
-import threading
-import time
-from constants import Constants
-from game_logic import GameLogic
-
-
 class AIStrategy:
     """AIの抽象基底クラス"""
 
@@ -13,60 +7,31 @@ class AIStrategy:
         self.thinking = False
         self.show_thinking_indicator = False
         self.thinking_indicator_time = 0
-        self.thread = None  # スレッド参照を保持
+        self.cancelled = False  # True なら思考を打ち切る（対応しているAIのみ）
 
     def get_move(self, board, player):
         """次の一手を返す（サブクラスでオーバーライド）"""
         raise NotImplementedError
 
-    def start_thinking(self):
-        """AIの思考を別スレッドで開始する"""
-        if (
-            not self.thinking
-            and not self.game_logic.state.is_animating
-            and not self.game_logic.state.game_over
-        ):
-
-            # 前のスレッドが存在し、まだ実行中なら終了を待つ
-            if self.thread and self.thread.is_alive():
-                self.thread.join(timeout=0.1)
+    def select_move(self):
+        """現在の局面で打つ手を返す（打てる手が無ければ None）
 
-            self.thread = threading.Thread(target=self.think)
-            self.thread.daemon = True
-            self.thread.start()
+        盤面は変更しないので、ワーカースレッドから呼んでよい（AIExecutor 用）。
+        """
+        return self.get_move()
 
-    def think(self):
-        """AIの思考プロセス（スレッドで実行）"""
-        if self.game_logic.state.game_over:
-            return
+    def cancel(self):
+        """思考の打ち切りを要求する"""
+        self.cancelled = True
 
-        # 思考中フラグを設定
-        self.thinking = True
-        self.show_thinking_indicator = True
+    def close(self):
+        """AIが持つ資源（プロセスプールなど）を手放す（持つAIはサブクラスで拡張する）"""
 
-        try:
-            # ゲーム状態を取得
-            game_state = self.game_logic.get_current_board()
-            self.board = game_state.board  # 実際のボード配列を取得
-            self.player = self.game_logic.state.turn
+    def reset(self, clear_caches=False):
+        """探索ごとの状態（打ち切り要求・思考中フラグ）を戻す
 
-            # AI思考の少し遅延を入れる（UI応答性のため）
-            time.sleep(0.5)
-
-            # 実際の着手処理
-            move = self.get_move(self.board, self.player)
-            if move:
-                self.game_logic.place_stone(*move)
-            elif not self.game_logic.has_valid_move(self.player):
-                # 現在のプレイヤー（AI）が有効な手を持っていない場合はパス
-                self.game_logic.state.switch_turn()
-                self.game_logic.state.set_message("AIがパスしました")
-                self.game_logic.state.pass_occurred = True
-            else:
-                # エラー：AIは手を見つけられなかったが、有効な手はあるはず
-                # この状態は通常発生しないはず
-                self.game_logic.state.set_message("AIエラー: 有効な手が見つかりません")
-        finally:
-            # 例外が発生しても確実に思考終了状態にする
-            self.thinking = False
-            self.show_thinking_indicator = False
\ No newline at end of file
+        探索をまたいで使うキャッシュは残す。clear_caches が True なら
+        それも捨てる（キャッシュを持つAIはサブクラスで拡張する）。
+        """
+        self.cancelled = False
+        self.thinking = False
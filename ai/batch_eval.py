@@ -0,0 +1,78 @@
+"""MinimaxAI の評価関数を NumPy でまとめて計算するモジュール
+
+探索木の最後の1手分の子局面を (白, 黒) の uint64 配列に並べ、
+MinimaxAI.evaluate_board と同じ値を一度に求める。
+合法手の数（モビリティ）は8方向を配列の列に並べて Kogge-Stone 法で数える。
+"""
+
+import numpy as np
+
+from ai.bitboard import SHIFTS
+
+_CORNERS = (1 << 0) | (1 << 7) | (1 << 56) | (1 << 63)
+_EDGES = sum(
+    (1 << (0 * 8 + i)) | (1 << (7 * 8 + i)) | (1 << (i * 8 + 0)) | (1 << (i * 8 + 7))
+    for i in range(1, 7)
+)
+
+# 評価値の重み（evaluate_board と同じ。角は安定石としても数える）
+CORNER_WEIGHT = 10 + 5
+EDGE_WEIGHT = 2
+
+# 8方向を左シフト4方向・右シフト4方向に分け、それぞれ配列の列として並べる
+LEFT_SHIFTS = np.array([s for s, _ in SHIFTS if s > 0], dtype=np.uint64)
+LEFT_MASKS = np.array([m for s, m in SHIFTS if s > 0], dtype=np.uint64)
+RIGHT_SHIFTS = np.array([-s for s, _ in SHIFTS if s < 0], dtype=np.uint64)
+RIGHT_MASKS = np.array([m for s, m in SHIFTS if s < 0], dtype=np.uint64)
+
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+def popcount(bits):
+    """uint64 配列の各要素の立っているビット数"""
+    bits = np.ascontiguousarray(bits, dtype=np.uint64)
+    return _POPCOUNT8[bits.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+def _moves_one_side(own, opponent, shift, amounts, masks):
+    """片側4方向分の合法手（own / opponent は (N, 1) の列）"""
+    gen = own
+    pro = opponent & masks
+    gen = gen | (pro & shift(gen, amounts))
+    pro = pro & shift(pro, amounts)
+    gen = gen | (pro & shift(gen, amounts * np.uint64(2)))
+    pro = pro & shift(pro, amounts * np.uint64(2))
+    gen = gen | (pro & shift(gen, amounts * np.uint64(4)))
+    # own から相手の石をたどった先の1マスが着手できる場所
+    return np.bitwise_or.reduce(shift(gen & ~own, amounts) & masks, axis=1)
+
+
+def legal_moves_batch(own, opponent):
+    """各局面で own の手番が打てるマスのビットボード（uint64 配列）"""
+    own = np.asarray(own, dtype=np.uint64)[:, None]
+    opponent = np.asarray(opponent, dtype=np.uint64)[:, None]
+    moves = _moves_one_side(own, opponent, np.left_shift, LEFT_SHIFTS, LEFT_MASKS)
+    moves |= _moves_one_side(own, opponent, np.right_shift, RIGHT_SHIFTS, RIGHT_MASKS)
+    return moves & ~(own[:, 0] | opponent[:, 0])
+
+
+def evaluate_batch(white, black):
+    """MinimaxAI.evaluate_board と同じ評価値（白視点）を局面ごとに返す"""
+    white = np.asarray(white, dtype=np.uint64)
+    black = np.asarray(black, dtype=np.uint64)
+    # 白番と黒番の合法手を1回で数えるため、(白, 黒) と (黒, 白) を並べる
+    own = np.concatenate((white, black))
+    opponent = np.concatenate((black, white))
+    mobility = popcount(legal_moves_batch(own, opponent))
+    n = len(white)
+
+    corners = np.uint64(_CORNERS)
+    edges = np.uint64(_EDGES)
+    return (
+        popcount(white)
+        - popcount(black)
+        + CORNER_WEIGHT * (popcount(white & corners) - popcount(black & corners))
+        + EDGE_WEIGHT * (popcount(white & edges) - popcount(black & edges))
+        + mobility[:n]
+        - mobility[n:]
+    )
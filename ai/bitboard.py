@@ -0,0 +1,106 @@
+"""盤面をビットボード（64bit整数）で扱うためのヘルパー"""
+
+import random
+
+# AI内部の石の表現（world_class_ai と同じ値）
+AI_BLACK = 1
+AI_WHITE = -1
+AI_EMPTY = 0
+
+
+def board_to_bitboards(board, black_value=AI_BLACK, white_value=AI_WHITE):
+    """2次元配列の盤面を (黒, 白) のビットボードに変換する
+
+    既定では AI形式（1 / -1 / 0）の盤面を想定する。ゲーム側の盤面を変換する
+    場合は black_value / white_value に Constants.BLACK / Constants.WHITE を渡す。
+    マス (r, c) はビット r * 盤面サイズ + c に対応する。
+    """
+    black = 0
+    white = 0
+    bit = 1
+    for row in board:
+        for cell in row:
+            if cell == black_value:
+                black |= bit
+            elif cell == white_value:
+                white |= bit
+            bit <<= 1
+    return black, white
+
+
+def position_key(board, player):
+    """盤面と手番から、プロセスをまたいでも変わらない局面キーを作る"""
+    black, white = board_to_bitboards(board)
+    return black, white, player
+
+
+# 8x8 盤面のビットボード操作（マス (x, y) はビット x * 8 + y）
+FULL_MASK = (1 << 64) - 1
+_NOT_Y0 = FULL_MASK & ~sum(1 << (x * 8) for x in range(8))
+_NOT_Y7 = FULL_MASK & ~sum(1 << (x * 8 + 7) for x in range(8))
+
+# (シフト量, シフト後に残すマス)。正は左シフト、負は右シフト
+SHIFTS = (
+    (1, _NOT_Y0),
+    (8, FULL_MASK),
+    (9, _NOT_Y0),
+    (7, _NOT_Y7),
+    (-1, _NOT_Y7),
+    (-8, FULL_MASK),
+    (-9, _NOT_Y7),
+    (-7, _NOT_Y0),
+)
+
+
+def legal_moves(own, opponent):
+    """own の手番で打てるマスのビットボードを返す"""
+    empty = ~(own | opponent) & FULL_MASK
+    moves = 0
+    for shift, mask in SHIFTS:
+        if shift > 0:
+            line = (own << shift) & mask & opponent
+            for _ in range(5):
+                line |= (line << shift) & mask & opponent
+            moves |= (line << shift) & mask & empty
+        else:
+            shift = -shift
+            line = (own >> shift) & mask & opponent
+            for _ in range(5):
+                line |= (line >> shift) & mask & opponent
+            moves |= (line >> shift) & mask & empty
+    return moves
+
+
+def flip_discs(own, opponent, move):
+    """own がビット move（1ビットだけ立てた整数）に打ったときに返る石を返す"""
+    flipped = 0
+    for shift, mask in SHIFTS:
+        line = 0
+        if shift > 0:
+            square = (move << shift) & mask
+            while square & opponent:
+                line |= square
+                square = (square << shift) & mask
+        else:
+            square = (move >> -shift) & mask
+            while square & opponent:
+                line |= square
+                square = (square >> -shift) & mask
+        if square & own:
+            flipped |= line
+    return flipped
+
+
+def iter_bits(bits):
+    """立っているビットを下位から1つずつ返す"""
+    while bits:
+        bit = bits & -bits
+        yield bit
+        bits ^= bit
+
+
+def random_bit(bits, rng=random):
+    """立っているビットから1つを一様に選ぶ（リストを作らない）"""
+    for _ in range(rng.randrange(bin(bits).count("1"))):
+        bits &= bits - 1
+    return bits & -bits
@@ -0,0 +1,81 @@
+"""盤面サイズごとに WorldAI の探索・評価で使うテーブル
+
+6x6 / 8x8 / 10x10 などの偶数サイズの盤について、
+角・X打ち・C打ちのマス、位置の重み、序盤・中盤の境目、
+各マスの隣接マスと8方向の列（レイ）を前もって作っておく。
+8x8 の位置の重みは従来の POSITION_WEIGHTS と同じ値になる。
+"""
+
+from board import build_rays
+
+DIRECTIONS = [(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)]
+
+_tables = {}
+
+
+def _position_weight(near, far):
+    """端からの距離（近い方 near・遠い方 far）から位置の重みを決める"""
+    if near == 0:
+        # 辺のマス: 角 / C打ち / A打ち / それ以外
+        return {0: 100, 1: -20, 2: 10}.get(far, 5)
+    if near == 1:
+        # 辺の1つ内側: X打ち / それ以外
+        return -50 if far == 1 else -2
+    return -1
+
+
+class BoardTables:
+    """盤面サイズごとのマスの分類と隣接・列のテーブル"""
+
+    def __init__(self, size):
+        if size < 4 or size % 2:
+            raise ValueError(f"盤面サイズは4以上の偶数にしてください: {size}")
+        self.size = size
+        self.squares = size * size
+        last = size - 1
+
+        # 8x8 の「石20個まで序盤、50個まで中盤」を盤の広さに合わせる
+        self.opening_discs = self.squares * 20 // 64
+        self.midgame_discs = self.squares * 50 // 64
+
+        self.corners = [(0, 0), (0, last), (last, 0), (last, last)]
+        self.x_squares = {}
+        self.c_squares = {}
+        for r, c in self.corners:
+            dr = 1 if r == 0 else -1
+            dc = 1 if c == 0 else -1
+            self.x_squares[(r, c)] = [(r + dr, c + dc)]
+            self.c_squares[(r, c)] = [(r, c + dc), (r + dr, c)]
+
+        def distance(i):
+            return min(i, last - i)
+
+        self.position_weights = [
+            [
+                _position_weight(
+                    min(distance(r), distance(c)), max(distance(r), distance(c))
+                )
+                for c in range(size)
+            ]
+            for r in range(size)
+        ]
+
+        self.cells = [(r, c) for r in range(size) for c in range(size)]
+        # neighbours[r][c]: 盤内の隣接マス
+        # rays[r][c]: 8方向それぞれの (r, c) から先のマスの列（石を挟めない長さ1以下は除く）
+        lines = build_rays(size, DIRECTIONS, min_length=1)
+        self.neighbours = [
+            [tuple(line[0] for line in cell) for cell in row] for row in lines
+        ]
+        self.rays = [
+            [tuple(line for line in cell if len(line) >= 2) for cell in row]
+            for row in lines
+        ]
+
+
+def get_board_tables(size=8):
+    """盤面サイズに対応するテーブルを返す（初回のみ作成）"""
+    tables = _tables.get(size)
+    if tables is None:
+        tables = _tables[size] = BoardTables(size)
+    return tables
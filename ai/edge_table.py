@@ -0,0 +1,120 @@
+"""辺（8マス）の全 3^8 = 6561 通りの配置に対する評価値テーブル
+
+各マスの状態を 0: 空き / 1: 自分 / 2: 相手 とし、端から順に
+index = index * 3 + 状態 で求めた3進数を添字にする。
+値は辺の上だけで1次元のオセロを考えたときの確定石から求める。
+辺の空きマスには（他の方向から返せるかもしれないので）どちらの色も
+置けるものとして、どんな手順でも色が変わらない石を確定石とみなす。
+"""
+
+from array import array
+
+EDGE_LENGTH = 8
+EDGE_CONFIGS = 3**EDGE_LENGTH
+
+EMPTY = 0
+OWN = 1
+OPPONENT = 2
+
+# 評価値の重み
+STABLE_VALUE = 5  # 確定石1つあたり
+C_SQUARE_PENALTY = 10  # 隣のコーナーが空いている不安定なC打ち
+
+C_SQUARES = ((1, 0), (EDGE_LENGTH - 2, EDGE_LENGTH - 1))  # (C, 隣のコーナー)
+
+_table = None
+
+
+def edge_index(cells):
+    """状態の並びから添字を求める"""
+    index = 0
+    for cell in cells:
+        index = index * 3 + cell
+    return index
+
+
+def edge_cells(index):
+    """添字から状態の並びを復元する"""
+    cells = []
+    for _ in range(EDGE_LENGTH):
+        index, cell = divmod(index, 3)
+        cells.append(cell)
+    return cells[::-1]
+
+
+def _place(cells, i, color):
+    """1次元の盤で i に color を置いた後の並びと、返った石の位置を返す"""
+    other = OWN + OPPONENT - color
+    cells = list(cells)
+    cells[i] = color
+    flipped = []
+    for step in (-1, 1):
+        line = []
+        j = i + step
+        while 0 <= j < EDGE_LENGTH and cells[j] == other:
+            line.append(j)
+            j += step
+        if line and 0 <= j < EDGE_LENGTH and cells[j] == color:
+            flipped += line
+    for j in flipped:
+        cells[j] = color
+    return tuple(cells), flipped
+
+
+def _solve_unstable(cells, memo):
+    """今後の手順によって色が変わりうるマスの集合（ビット）を返す"""
+    result = memo.get(cells)
+    if result is not None:
+        return result
+    unstable = 0
+    for i, cell in enumerate(cells):
+        if cell != EMPTY:
+            continue
+        for color in (OWN, OPPONENT):
+            next_cells, flipped = _place(cells, i, color)
+            for j in flipped:
+                unstable |= 1 << j
+            unstable |= _solve_unstable(next_cells, memo)
+    # 今空いているマスは「今の色」を持たないので確定石の判定には関係ない
+    memo[cells] = unstable
+    return unstable
+
+
+def stable_mask(cells, memo=None):
+    """配置 cells の確定石の位置（ビット）を返す"""
+    memo = {} if memo is None else memo
+    unstable = _solve_unstable(tuple(cells), memo)
+    occupied = sum(1 << i for i, cell in enumerate(cells) if cell != EMPTY)
+    return occupied & ~unstable
+
+
+def _edge_value(cells, stable):
+    value = 0
+    for i, cell in enumerate(cells):
+        if stable >> i & 1:
+            value += STABLE_VALUE if cell == OWN else -STABLE_VALUE
+    for c, corner in C_SQUARES:
+        if cells[corner] == EMPTY and not stable >> c & 1:
+            if cells[c] == OWN:
+                value -= C_SQUARE_PENALTY
+            elif cells[c] == OPPONENT:
+                value += C_SQUARE_PENALTY
+    return value
+
+
+def build_edge_table():
+    """全配置について評価値（自分視点）を計算し array('h') で返す"""
+    memo = {}
+    table = array("h", bytes(2 * EDGE_CONFIGS))
+    for index in range(EDGE_CONFIGS):
+        cells = edge_cells(index)
+        table[index] = _edge_value(cells, stable_mask(cells, memo))
+    return table
+
+
+def get_edge_table():
+    """評価値テーブルを返す（初回のみ計算する）"""
+    global _table
+    if _table is None:
+        _table = build_edge_table()
+    return _table
@@ -0,0 +1,148 @@
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+# 1レコード: 黒ビットボード, 白ビットボード, 手番, 確定スコア, 最善手(x, y)
+RECORD_FORMAT = "<QQbbbb"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+# 最善手が分からない（スコアのみ確定している）局面の印
+NO_MOVE = (-1, -1)
+
+
+class EndgameDatabase:
+    """終盤完全読みの結果をディスクに永続化するデータベース
+
+    書き込みはファイル末尾への追記のみで、起動時にファイルを走査して
+    局面キー -> ファイル位置 のインデックスをメモリ上に構築する。
+    よく参照される局面は LRU のホットキャッシュに保持する。
+    """
+
+    def __init__(self, path, cache_size=4096):
+        self.path = path
+        self.cache_size = cache_size
+        self.index = {}  # 局面キー -> ファイル内オフセット
+        self.hot_cache = OrderedDict()  # 局面キー -> (スコア, 最善手)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self.open()
+
+    def open(self):
+        """ファイルを開き、既存レコードからインデックスを構築する"""
+        if self._file is not None:
+            return
+        mode = "r+b" if os.path.exists(self.path) else "w+b"
+        self._file = open(self.path, mode)
+        self._build_index()
+
+    def _build_index(self):
+        """ファイル全体を走査してインデックスを作る"""
+        self.index.clear()
+        self._file.seek(0)
+        offset = 0
+        while True:
+            data = self._file.read(RECORD_SIZE)
+            if len(data) < RECORD_SIZE:
+                break
+            black, white, player, _, _, _ = struct.unpack(RECORD_FORMAT, data)
+            key = (black, white, player)
+            entry_offset = self.index.get(key)
+            # スコアのみのレコードより、最善手付きのレコードを優先する
+            if entry_offset is None or self._has_move(data):
+                self.index[key] = offset
+            offset += RECORD_SIZE
+
+        # 書き込み途中で終了した場合の半端なレコードは切り捨てる
+        self._file.truncate(offset)
+        self._file.seek(offset)
+
+    @staticmethod
+    def _has_move(data):
+        _, _, _, _, move_x, move_y = struct.unpack(RECORD_FORMAT, data)
+        return (move_x, move_y) != NO_MOVE
+
+    def close(self):
+        """ファイルを閉じる"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def _remember(self, key, value):
+        """ホットキャッシュに登録し、容量を超えたら古いものから捨てる"""
+        self.hot_cache[key] = value
+        self.hot_cache.move_to_end(key)
+        while len(self.hot_cache) > self.cache_size:
+            self.hot_cache.popitem(last=False)
+
+    def get(self, key):
+        """局面キーに対応する (スコア, 最善手) を返す。無ければ None"""
+        with self._lock:
+            value = self.hot_cache.get(key)
+            if value is not None:
+                self.hot_cache.move_to_end(key)
+                self.hits += 1
+                return value
+
+            offset = self.index.get(key)
+            if offset is None:
+                self.misses += 1
+                return None
+
+            self._file.seek(offset)
+            data = self._file.read(RECORD_SIZE)
+            self._file.seek(0, os.SEEK_END)
+            _, _, _, score, move_x, move_y = struct.unpack(RECORD_FORMAT, data)
+            move = None if (move_x, move_y) == NO_MOVE else (move_x, move_y)
+            value = (score, move)
+            self._remember(key, value)
+            self.hits += 1
+            return value
+
+    def put(self, key, score, move=None):
+        """確定した結果を追記する（既に最善手付きで登録済みなら何もしない）"""
+        with self._lock:
+            offset = self.index.get(key)
+            if offset is not None and (move is None or self._cached_move(key)):
+                return
+
+            black, white, player = key
+            move_x, move_y = move if move is not None else NO_MOVE
+            record = struct.pack(
+                RECORD_FORMAT, black, white, player, int(score), move_x, move_y
+            )
+            self._file.seek(0, os.SEEK_END)
+            self.index[key] = self._file.tell()
+            self._file.write(record)
+            self._file.flush()
+            self._remember(key, (int(score), move))
+
+    def _cached_move(self, key):
+        """登録済みのレコードが最善手を持っているか"""
+        value = self.hot_cache.get(key)
+        if value is not None:
+            return value[1] is not None
+        self._file.seek(self.index[key])
+        data = self._file.read(RECORD_SIZE)
+        self._file.seek(0, os.SEEK_END)
+        return self._has_move(data)
+
+    def hit_rate(self):
+        """参照のヒット率"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
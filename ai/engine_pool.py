@@ -0,0 +1,96 @@
+"""分析・振り返りで使い回すAIエンジンのプール
+
+分析のたびにAIを作り直すと、トランスポジションテーブルなどのキャッシュが
+毎回空から始まる。プールは作ったエンジンを手元に残しておき、次の分析に貸し出す。
+
+    with shared_engine_pool.borrow(Constants.AI_TYPE_WORLD, game_logic) as engine:
+        ...
+
+リセットの扱い:
+- 貸し出すときは、探索ごとの状態（打ち切り要求・思考中フラグなど）だけを戻し、
+  キャッシュは残す（AIStrategy.reset）
+- release(engine, clear_caches=True) で返すと、キャッシュも捨ててから待機させる
+- clear() で待機中のエンジンを全て手放す
+
+トランスポジションテーブルは手番側の視点で値を持つため、エンジンは
+(AIタイプ, 手番) ごとに分けて持つ。
+"""
+
+import threading
+from contextlib import contextmanager
+
+from game_logic import GameLogic
+from ai.registry import create_ai
+
+
+class EnginePool:
+    """AIエンジンを貸し出して返してもらうプール（スレッドから使ってよい）"""
+
+    def __init__(self, max_idle=2):
+        self.max_idle = max_idle  # (AIタイプ, 手番) ごとに待機させておく数
+        self.created = 0  # これまでに作ったエンジンの数
+        self._idle = {}  # (AIタイプ, 手番) -> 待機中のエンジンのリスト
+        self._borrowed = {}  # id(エンジン) -> (AIタイプ, 手番)
+        self._lock = threading.Lock()
+
+    def acquire(self, ai_type, game_logic=None):
+        """ai_type のエンジンを借りる
+
+        game_logic を渡すと、その盤面と手番をエンジン専用の GameLogic に写す
+        （渡した game_logic は変更しない）。
+        """
+        turn = game_logic.state.turn if game_logic is not None else None
+        key = (ai_type, turn)
+        with self._lock:
+            idle = self._idle.get(key)
+            engine = idle.pop() if idle else None
+        if engine is None:
+            engine = create_ai(ai_type, GameLogic())
+            with self._lock:
+                self.created += 1
+
+        logic = engine.game_logic
+        logic.reset()
+        if game_logic is not None:
+            logic.state.board.set_cells(game_logic.board)
+            logic.state.turn = turn
+            logic.state.game_over = game_logic.state.game_over
+        engine.reset()
+        with self._lock:
+            self._borrowed[id(engine)] = key
+        return engine
+
+    def release(self, engine, clear_caches=False):
+        """借りたエンジンを返す（待機数の上限を超えた分は手放す）"""
+        with self._lock:
+            key = self._borrowed.pop(id(engine), None)
+        if key is None:
+            raise ValueError("このプールから借りたエンジンではありません")
+        engine.reset(clear_caches)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(engine)
+
+    @contextmanager
+    def borrow(self, ai_type, game_logic=None):
+        """with 文の間だけエンジンを借りる"""
+        engine = self.acquire(ai_type, game_logic)
+        try:
+            yield engine
+        finally:
+            self.release(engine)
+
+    def idle_count(self):
+        """待機中のエンジンの数"""
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+    def clear(self):
+        """待機中のエンジンを全て手放す（貸し出し中のものは返されたときに待機する）"""
+        with self._lock:
+            self._idle.clear()
+
+
+# 分析・振り返りで共有するプール
+shared_engine_pool = EnginePool()
@@ -0,0 +1,266 @@
+import multiprocessing
+import threading
+import traceback
+from concurrent.futures import Future
+
+from board import CELL_CODES, CODE_COLORS
+
+
+class AIExecutor:
+    """AIの思考をワーカースレッドで実行し、結果を Future で受け渡すクラス
+
+    ワーカーは盤面を変更せず、選んだ手を返すだけにする。コントローラは
+    毎フレーム poll で結果を確かめ、メインスレッドで着手する。
+    """
+
+    def __init__(self, ai):
+        self.ai = ai
+        self.future = None
+        self._thread = None
+
+    @property
+    def busy(self):
+        """結果待ちの思考があるか"""
+        return self.future is not None
+
+    def submit(self):
+        """思考を開始して Future を返す
+
+        打ち切った前回の思考がまだ終わっていない場合は None を返す
+        （同じAIを2つのスレッドで同時に動かさないため）。次のフレームで再度呼ぶこと。
+        """
+        if self.future is not None:
+            return self.future
+        if self._thread is not None and self._thread.is_alive():
+            return None
+
+        self.ai.cancelled = False
+        self.ai.thinking = True
+        self.ai.show_thinking_indicator = True
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self._thread = threading.Thread(target=self._run, args=(future,))
+        self._thread.daemon = True
+        self.future = future
+        self._thread.start()
+        return future
+
+    def _run(self, future):
+        try:
+            future.set_result(self.ai.select_move())
+        except Exception as e:
+            future.set_exception(e)
+
+    def poll(self):
+        """思考が終わっていれば (True, 着手) を、まだなら (False, None) を返す
+
+        着手は (x, y) または打てる手が無い場合の None。
+        思考中に例外が起きた場合はそれを表示して (True, None) を返す。
+        """
+        future = self.future
+        if future is None or not future.done():
+            return False, None
+        self._finish()
+        try:
+            return True, future.result()
+        except Exception as e:
+            print(f"AIの思考中にエラーが発生しました: {e}")
+            traceback.print_exception(e)
+            return True, None
+
+    def cancel(self):
+        """思考を打ち切り、結果を捨てる"""
+        if self.future is None:
+            return
+        self.ai.cancel()
+        self._finish()
+
+    def close(self):
+        """後片付け（スレッドはデーモンなので打ち切り、AIの資源を手放す）"""
+        self.cancel()
+        self.ai.close()
+
+    def _finish(self):
+        self.future = None
+        self.ai.thinking = False
+        self.ai.show_thinking_indicator = False
+
+
+def _process_main(conn, stop_event, cancel_id, ai_class):
+    """子プロセスの本体。局面を受け取って手を選び、結果を返す
+
+    AIとゲームロジックはプロセスが生きている間使い回すので、
+    トランスポジションテーブルなどは温まったままになる。
+    打ち切り要求は監視スレッドが stop_event で受け取り、
+    対象のジョブを思考中であれば ai.cancelled を立てる。
+    """
+    from game_logic import GameLogic
+
+    game_logic = GameLogic()
+    ai = ai_class(game_logic)
+    current = [None]
+
+    def watch_stop():
+        while True:
+            stop_event.wait()
+            stop_event.clear()
+            if cancel_id.value == current[0]:
+                ai.cancel()
+
+    threading.Thread(target=watch_stop, daemon=True).start()
+
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        job_id, data, turn, difficulty = job
+        current[0] = job_id
+        ai.cancelled = cancel_id.value == job_id
+        if difficulty is not None:
+            ai.difficulty = difficulty
+        state = game_logic.state
+        state.board.load_key(data)
+        state.turn = CODE_COLORS[turn]
+        try:
+            conn.send(("result", job_id, ai.select_move()))
+        except Exception as e:
+            conn.send(("error", job_id, f"{e}"))
+    ai.close()
+    conn.close()
+
+
+class ProcessAIExecutor:
+    """AIの思考を常駐する子プロセスで実行するクラス
+
+    AIExecutor と同じ submit / poll / cancel で使える。探索は別プロセスで
+    行うので GIL を奪い合わず、描画ループの FPS が落ちない。
+    子プロセスは最初の submit で1度だけ起動し、盤面は64バイトで送る。
+    ai は描画用のフラグ（thinking など）と難易度の参照にだけ使い、
+    実際に探索するのは子プロセス内の同じクラスのAIである。
+    """
+
+    def __init__(self, ai):
+        self.ai = ai
+        self.process = None
+        self.conn = None
+        self.stop_event = multiprocessing.Event()
+        self.cancel_id = multiprocessing.Value("i", -1)
+        self.job_id = 0
+        # 結果待ちのジョブ / 打ち切ったが子プロセスからまだ戻っていないジョブ
+        self.pending = None
+        self.stale = set()
+
+    @property
+    def busy(self):
+        """結果待ちの思考があるか"""
+        return self.pending is not None
+
+    def start(self):
+        """子プロセスを起動する（起動済みなら何もしない）"""
+        if self.process is not None and self.process.is_alive():
+            return
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_process_main,
+            args=(child_conn, self.stop_event, self.cancel_id, type(self.ai)),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.stale.clear()
+
+    def submit(self):
+        """現在の局面を子プロセスに送り、ジョブ番号を返す
+
+        打ち切った前回の思考がまだ戻っていない場合は None を返す。
+        """
+        if self.pending is not None:
+            return self.pending
+        self._drain()
+        if self.stale:
+            return None
+
+        self.start()
+        self.job_id += 1
+        state = self.ai.game_logic.state
+        job = (
+            self.job_id,
+            state.board.key(),
+            CELL_CODES[state.turn],
+            getattr(self.ai, "difficulty", None),
+        )
+        self.conn.send(job)
+        self.pending = self.job_id
+        self.ai.thinking = True
+        self.ai.show_thinking_indicator = True
+        return self.pending
+
+    def _drain(self):
+        """届いている古いジョブの結果を読み捨てる"""
+        while self.stale and self._receive() is not None:
+            pass
+
+    def _receive(self):
+        """届いているメッセージを1つ読む（無ければ None）
+
+        子プロセスが落ちていた場合は待ちのジョブを全てエラーとして扱う。
+        """
+        try:
+            if not self.conn.poll():
+                return None
+            kind, job_id, value = self.conn.recv()
+        except (EOFError, OSError):
+            self.process = None
+            self.stale.clear()
+            if self.pending is None:
+                return None
+            return "error", self.pending, "子プロセスが終了しました"
+        self.stale.discard(job_id)
+        return kind, job_id, value
+
+    def poll(self):
+        """思考が終わっていれば (True, 着手) を、まだなら (False, None) を返す"""
+        if self.pending is None:
+            self._drain()
+            return False, None
+        while True:
+            message = self._receive()
+            if message is None:
+                return False, None
+            kind, job_id, value = message
+            if job_id == self.pending:
+                break
+        self._finish()
+        if kind == "error":
+            print(f"AIの思考中にエラーが発生しました: {value}")
+            return True, None
+        return True, value
+
+    def cancel(self):
+        """思考を打ち切り、結果を捨てる"""
+        if self.pending is None:
+            return
+        self.cancel_id.value = self.pending
+        self.stop_event.set()
+        self.stale.add(self.pending)
+        self._finish()
+
+    def close(self):
+        """子プロセスを終了する"""
+        self.cancel()
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        self.ai.close()
+
+    def _finish(self):
+        self.pending = None
+        self.ai.thinking = False
+        self.ai.show_thinking_indicator = False
@@ -0,0 +1,443 @@
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from constants import Constants
+from ai.ai_strategy import AIStrategy
+from ai.bitboard import (
+    AI_BLACK,
+    AI_WHITE,
+    board_to_bitboards,
+    flip_discs,
+    iter_bits,
+    legal_moves,
+    random_bit,
+)
+
+
+def _squares(*squares):
+    return sum(1 << (x * 8 + y) for x, y in squares)
+
+
+CORNERS = _squares((0, 0), (0, 7), (7, 0), (7, 7))
+X_SQUARES = _squares((1, 1), (1, 6), (6, 1), (6, 6))
+C_SQUARES = _squares((0, 1), (1, 0), (0, 6), (1, 7), (6, 0), (7, 1), (6, 7), (7, 6))
+
+# PUCT の事前確率に使うマスの重み（正規化して使う）
+CORNER_PRIOR = 4.0
+X_SQUARE_PRIOR = 0.25
+C_SQUARE_PRIOR = 0.5
+
+SELECTION_UCT = "uct"
+SELECTION_PUCT = "puct"
+PLAYOUT_RANDOM = "random"
+PLAYOUT_BIASED = "biased"
+
+
+def _count(bits):
+    return bin(bits).count("1")
+
+
+def _play(black, white, player, move):
+    """player が move（ビット、0 ならパス）を打った後の (黒, 白)"""
+    if not move:
+        return black, white
+    if player == AI_BLACK:
+        flipped = flip_discs(black, white, move)
+        return black | move | flipped, white & ~flipped
+    flipped = flip_discs(white, black, move)
+    return black & ~flipped, white | move | flipped
+
+
+def _winner(black, white):
+    """終局時の勝者（AI_BLACK / AI_WHITE、引き分けは 0）"""
+    diff = _count(black) - _count(white)
+    if diff > 0:
+        return AI_BLACK
+    if diff < 0:
+        return AI_WHITE
+    return 0
+
+
+def playout(black, white, player, rng, policy=PLAYOUT_RANDOM):
+    """終局までランダムに打ち進めて勝者を返す
+
+    policy が "biased" の場合は、角が打てれば角を打ち、
+    他に手があれば X 打ちを避ける（それ以外はランダム）。
+    """
+    passed = False
+    while True:
+        if player == AI_BLACK:
+            moves = legal_moves(black, white)
+        else:
+            moves = legal_moves(white, black)
+        if not moves:
+            if passed:
+                return _winner(black, white)
+            passed = True
+            player = -player
+            continue
+        passed = False
+        if policy == PLAYOUT_BIASED:
+            if moves & CORNERS:
+                moves &= CORNERS
+            elif moves & ~X_SQUARES:
+                moves &= ~X_SQUARES
+        move = random_bit(moves, rng)
+        black, white = _play(black, white, player, move)
+        player = -player
+
+
+def _prior(move):
+    if move & CORNERS:
+        return CORNER_PRIOR
+    if move & X_SQUARES:
+        return X_SQUARE_PRIOR
+    if move & C_SQUARES:
+        return C_SQUARE_PRIOR
+    return 1.0
+
+
+class Node:
+    """探索木のノード。wins は直前に打った側（親の手番）から見た勝ち数"""
+
+    __slots__ = (
+        "move",
+        "parent",
+        "children",
+        "black",
+        "white",
+        "player",
+        "visits",
+        "wins",
+        "prior",
+    )
+
+    def __init__(self, black, white, player, move=None, parent=None, prior=1.0):
+        self.move = move  # 親からこのノードへの手（ビット、0 はパス）
+        self.parent = parent
+        self.children = None  # 未展開なら None、終局なら空リスト
+        self.black = black
+        self.white = white
+        self.player = player  # このノードで手番の側
+        self.visits = 0
+        self.wins = 0.0
+        self.prior = prior
+
+    def expand(self):
+        """子ノードを全て作る（打てる手が無ければパスのノードを1つ作る）"""
+        if self.player == AI_BLACK:
+            moves = legal_moves(self.black, self.white)
+        else:
+            moves = legal_moves(self.white, self.black)
+        self.children = []
+        if not moves:
+            if self.player == AI_BLACK:
+                opponent_moves = legal_moves(self.white, self.black)
+            else:
+                opponent_moves = legal_moves(self.black, self.white)
+            if opponent_moves:
+                self.children.append(
+                    Node(self.black, self.white, -self.player, 0, self)
+                )
+            return
+        total = sum(_prior(move) for move in iter_bits(moves))
+        for move in iter_bits(moves):
+            black, white = _play(self.black, self.white, self.player, move)
+            self.children.append(
+                Node(black, white, -self.player, move, self, _prior(move) / total)
+            )
+
+
+class MCTSSearch:
+    """1本の探索木と、その上でのプレイアウトの繰り返し
+
+    GameLogic に依存しないので、ルート並列のワーカープロセスでもそのまま使う。
+    """
+
+    def __init__(
+        self,
+        black,
+        white,
+        player,
+        rng=None,
+        exploration=1.4,
+        selection=SELECTION_UCT,
+        policy=PLAYOUT_BIASED,
+    ):
+        self.root = Node(black, white, player)
+        self.rng = rng or random.Random()
+        self.exploration = exploration
+        self.selection = selection
+        self.policy = policy
+        self.playouts = 0
+
+    def reroot(self, black, white, player):
+        """現在の局面が前回の木の2手先以内にあれば、その部分木を使い回す
+
+        見つかれば True、見つからなければ新しい木にして False を返す。
+        """
+        frontier = [self.root]
+        for _ in range(3):
+            next_frontier = []
+            for node in frontier:
+                if (node.black, node.white, node.player) == (black, white, player):
+                    node.parent = None
+                    node.move = None
+                    self.root = node
+                    return True
+                next_frontier.extend(node.children or ())
+            frontier = next_frontier
+        self.root = Node(black, white, player)
+        return False
+
+    def _select_child(self, node):
+        log_visits = math.log(node.visits) if node.visits else 0.0
+        sqrt_visits = math.sqrt(node.visits)
+        best = None
+        best_value = -math.inf
+        for child in node.children:
+            if self.selection == SELECTION_PUCT:
+                q = child.wins / child.visits if child.visits else 0.5
+                value = q + self.exploration * child.prior * sqrt_visits / (
+                    1 + child.visits
+                )
+            elif not child.visits:
+                return child
+            else:
+                value = child.wins / child.visits + self.exploration * math.sqrt(
+                    log_visits / child.visits
+                )
+            if value > best_value:
+                best_value = value
+                best = child
+        return best
+
+    def iterate(self):
+        """選択・展開・プレイアウト・逆伝播を1回行う"""
+        node = self.root
+        while node.children:
+            node = self._select_child(node)
+        if node.children is None and node.visits:
+            node.expand()
+            if node.children:
+                node = self._select_child(node)
+
+        if node.children == []:
+            winner = _winner(node.black, node.white)
+        else:
+            winner = playout(node.black, node.white, node.player, self.rng, self.policy)
+
+        while node is not None:
+            node.visits += 1
+            mover = -node.player
+            if winner == mover:
+                node.wins += 1.0
+            elif winner == 0:
+                node.wins += 0.5
+            node = node.parent
+        self.playouts += 1
+
+    def run(self, deadline, max_playouts=None, should_stop=None):
+        """期限（time.time() の値）まで、または max_playouts 回まで探索する"""
+        if self.root.children is None:
+            self.root.expand()
+        count = 0
+        while max_playouts is None or count < max_playouts:
+            # 時刻の確認は数回に1回にする
+            if count % 16 == 0:
+                if time.time() >= deadline or (should_stop and should_stop()):
+                    break
+            self.iterate()
+            count += 1
+        return count
+
+    def root_stats(self):
+        """ルートの手ごとの (訪問回数, 勝ち数)"""
+        return {
+            child.move: (child.visits, child.wins) for child in self.root.children or ()
+        }
+
+
+# 続けてよい探索の番号（MCTSAI と共有する。_init_worker で設定する）
+_worker_search_id = None
+
+
+def _init_worker(search_id):
+    """ワーカープロセスの初期化。MCTSAI.cancel() の合図を受け取れるようにする"""
+    global _worker_search_id
+    _worker_search_id = search_id
+
+
+def _search_worker(
+    black, white, player, time_limit, max_playouts, seed, options, search_id=None
+):
+    """ルート並列のワーカー。独立した木で探索してルートの統計を返す
+
+    共有の探索番号が search_id でなくなったら（打ち切られた・次の探索が
+    始まった）そこで止める。
+    """
+    search = MCTSSearch(black, white, player, random.Random(seed), **options)
+    should_stop = None
+    if _worker_search_id is not None and search_id is not None:
+        should_stop = lambda: _worker_search_id.value != search_id
+    search.run(time.time() + time_limit, max_playouts, should_stop)
+    return search.root_stats()
+
+
+class MCTSAI(AIStrategy):
+    """モンテカルロ木探索で手を選ぶAI
+
+    selection は "uct"（UCB1）か "puct"（角を重くした事前確率つき）、
+    policy はプレイアウトの打ち方で "random" か "biased"。
+    前回の探索木は、実際に進んだ局面の部分木として次の手番で使い回す。
+    workers が2以上なら、残りのプロセスでも独立に探索し（ルート並列）、
+    手ごとの訪問回数を合計して選ぶ。
+    """
+
+    def __init__(
+        self,
+        game_logic,
+        time_limit=None,
+        workers=1,
+        selection=SELECTION_UCT,
+        policy=PLAYOUT_BIASED,
+        exploration=1.4,
+        max_playouts=None,
+        seed=None,
+    ):
+        super().__init__(game_logic)
+        self.game_logic = game_logic
+        self.thinking = False
+        self.cancelled = False
+        self.difficulty = 2
+        self.time_limit = time_limit  # None なら難易度から決める
+        self.workers = workers
+        self.selection = selection
+        self.policy = policy
+        self.exploration = exploration
+        self.max_playouts = max_playouts
+        self.rng = random.Random(seed)
+        self.search = None
+        self.pool = None
+        # ワーカープロセスと共有する、続けてよい探索の番号（0 なら全て止める）
+        self.search_id = None
+        self.searches = 0  # これまでに始めたルート並列の探索の数
+        self.last_playouts = 0
+
+    def reset(self, clear_caches=False):
+        """探索ごとの状態を戻す（clear_caches なら使い回す探索木とプールも捨てる）"""
+        super().reset(clear_caches)
+        if clear_caches:
+            self.search = None
+            self.close()
+
+    def cancel(self):
+        """思考の打ち切りを要求する（ワーカープロセスの探索も止める）"""
+        super().cancel()
+        if self.search_id is not None:
+            self.search_id.value = 0
+
+    def close(self):
+        """ルート並列用のプロセスプールを終了する（次の探索で作り直す）"""
+        if self.pool is None:
+            return
+        self.search_id.value = 0
+        self.pool.shutdown(cancel_futures=True)
+        self.pool = None
+        self.search_id = None
+
+    def _time_limit(self):
+        """思考時間（秒）"""
+        if self.time_limit is not None:
+            return self.time_limit
+        if self.difficulty == 2:
+            return 3
+        if self.difficulty >= 3:
+            return 5
+        return 1
+
+    def _options(self):
+        return {
+            "exploration": self.exploration,
+            "selection": self.selection,
+            "policy": self.policy,
+        }
+
+    def _get_pool(self):
+        """ルート並列用のプロセスプール（デーモンプロセス内では作れないので None）"""
+        if self.workers <= 1 or multiprocessing.current_process().daemon:
+            return None
+        if self.pool is None:
+            self.search_id = multiprocessing.Value("i", 0)
+            self.pool = ProcessPoolExecutor(
+                self.workers - 1,
+                initializer=_init_worker,
+                initargs=(self.search_id,),
+            )
+        return self.pool
+
+    def get_move(self):
+        """現在の局面で打つ手 (x, y) を返す（打てる手が無ければ None）"""
+        state = self.game_logic.state
+        black, white = board_to_bitboards(state.board.code_rows())
+        player = AI_BLACK if state.turn == Constants.BLACK else AI_WHITE
+        own, opponent = (black, white) if player == AI_BLACK else (white, black)
+        moves = legal_moves(own, opponent)
+        if not moves:
+            return None
+        if not moves & (moves - 1):
+            # 打てる手が1つしかなければ探索しない
+            index = moves.bit_length() - 1
+            return divmod(index, Constants.BOARD_SIZE)
+
+        if self.search is None or not self.search.reroot(black, white, player):
+            self.search = MCTSSearch(black, white, player, self.rng, **self._options())
+
+        time_limit = self._time_limit()
+        futures = []
+        pool = self._get_pool()
+        if pool is not None and not self.cancelled:
+            # 探索ごとに番号を変える（前の探索のジョブが残っていてもすぐ止まる）
+            self.searches += 1
+            search_id = self.searches
+            self.search_id.value = search_id
+            if self.cancelled:
+                # 番号を変える前に打ち切りが要求されていた
+                self.search_id.value = 0
+            for _ in range(self.workers - 1):
+                futures.append(
+                    pool.submit(
+                        _search_worker,
+                        black,
+                        white,
+                        player,
+                        time_limit,
+                        self.max_playouts,
+                        self.rng.getrandbits(32),
+                        self._options(),
+                        search_id,
+                    )
+                )
+
+        self.last_playouts = self.search.run(
+            time.time() + time_limit, self.max_playouts, lambda: self.cancelled
+        )
+        stats = {move: visits for move, (visits, _) in self.search.root_stats().items()}
+        for future in futures:
+            if self.cancelled:
+                break
+            for move, (visits, _) in future.result().items():
+                stats[move] = stats.get(move, 0) + visits
+        if self.cancelled and futures:
+            # 始まっていないジョブは取り消し、動いているジョブは止まるのを待つ
+            # （止まった探索のジョブがプールを塞いだまま次の探索に入らないように）
+            for future in futures:
+                future.cancel()
+            wait(futures)
+
+        best = max(stats, key=stats.get)
+        index = best.bit_length() - 1
+        return divmod(index, Constants.BOARD_SIZE)
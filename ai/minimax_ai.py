@@ -1,7 +1,12 @@
 import math
-import threading
 from constants import Constants
 from ai.ai_strategy import AIStrategy
+from ai.bitboard import board_to_bitboards, flip_discs, iter_bits, legal_moves
+
+try:
+    from ai.batch_eval import evaluate_batch
+except ImportError:  # NumPy が無い環境では1局面ずつ評価する
+    evaluate_batch = None
 
 
 class MinimaxAI(AIStrategy):
@@ -96,6 +101,63 @@ class MinimaxAI(AIStrategy):
                     break
             return min_eval
 
+    def minimax_batched(
+        self, white, black, depth, maximizing_player, alpha=-math.inf, beta=math.inf
+    ):
+        """minimax と同じ探索をビットボードで行い、最後の1手の子局面はまとめて評価する
+
+        評価値は evaluate_board と同じ。打てる手が無い（パス）局面の扱いも minimax に合わせる。
+        """
+        if maximizing_player:
+            own, opponent = white, black
+        else:
+            own, opponent = black, white
+        moves = legal_moves(own, opponent)
+        if depth == 0 or (not moves and not legal_moves(opponent, own)):
+            return int(evaluate_batch([white], [black])[0])
+
+        children = []
+        for move in iter_bits(moves):
+            flipped = flip_discs(own, opponent, move)
+            new_own = own | move | flipped
+            new_opponent = opponent & ~flipped
+            if maximizing_player:
+                children.append((new_own, new_opponent))
+            else:
+                children.append((new_opponent, new_own))
+
+        if depth == 1:
+            # 葉の評価を1回の配列演算で済ませる
+            if not children:
+                return -math.inf if maximizing_player else math.inf
+            values = evaluate_batch(
+                [child[0] for child in children], [child[1] for child in children]
+            )
+            return int(values.max() if maximizing_player else values.min())
+
+        if maximizing_player:
+            max_eval = -math.inf
+            for child_white, child_black in children:
+                eval_value = self.minimax_batched(
+                    child_white, child_black, depth - 1, False, alpha, beta
+                )
+                max_eval = max(max_eval, eval_value)
+                alpha = max(alpha, eval_value)
+                if beta <= alpha:
+                    break
+            return max_eval
+        else:
+            min_eval = math.inf
+            for child_white, child_black in children:
+                eval_value = self.minimax_batched(
+                    child_white, child_black, depth - 1, True, alpha, beta
+                )
+                min_eval = min(min_eval, eval_value)
+                beta = min(beta, eval_value)
+                if beta <= alpha:
+                    break
+            return min_eval
+
     def get_move(self):
         """ミニマックスで最適手を選択"""
         valid_moves = self.game_logic.get_valid_moves(Constants.WHITE)
@@ -104,54 +166,24 @@ class MinimaxAI(AIStrategy):
 
         best_score = -math.inf
         move_selected = None
+        board = self.game_logic.state.board.cells
+        if evaluate_batch is not None:
+            black, white = board_to_bitboards(board, Constants.BLACK, Constants.WHITE)
 
         for move in valid_moves:
-            new_board = self.game_logic.make_move_for_board(
-                self.game_logic.state.board.cells, move[0], move[1], Constants.WHITE
-            )
-            score = self.minimax(new_board, self.depth - 1, False)
+            if evaluate_batch is not None:
+                bit = 1 << (move[0] * Constants.BOARD_SIZE + move[1])
+                flipped = flip_discs(white, black, bit)
+                score = self.minimax_batched(
+                    white | bit | flipped, black & ~flipped, self.depth - 1, False
+                )
+            else:
+                new_board = self.game_logic.make_move_for_board(
+                    board, move[0], move[1], Constants.WHITE
+                )
+                score = self.minimax(new_board, self.depth - 1, False)
             if score > best_score:
                 best_score = score
                 move_selected = move
 
         return move_selected
-
-    def think_and_move(self, board, player, time_limit):
-        """AIが思考して手を選ぶ処理"""
-        try:
-            # 引数なしでget_moveを呼び出す
-            move = self.get_move()
-            if move is not None:
-                # game_logicの形式に合わせて手を変換して適用
-                grid_x, grid_y = move
-                self.game_logic.place_stone(grid_x, grid_y)
-            else:
-                # 有効な手がない場合（パス）
-                self.game_logic.pass_turn()
-        except Exception as e:
-            print(f"AIの思考中にエラーが発生しました: {e}")
-        finally:
-            self.thinking = False
-
-    def start_thinking(self):
-        """AIの思考プロセスを開始する"""
-        self.thinking = True
-
-        # ゲームロジックから現在のボード状態とプレイヤーを取得
-        board = self.game_logic.state.board
-        player = Constants.WHITE  # AIは白石として定義されている
-
-        # 適切な思考時間に基づいて手を選択
-        difficulty = getattr(self.game_logic.state, "difficulty", 1)  # 安全に取得
-        time_limit = 1
-        if difficulty == 2:
-            time_limit = 3
-        elif difficulty == 3:
-            time_limit = 8
-
-        # 別スレッドで思考処理を実行し、UIをブロックしないように
-        thinking_thread = threading.Thread(
-            target=self.think_and_move, args=(board, player, time_limit)
-        )
-        thinking_thread.daemon = True  # メインプログラム終了時にスレッドも終了
-        thinking_thread.start()
\ No newline at end of file
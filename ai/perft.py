@@ -0,0 +1,184 @@
+"""合法手生成の検証と速度計測（perft）
+
+指定した局面から深さ N までの末端局面の数を、プロジェクト内の各合法手生成で
+数えて突き合わせる。パスは1手として数え、途中で終局した局面は末端1つとして数える。
+初期局面からの値は既知の値（KNOWN_COUNTS）とも比べる。
+
+    python -m ai.perft --depth 6
+    python -m ai.perft --depth 5 --moves f5d6c3 --generators bitboard numpy
+"""
+
+import argparse
+import time
+
+from constants import Constants
+from game_logic import GameLogic
+from game_record import GameRecord
+from ai.bitboard import board_to_bitboards, flip_discs, iter_bits, legal_moves
+from ai.world_class_ai import WorldAI
+
+# 初期局面からの末端局面数（深さ 1 から）
+KNOWN_COUNTS = (4, 12, 56, 244, 1396, 8200, 55092, 390216)
+
+
+def _opponent(color):
+    return Constants.WHITE if color == Constants.BLACK else Constants.BLACK
+
+
+def perft_game_logic(cells, color, depth, rules=None):
+    """GameLogic.get_valid_moves / make_move_for_board で数える"""
+    rules = rules or GameLogic()
+    if depth == 0:
+        return 1
+    moves = rules.get_valid_moves(color, cells)
+    if not moves:
+        if not rules.get_valid_moves(_opponent(color), cells):
+            return 1
+        return perft_game_logic(cells, _opponent(color), depth - 1, rules)
+    return sum(
+        perft_game_logic(
+            rules.make_move_for_board(cells, x, y, color),
+            _opponent(color),
+            depth - 1,
+            rules,
+        )
+        for x, y in moves
+    )
+
+
+def perft_world(board, player, depth, ai=None):
+    """WorldAI.get_valid_moves / make_move で数える（board は AI形式）"""
+    ai = ai or WorldAI(None)
+    if depth == 0:
+        return 1
+    moves = ai.get_valid_moves(board, player)
+    if not moves:
+        if not ai.get_valid_moves(board, -player):
+            return 1
+        return perft_world(board, -player, depth - 1, ai)
+    return sum(
+        perft_world(ai.make_move(board, move, player), -player, depth - 1, ai)
+        for move in moves
+    )
+
+
+def perft_bitboard(own, opponent, depth):
+    """ai.bitboard の legal_moves / flip_discs で数える（最後の1手は数えるだけ）"""
+    moves = legal_moves(own, opponent)
+    if not moves:
+        if not legal_moves(opponent, own):
+            return 1
+        return perft_bitboard(opponent, own, depth - 1) if depth > 1 else 1
+    if depth == 1:
+        return bin(moves).count("1")
+    nodes = 0
+    for move in iter_bits(moves):
+        flipped = flip_discs(own, opponent, move)
+        nodes += perft_bitboard(opponent & ~flipped, own | move | flipped, depth - 1)
+    return nodes
+
+
+def perft_numpy(own, opponent, depth):
+    """ai.batch_eval / ai.playout の配列版で、深さごとにまとめて展開して数える"""
+    import numpy as np
+
+    from ai.batch_eval import legal_moves_batch, popcount
+    from ai.playout import flips_batch
+
+    squares = np.arange(64, dtype=np.uint64)
+    own = np.array([own], dtype=np.uint64)
+    opponent = np.array([opponent], dtype=np.uint64)
+    nodes = 0
+    for level in range(depth):
+        moves = legal_moves_batch(own, opponent)
+        stuck = moves == 0
+        passed_own = opponent[stuck]
+        passed_opponent = own[stuck]
+        over = legal_moves_batch(passed_own, passed_opponent) == 0
+        nodes += int(over.sum())
+        passed_own = passed_own[~over]
+        passed_opponent = passed_opponent[~over]
+        if level == depth - 1:
+            nodes += int(popcount(moves).sum()) + len(passed_own)
+            break
+        parents, indices = np.nonzero((moves[:, None] >> squares) & np.uint64(1))
+        move = np.uint64(1) << indices.astype(np.uint64)
+        parent_own = own[parents]
+        parent_opponent = opponent[parents]
+        flipped = flips_batch(parent_own, parent_opponent, move)
+        own = np.concatenate((parent_opponent & ~flipped, passed_own))
+        opponent = np.concatenate((parent_own | move | flipped, passed_opponent))
+    else:
+        nodes += len(own)
+    return nodes
+
+
+GENERATORS = ("game_logic", "world", "bitboard", "numpy")
+
+
+def perft(cells, color, depth, generator="bitboard"):
+    """cells（ゲーム側の盤面）で color の手番から深さ depth の末端局面数を返す"""
+    if generator == "game_logic":
+        return perft_game_logic(cells, color, depth)
+    if generator == "world":
+        ai = WorldAI(None)
+        board = ai._convert_board(cells)
+        return perft_world(board, ai._convert_to_ai_player(color), depth, ai)
+    black, white = board_to_bitboards(cells, Constants.BLACK, Constants.WHITE)
+    own, opponent = (black, white) if color == Constants.BLACK else (white, black)
+    if generator == "bitboard":
+        return perft_bitboard(own, opponent, depth) if depth else 1
+    if generator == "numpy":
+        return perft_numpy(own, opponent, depth)
+    raise ValueError(f"不明な合法手生成です: {generator}")
+
+
+def benchmark(cells, color, depth, generators=GENERATORS):
+    """各合法手生成で数えて [(名前, 末端局面数, 秒)] を返す"""
+    results = []
+    for generator in generators:
+        start = time.perf_counter()
+        nodes = perft(cells, color, depth, generator)
+        results.append((generator, nodes, time.perf_counter() - start))
+    return results
+
+
+def position_from_moves(transcript):
+    """ "f5d6..." 形式の手順を打った後の (盤面, 手番) を返す"""
+    record = GameRecord.from_transcript(transcript)
+    if not record.moves:
+        return GameLogic().board, Constants.BLACK
+    return record.final_board(), _opponent(record.moves[-1]["color"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合法手生成の検証と速度計測 (perft)")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--moves", default="", help="開始局面までの手順（例: f5d6c3）")
+    parser.add_argument(
+        "--generators", nargs="+", choices=GENERATORS, default=list(GENERATORS)
+    )
+    args = parser.parse_args()
+
+    cells, color = position_from_moves(args.moves)
+    expected = None
+    if not args.moves and 1 <= args.depth <= len(KNOWN_COUNTS):
+        expected = KNOWN_COUNTS[args.depth - 1]
+
+    results = benchmark(cells, color, args.depth, args.generators)
+    ok = True
+    for generator, nodes, seconds in results:
+        rate = nodes / seconds if seconds > 0 else float("inf")
+        print(f"{generator:<12}{nodes:>12}{seconds:>10.3f}s{rate:>14,.0f} nodes/s")
+        if expected is not None and nodes != expected:
+            ok = False
+    if len({nodes for _, nodes, _ in results}) > 1:
+        ok = False
+    if expected is not None:
+        print(f"既知の値: {expected}")
+    print("OK" if ok else "不一致があります")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
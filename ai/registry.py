@@ -0,0 +1,34 @@
+"""AIタイプ（Constants.AI_TYPE_*）から AI クラスを引く登録表
+
+各AIのモジュールは、そのタイプのAIを初めて作るときに読み込む。
+起動時に使わないAI（とその評価テーブル）を読み込まないため。
+"""
+
+import importlib
+
+from constants import Constants
+
+# AIタイプ -> (モジュール名, クラス名)
+AI_MODULES = {
+    Constants.AI_TYPE_RANDOM: ("ai.random_ai", "RandomAI"),
+    Constants.AI_TYPE_MINIMAX: ("ai.minimax_ai", "MinimaxAI"),
+    Constants.AI_TYPE_STRONGER: ("ai.stronger_ai", "StrongerAI"),
+    Constants.AI_TYPE_WORLD: ("ai.world_class_ai", "WorldAI"),
+    Constants.AI_TYPE_MCTS: ("ai.mcts_ai", "MCTSAI"),
+}
+
+AI_TYPES = tuple(AI_MODULES)
+
+
+def get_ai_class(ai_type):
+    """AIタイプに対応するクラスを返す（モジュールは初回のみ読み込む）"""
+    entry = AI_MODULES.get(ai_type)
+    if entry is None:
+        raise ValueError(f"不明なAIタイプです: {ai_type}")
+    module_name, class_name = entry
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_ai(ai_type, game_logic, **kwargs):
+    """AIタイプに対応するAIを game_logic に対して作る"""
+    return get_ai_class(ai_type)(game_logic, **kwargs)
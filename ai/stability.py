@@ -0,0 +1,124 @@
+"""ビットボード上で確定石（今後絶対に返されない石）を求める
+
+マス (r, c) はビット r * size + c（ai.bitboard と同じ並び）。
+石が確定しているのは、縦・横・2つの斜めの4方向それぞれについて
+  - その方向の列が全て埋まっている
+  - その方向のどちらかの隣が盤の外
+  - その方向のどちらかの隣が同じ色の確定石
+のいずれかが成り立つとき。確定石が増えなくなるまでこれを繰り返す。
+"""
+
+from ai.bitboard import board_to_bitboards, AI_BLACK, AI_WHITE
+
+_tables = {}
+
+
+class StabilityTables:
+    """盤面サイズごとの列マスクと端マスク"""
+
+    def __init__(self, size):
+        self.size = size
+        n = size
+        self.full = (1 << (n * n)) - 1
+
+        def bit(r, c):
+            return 1 << (r * n + c)
+
+        def line(r, c, dr, dc):
+            mask = 0
+            while 0 <= r < n and 0 <= c < n:
+                mask |= bit(r, c)
+                r += dr
+                c += dc
+            return mask
+
+        # 4方向それぞれについて、盤上の全ての列のマスク
+        rows = [line(r, 0, 0, 1) for r in range(n)]
+        cols = [line(0, c, 1, 0) for c in range(n)]
+        diagonals = [line(r, 0, 1, 1) for r in range(n)] + [
+            line(0, c, 1, 1) for c in range(1, n)
+        ]
+        anti_diagonals = [line(r, n - 1, 1, -1) for r in range(n)] + [
+            line(0, c, 1, -1) for c in range(n - 1)
+        ]
+        self.lines = (rows, cols, diagonals, anti_diagonals)
+
+        first_col = cols[0]
+        last_col = cols[-1]
+        first_row = rows[0]
+        last_row = rows[-1]
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~last_col
+        border = first_col | last_col | first_row | last_row
+        # 各方向について、隣が盤の外になるマス
+        self.edges = (first_col | last_col, first_row | last_row, border, border)
+        self.corners = bit(0, 0) | bit(0, n - 1) | bit(n - 1, 0) | bit(n - 1, n - 1)
+
+
+def get_tables(size=8):
+    """盤面サイズに対応するテーブルを返す（初回のみ作成）"""
+    tables = _tables.get(size)
+    if tables is None:
+        tables = _tables[size] = StabilityTables(size)
+    return tables
+
+
+def full_lines(occupied, tables):
+    """方向ごとに「その方向の列が全て埋まっているマス」を返す"""
+    result = []
+    for lines in tables.lines:
+        mask = 0
+        for line in lines:
+            if occupied & line == line:
+                mask |= line
+        result.append(mask)
+    return result
+
+
+def stable_discs(own, opponent, size=8):
+    """own の石のうち確定石のビットボードを返す"""
+    if not own:
+        return 0
+    tables = get_tables(size)
+    n = size
+    full = tables.full
+    not_first = tables.not_first_col
+    not_last = tables.not_last_col
+    full_h, full_v, full_d, full_a = full_lines(own | opponent, tables)
+    edge_h, edge_v, edge_d, edge_a = tables.edges
+    base_h = full_h | edge_h
+    base_v = full_v | edge_v
+    base_d = full_d | edge_d
+    base_a = full_a | edge_a
+
+    stable = 0
+    while True:
+        # 確定石の隣（方向ごと）
+        next_h = ((stable << 1) & not_first) | ((stable >> 1) & not_last)
+        next_v = ((stable << n) | (stable >> n)) & full
+        next_d = ((stable << (n + 1)) & not_first) | ((stable >> (n + 1)) & not_last)
+        next_a = ((stable << (n - 1)) & not_last) | ((stable >> (n - 1)) & not_first)
+        new_stable = (
+            own
+            & (base_h | next_h)
+            & (base_v | next_v)
+            & (base_d | next_d)
+            & (base_a | next_a)
+            & full
+        )
+        if new_stable == stable:
+            return stable
+        stable = new_stable
+
+
+def count_stable(own, opponent, size=8):
+    """own の確定石の数を返す"""
+    return bin(stable_discs(own, opponent, size)).count("1")
+
+
+def board_stability(board, player):
+    """AI形式（1 / -1 / 0）の盤面で player の確定石の数を返す"""
+    black, white = board_to_bitboards(board)
+    if player == AI_BLACK:
+        return count_stable(black, white, len(board))
+    return count_stable(white, black, len(board))
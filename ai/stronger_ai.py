@@ -1,9 +1,108 @@
 import math
 import random
-import pygame
-import threading
+from array import array
+from types import MappingProxyType
 from constants import Constants
+from board import CELL_CODES
 from ai.ai_strategy import AIStrategy
+from ai.bitboard import board_to_bitboards
+from ai.edge_table import OPPONENT, OWN, get_edge_table
+from ai.stability import count_stable
+
+# 定石の盤面文字列 ("B" / "W" / ".") を Board.key() と同じバイト列にする変換表
+_BOOK_CODES = bytes.maketrans(
+    b"BW.",
+    array(
+        "b",
+        [CELL_CODES[Constants.BLACK], CELL_CODES[Constants.WHITE], CELL_CODES[None]],
+    ).tobytes(),
+)
+
+
+# 以下の表はモジュールの読み込み時に1度だけ作り、全てのインスタンスで共有する。
+# 書き換えられないようタプルと MappingProxyType で持つ
+
+# 盤面評価のための位置重み行列
+# 開局時 - プロレベルの評価に基づく
+OPENING_WEIGHTS = (
+    (120, -20, 20, 5, 5, 20, -20, 120),
+    (-20, -40, -5, -5, -5, -5, -40, -20),
+    (20, -5, 15, 3, 3, 15, -5, 20),
+    (5, -5, 3, 3, 3, 3, -5, 5),
+    (5, -5, 3, 3, 3, 3, -5, 5),
+    (20, -5, 15, 3, 3, 15, -5, 20),
+    (-20, -40, -5, -5, -5, -5, -40, -20),
+    (120, -20, 20, 5, 5, 20, -20, 120),
+)
+
+# 中盤 - より洗練された評価
+MIDGAME_WEIGHTS = (
+    (100, -25, 10, 5, 5, 10, -25, 100),
+    (-25, -35, -5, -5, -5, -5, -35, -25),
+    (10, -5, 5, 2, 2, 5, -5, 10),
+    (5, -5, 2, 1, 1, 2, -5, 5),
+    (5, -5, 2, 1, 1, 2, -5, 5),
+    (10, -5, 5, 2, 2, 5, -5, 10),
+    (-25, -35, -5, -5, -5, -5, -35, -25),
+    (100, -25, 10, 5, 5, 10, -25, 100),
+)
+
+# 終盤 - 石数と確定石を重視
+ENDGAME_WEIGHTS = (
+    (50, -10, 5, 3, 3, 5, -10, 50),
+    (-10, -15, -3, -1, -1, -3, -15, -10),
+    (5, -3, 1, 1, 1, 1, -3, 5),
+    (3, -1, 1, 1, 1, 1, -1, 3),
+    (3, -1, 1, 1, 1, 1, -1, 3),
+    (5, -3, 1, 1, 1, 1, -3, 5),
+    (-10, -15, -3, -1, -1, -3, -15, -10),
+    (50, -10, 5, 3, 3, 5, -10, 50),
+)
+
+POSITION_WEIGHTS = MappingProxyType(
+    {"opening": OPENING_WEIGHTS, "midgame": MIDGAME_WEIGHTS, "endgame": ENDGAME_WEIGHTS}
+)
+
+# 角、エッジ、X-square、C-squareの情報
+CORNERS = ((0, 0), (0, 7), (7, 0), (7, 7))
+EDGES = tuple(
+    [(0, i) for i in range(1, 7)]
+    + [(7, i) for i in range(1, 7)]
+    + [(i, 0) for i in range(1, 7)]
+    + [(i, 7) for i in range(1, 7)]
+)
+X_SQUARES = ((1, 1), (1, 6), (6, 1), (6, 6))
+C_SQUARES = ((0, 1), (1, 0), (0, 6), (1, 7), (6, 0), (7, 1), (6, 7), (7, 6))
+
+# 拡張定石データベース - プロの研究に基づく標準定石
+# 盤面は "B" / "W" / "." の64文字（x * 8 + y の順）で書き、
+# Board.key() と同じ64バイトのキーに変換して持つ。
+_OPENING_TEXTS = {
+    # 初期盤面
+    "...........................BW......WB...........................": [
+        (2, 3),
+        (2, 4),
+        (3, 2),
+        (4, 2),
+        (5, 4),
+        (4, 5),  # 一般的な初手候補
+    ],
+    # 黒が (2,3) に打った場合: 平行開き
+    "...........................BW......WB.........B...............": [
+        (4, 2)  # 対角に打つ
+    ],
+    # 黒が (2,4) に打った場合: C開き
+    "...........................BW......WB............B................": [
+        (2, 5)  # 一直線に打つ
+    ],
+    # より多くのパターン...（実際には数百のパターンがある）
+}
+OPENING_DATABASE = MappingProxyType(
+    {
+        text.encode().translate(_BOOK_CODES): tuple(moves)
+        for text, moves in _OPENING_TEXTS.items()
+    }
+)
 
 
 class StrongerAI(AIStrategy):
@@ -22,38 +121,19 @@ class StrongerAI(AIStrategy):
         # 現在のゲームフェーズ
         self.game_phase = "opening"
 
-        # 高速化のための事前計算とキャッシュ
-        self._position_weights = {
-            "opening": self._get_opening_weights(),
-            "midgame": self._get_midgame_weights(),
-            "endgame": self._get_endgame_weights(),
-        }
-
-        # 角、エッジ、X-square、C-squareの情報
-        self._corners = [(0, 0), (0, 7), (7, 0), (7, 7)]
-        self._edges = (
-            [(0, i) for i in range(1, 7)]
-            + [(7, i) for i in range(1, 7)]
-            + [(i, 0) for i in range(1, 7)]
-            + [(i, 7) for i in range(1, 7)]
-        )
-        self._x_squares = [(1, 1), (1, 6), (6, 1), (6, 6)]
-        self._c_squares = [
-            (0, 1),
-            (1, 0),
-            (0, 6),
-            (1, 7),
-            (6, 0),
-            (7, 1),
-            (6, 7),
-            (7, 6),
-        ]
-
-        # エッジパターンの評価値をキャッシュ
-        self._edge_patterns = self._init_edge_patterns()
+        # 位置重み・マスの分類はモジュールの共有テーブルを参照する
+        self._position_weights = POSITION_WEIGHTS
+        self._corners = CORNERS
+        self._edges = EDGES
+        self._x_squares = X_SQUARES
+        self._c_squares = C_SQUARES
+
+        # 辺の全配置の評価値テーブル（白 = 自分視点）
+        self._edge_table = get_edge_table()
+        self._edge_digits = {Constants.WHITE: OWN, Constants.BLACK: OPPONENT}
 
         # 拡張定石データベース
-        self._opening_database = self._init_advanced_opening_database()
+        self._opening_database = OPENING_DATABASE
 
         # 終盤戦の完全読み切り閾値
         self.endgame_threshold = 14  # 空きマスがこの数以下なら完全読み切り
@@ -61,88 +141,11 @@ class StrongerAI(AIStrategy):
         # AI思考の最大時間制限（ミリ秒）
         self.max_thinking_time = 2000
 
-    # 盤面評価のための位置重み行列
-    def _get_opening_weights(self):
-        """開局時の位置重み行列 - プロレベルの評価に基づく"""
-        return [
-            [120, -20, 20, 5, 5, 20, -20, 120],
-            [-20, -40, -5, -5, -5, -5, -40, -20],
-            [20, -5, 15, 3, 3, 15, -5, 20],
-            [5, -5, 3, 3, 3, 3, -5, 5],
-            [5, -5, 3, 3, 3, 3, -5, 5],
-            [20, -5, 15, 3, 3, 15, -5, 20],
-            [-20, -40, -5, -5, -5, -5, -40, -20],
-            [120, -20, 20, 5, 5, 20, -20, 120],
-        ]
-
-    def _get_midgame_weights(self):
-        """中盤の位置重み行列 - より洗練された評価"""
-        return [
-            [100, -25, 10, 5, 5, 10, -25, 100],
-            [-25, -35, -5, -5, -5, -5, -35, -25],
-            [10, -5, 5, 2, 2, 5, -5, 10],
-            [5, -5, 2, 1, 1, 2, -5, 5],
-            [5, -5, 2, 1, 1, 2, -5, 5],
-            [10, -5, 5, 2, 2, 5, -5, 10],
-            [-25, -35, -5, -5, -5, -5, -35, -25],
-            [100, -25, 10, 5, 5, 10, -25, 100],
-        ]
-
-    def _get_endgame_weights(self):
-        """終盤の位置重み行列 - 石数と確定石を重視"""
-        return [
-            [50, -10, 5, 3, 3, 5, -10, 50],
-            [-10, -15, -3, -1, -1, -3, -15, -10],
-            [5, -3, 1, 1, 1, 1, -3, 5],
-            [3, -1, 1, 1, 1, 1, -1, 3],
-            [3, -1, 1, 1, 1, 1, -1, 3],
-            [5, -3, 1, 1, 1, 1, -3, 5],
-            [-10, -15, -3, -1, -1, -3, -15, -10],
-            [50, -10, 5, 3, 3, 5, -10, 50],
-        ]
-
-    def _init_edge_patterns(self):
-        """エッジパターンの評価値を初期化"""
-        patterns = {}
-
-        # 完全に安定したエッジパターン（高評価）
-        patterns[("W", "W", "W", "W", "W", "W")] = 30
-        patterns[("W", "W", "W", "W", "W", None)] = 25
-        patterns[("W", "W", "W", "W", None, None)] = 20
-
-        # 潜在的に不安定なパターン（低評価）
-        patterns[("W", None, None, None, None, None)] = -5
-        patterns[("W", "W", None, None, None, None)] = 0
-        patterns[("W", None, "W", None, None, None)] = -8
-
-        # 一般的な悪いパターン
-        patterns[(None, "W", None, None, None, None)] = -10
-        patterns[(None, "W", "W", None, None, None)] = -15
-
-        return patterns
-
-    def _init_advanced_opening_database(self):
-        """拡張定石データベース - プロの研究に基づく標準定石"""
-        return {
-            # 初期盤面
-            "...........................BW......WB...........................": [
-                (2, 3),
-                (2, 4),
-                (3, 2),
-                (4, 2),
-                (5, 4),
-                (4, 5),  # 一般的な初手候補
-            ],
-            # 黒が (2,3) に打った場合: 平行開き
-            "...........................BW......WB.........B...............": [
-                (4, 2)  # 対角に打つ
-            ],
-            # 黒が (2,4) に打った場合: C開き
-            "...........................BW......WB............B................": [
-                (2, 5)  # 一直線に打つ
-            ],
-            # より多くのパターン...（実際には数百のパターンがある）
-        }
+    def reset(self, clear_caches=False):
+        """探索ごとの状態を戻す（clear_caches ならトランスポジションテーブルも捨てる）"""
+        super().reset(clear_caches)
+        if clear_caches:
+            self.transposition_table.clear()
 
     def get_move(self):
         """最適な着手を選択"""
@@ -189,16 +192,8 @@ class StrongerAI(AIStrategy):
 
     def opening_book(self):
         """序盤の定石手を返す"""
-        # 現在の盤面の状態をシンプルな形式で取得
-        board_state = ""
-        for x in range(Constants.BOARD_SIZE):
-            for y in range(Constants.BOARD_SIZE):
-                if self.game_logic.state.board.cells[x][y] == Constants.BLACK:
-                    board_state += "B"
-                elif self.game_logic.state.board.cells[x][y] == Constants.WHITE:
-                    board_state += "W"
-                else:
-                    board_state += "."
+        # 定石データベースのキーは盤面の64バイト表現
+        board_state = self.game_logic.state.board.key()
 
         if board_state in self._opening_database:
             candidates = self._opening_database[board_state]
@@ -221,41 +216,17 @@ class StrongerAI(AIStrategy):
 
     # 評価関数群（一部のみを抜粋）
     def evaluate_edge_patterns(self, board):
-        """エッジのパターンを評価する"""
-        score = 0
-
-        # 各エッジを評価
-        edges = [
-            [(0, i) for i in range(1, 7)],  # 上辺
-            [(7, i) for i in range(1, 7)],  # 下辺
-            [(i, 0) for i in range(1, 7)],  # 左辺
-            [(i, 7) for i in range(1, 7)],  # 右辺
-        ]
-
-        for edge in edges:
-            # エッジの状態を抽出
-            pattern = []
-            for x, y in edge:
-                if board[x][y] == Constants.WHITE:
-                    pattern.append("W")
-                elif board[x][y] == Constants.BLACK:
-                    pattern.append("B")
-                else:
-                    pattern.append(None)
-
-            # WHITE視点でのパターン評価
-            w_pattern = tuple(pattern)
-            if w_pattern in self._edge_patterns:
-                score += self._edge_patterns[w_pattern]
-
-            # BLACK視点でのパターン評価（反転）
-            b_pattern = tuple(
-                "B" if p == "W" else "W" if p == "B" else None for p in pattern
-            )
-            if b_pattern in self._edge_patterns:
-                score -= self._edge_patterns[b_pattern]
-
-        return score
+        """辺の配置をテーブル引きで評価する（白視点）"""
+        table = self._edge_table
+        digits = self._edge_digits
+        last = Constants.BOARD_SIZE - 1
+        top = bottom = left = right = 0
+        for i in range(Constants.BOARD_SIZE):
+            top = top * 3 + digits.get(board[0][i], 0)
+            bottom = bottom * 3 + digits.get(board[last][i], 0)
+            left = left * 3 + digits.get(board[i][0], 0)
+            right = right * 3 + digits.get(board[i][last], 0)
+        return table[top] + table[bottom] + table[left] + table[right]
 
     def super_evaluate_board(self, board):
         """超高精度な評価関数"""
@@ -336,9 +307,12 @@ class StrongerAI(AIStrategy):
         return final_score
 
     def evaluate_stability(self, board):
-        """石の安定性を評価"""
-        # 実装は長いので省略
-        return 0  # ダミー実装
+        """石の安定性を評価（確定石1つにつき10点、白視点）"""
+        black, white = board_to_bitboards(board, Constants.BLACK, Constants.WHITE)
+        size = len(board)
+        return 10 * (
+            count_stable(white, black, size) - count_stable(black, white, size)
+        )
 
     def evaluate_mobility_and_potential(self, board):
         """モビリティと潜在モビリティを評価"""
@@ -358,18 +332,10 @@ class StrongerAI(AIStrategy):
         return moves
 
     def get_board_hash(self, board):
-        """盤面のハッシュ値を計算（高速化）"""
-        # タプルを使用した高速なハッシング
-        board_state = []
-        for row in board:
-            for cell in row:
-                if cell == Constants.WHITE:
-                    board_state.append(1)
-                elif cell == Constants.BLACK:
-                    board_state.append(-1)
-                else:
-                    board_state.append(0)
-        return tuple(board_state)
+        """盤面のハッシュキー（Board.key() と同じ64バイト表現）を返す"""
+        if hasattr(board, "key"):
+            return board.key()
+        return array("b", [CELL_CODES[cell] for row in board for cell in row]).tobytes()
 
     def negamax_with_transposition(self, board, depth, alpha, beta, color, start_time):
         """ネガマックスアルゴリズム with トランスポジションテーブル"""
@@ -400,43 +366,3 @@ class StrongerAI(AIStrategy):
         if valid_moves:
             return random.choice(valid_moves)
         return None
-
-    def think_and_move(self, board, player, time_limit):
-        """AIが思考して手を選ぶ処理"""
-        try:
-            # 引数なしでget_moveを呼び出す
-            move = self.get_move()
-            if move is not None:
-                # game_logicの形式に合わせて手を変換して適用
-                grid_x, grid_y = move
-                self.game_logic.place_stone(grid_x, grid_y)
-            else:
-                # 有効な手がない場合（パス）
-                self.game_logic.pass_turn()
-        except Exception as e:
-            print(f"AIの思考中にエラーが発生しました: {e}")
-        finally:
-            self.thinking = False
-
-    def start_thinking(self):
-        """AIの思考プロセスを開始する"""
-        self.thinking = True
-
-        # ゲームロジックから現在のボード状態とプレイヤーを取得
-        board = self.game_logic.state.board
-        player = Constants.WHITE  # AIは白石として定義されている
-
-        # 適切な思考時間に基づいて手を選択
-        difficulty = getattr(self.game_logic.state, "difficulty", 1)  # 安全に取得
-        time_limit = 1
-        if difficulty == 2:
-            time_limit = 3
-        elif difficulty == 3:
-            time_limit = 8
-
-        # 思考スレッドを開始
-        thinking_thread = threading.Thread(
-            target=self.think_and_move, args=(board, player, time_limit)
-        )
-        thinking_thread.daemon = True  # メインプログラム終了時にスレッドも終了
-        thinking_thread.start()
\ No newline at end of file
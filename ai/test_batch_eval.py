@@ -0,0 +1,82 @@
+import random
+import unittest
+
+from constants import Constants
+from game_logic import GameLogic
+from ai.batch_eval import evaluate_batch, legal_moves_batch
+from ai.bitboard import board_to_bitboards, flip_discs, iter_bits, legal_moves
+from ai.minimax_ai import MinimaxAI
+
+
+def _random_positions(logic, count, seed):
+    """ランダムに打ち進めた盤面（cells 形式）を集める"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        cells = [[None] * 8 for _ in range(8)]
+        cells[3][3] = cells[4][4] = Constants.WHITE
+        cells[3][4] = cells[4][3] = Constants.BLACK
+        color = Constants.BLACK
+        for _ in range(60):
+            moves = logic.get_valid_moves(color, cells)
+            if not moves:
+                color = Constants.WHITE if color == Constants.BLACK else Constants.BLACK
+                if not logic.get_valid_moves(color, cells):
+                    break
+                continue
+            x, y = rng.choice(moves)
+            cells = logic.make_move_for_board(cells, x, y, color)
+            color = Constants.WHITE if color == Constants.BLACK else Constants.BLACK
+            positions.append(cells)
+    return positions[:count]
+
+
+class TestBatchEval(unittest.TestCase):
+    def setUp(self):
+        self.logic = GameLogic()
+        self.ai = MinimaxAI(self.logic)
+        self.positions = _random_positions(self.logic, 200, seed=0)
+
+    def test_legal_moves(self):
+        """ビットボードの合法手が GameLogic と一致するか"""
+        for cells in self.positions:
+            black, white = board_to_bitboards(cells, Constants.BLACK, Constants.WHITE)
+            expected = sorted(
+                x * 8 + y for x, y in self.logic.get_valid_moves(Constants.WHITE, cells)
+            )
+            moves = legal_moves(white, black)
+            self.assertEqual(
+                [bit.bit_length() - 1 for bit in iter_bits(moves)], expected
+            )
+            self.assertEqual(int(legal_moves_batch([white], [black])[0]), moves)
+            for x, y in self.logic.get_valid_moves(Constants.WHITE, cells):
+                flipped = self.logic.get_stones_to_flip(x, y, Constants.WHITE, cells)
+                self.assertEqual(
+                    flip_discs(white, black, 1 << (x * 8 + y)),
+                    sum(1 << (fx * 8 + fy) for fx, fy in flipped),
+                )
+
+    def test_evaluate_batch(self):
+        """まとめて計算した評価値が evaluate_board と一致するか"""
+        bitboards = [
+            board_to_bitboards(cells, Constants.BLACK, Constants.WHITE)
+            for cells in self.positions
+        ]
+        values = evaluate_batch([w for _, w in bitboards], [b for b, _ in bitboards])
+        self.assertEqual(
+            list(values), [self.ai.evaluate_board(cells) for cells in self.positions]
+        )
+
+    def test_minimax_batched(self):
+        """ビットボード版の探索が minimax と同じ値を返すか"""
+        for cells in self.positions[20:200:20]:
+            black, white = board_to_bitboards(cells, Constants.BLACK, Constants.WHITE)
+            for maximizing in (True, False):
+                self.assertEqual(
+                    self.ai.minimax_batched(white, black, 2, maximizing),
+                    self.ai.minimax(cells, 2, maximizing),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
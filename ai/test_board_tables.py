@@ -0,0 +1,156 @@
+import random
+import time
+import unittest
+
+from ai.board_tables import DIRECTIONS, get_board_tables
+from ai.world_class_ai import AI_BLACK, AI_EMPTY, AI_WHITE, WorldAI
+
+
+def start_board(size):
+    board = [[AI_EMPTY] * size for _ in range(size)]
+    h = size // 2
+    board[h - 1][h - 1] = board[h][h] = AI_WHITE
+    board[h - 1][h] = board[h][h - 1] = AI_BLACK
+    return board
+
+
+def flips(board, r, c, player):
+    """テーブルを使わずに (r, c) に打ったときに返る石を求める"""
+    size = len(board)
+    result = []
+    for dr, dc in DIRECTIONS:
+        line = []
+        nr, nc = r + dr, c + dc
+        while 0 <= nr < size and 0 <= nc < size and board[nr][nc] == -player:
+            line.append((nr, nc))
+            nr += dr
+            nc += dc
+        if line and 0 <= nr < size and 0 <= nc < size and board[nr][nc] == player:
+            result.extend(line)
+    return result
+
+
+def moves_of(board, player):
+    size = len(board)
+    return [
+        (r, c)
+        for r in range(size)
+        for c in range(size)
+        if board[r][c] == AI_EMPTY and flips(board, r, c, player)
+    ]
+
+
+def play(board, move, player):
+    board = [row[:] for row in board]
+    r, c = move
+    for fr, fc in flips(board, r, c, player) + [move]:
+        board[fr][fc] = player
+    return board
+
+
+def brute_force(board, player):
+    """手番側から見た最終石数差を全探索で求める"""
+    moves = moves_of(board, player)
+    if not moves:
+        if not moves_of(board, -player):
+            return sum(row.count(player) - row.count(-player) for row in board)
+        return -brute_force(board, -player)
+    return max(-brute_force(play(board, move, player), -player) for move in moves)
+
+
+def random_position(size, empties, rng):
+    board = start_board(size)
+    player = AI_BLACK
+    while sum(row.count(AI_EMPTY) for row in board) > empties:
+        moves = moves_of(board, player)
+        if not moves:
+            if not moves_of(board, -player):
+                break
+            player = -player
+            continue
+        board = play(board, rng.choice(moves), player)
+        player = -player
+    return board, player
+
+
+class TestBoardTables(unittest.TestCase):
+    def test_8x8_tables(self):
+        """8x8 のテーブルが従来の定数と同じか"""
+        tables = get_board_tables(8)
+        self.assertEqual(tables.corners, [(0, 0), (0, 7), (7, 0), (7, 7)])
+        self.assertEqual(tables.x_squares[(7, 0)], [(6, 1)])
+        self.assertEqual(sorted(tables.c_squares[(0, 7)]), [(0, 6), (1, 7)])
+        self.assertEqual(tables.position_weights[0], [100, -20, 10, 5, 5, 10, -20, 100])
+        self.assertEqual(
+            tables.position_weights[1], [-20, -50, -2, -2, -2, -2, -50, -20]
+        )
+        self.assertEqual(tables.position_weights[3], [5, -2, -1, -1, -1, -1, -2, 5])
+        self.assertEqual((tables.opening_discs, tables.midgame_discs), (20, 50))
+        self.assertIs(get_board_tables(8), tables)
+
+    def test_neighbours_and_rays(self):
+        """隣接マスと列が盤内に収まり、位置の重みが対称か"""
+        for size in (6, 8, 10):
+            tables = get_board_tables(size)
+            self.assertEqual(len(tables.neighbours[0][0]), 3)
+            self.assertEqual(len(tables.neighbours[1][1]), 8)
+            # 角からは縦・横・斜めの3方向
+            self.assertEqual(len(tables.rays[0][0]), 3)
+            self.assertEqual(len(tables.rays[0][0][0]), size - 1)
+            weights = tables.position_weights
+            for r in range(size):
+                self.assertEqual(weights[r], weights[r][::-1])
+                self.assertEqual(weights[r], [row[r] for row in weights])
+        with self.assertRaises(ValueError):
+            get_board_tables(7)
+
+    def test_moves_on_other_sizes(self):
+        """6x6 / 10x10 でも合法手と着手結果が全探索版と一致するか"""
+        rng = random.Random(0)
+        for size in (6, 10):
+            ai = WorldAI(None, board_size=size)
+            for _ in range(5):
+                board = start_board(size)
+                player = AI_BLACK
+                for _ in range(size * size):
+                    moves = moves_of(board, player)
+                    self.assertEqual(ai.get_valid_moves(board, player), moves)
+                    if not moves:
+                        if not moves_of(board, -player):
+                            break
+                        player = -player
+                        continue
+                    move = rng.choice(moves)
+                    self.assertEqual(
+                        ai.make_move(board, move, player), play(board, move, player)
+                    )
+                    board = play(board, move, player)
+                    player = -player
+
+    def test_get_move_on_other_sizes(self):
+        """6x6 / 10x10 の初期局面で時間内に合法手を返すか"""
+        for size in (6, 10):
+            ai = WorldAI(None, board_size=size)
+            board = start_board(size)
+            start = time.time()
+            move = ai.get_move(board, AI_BLACK, time_limit=0.5)
+            self.assertLess(time.time() - start, 3)
+            self.assertIn(move, moves_of(board, AI_BLACK))
+            self.assertIsInstance(ai.evaluate_board(board, AI_BLACK), (int, float))
+
+    def test_solve_6x6_endgame(self):
+        """6x6 の終盤の完全読みが全探索と一致するか"""
+        rng = random.Random(1)
+        ai = WorldAI(None, board_size=6)
+        for _ in range(3):
+            board, player = random_position(6, 9, rng)
+            expected = brute_force(board, player)
+            score, move = ai.solve_endgame(board, player)
+            self.assertEqual(score, expected)
+            if move is not None:
+                after = play(board, move, player)
+                self.assertEqual(-brute_force(after, -player), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from constants import Constants
+from ai.edge_table import (
+    EDGE_CONFIGS,
+    edge_cells,
+    edge_index,
+    get_edge_table,
+    stable_mask,
+)
+from ai.stability import stable_discs
+from ai.stronger_ai import StrongerAI
+
+
+class TestEdgeTable(unittest.TestCase):
+    def setUp(self):
+        self.table = get_edge_table()
+
+    def test_index_round_trip(self):
+        for index in (0, 1, 100, EDGE_CONFIGS - 1):
+            self.assertEqual(edge_index(edge_cells(index)), index)
+
+    def test_symmetric(self):
+        """色を入れ替えると符号が反転するか"""
+        for index in range(EDGE_CONFIGS):
+            swapped = [(3 - cell) % 3 for cell in edge_cells(index)]
+            self.assertEqual(self.table[edge_index(swapped)], -self.table[index])
+
+    def test_stable_mask(self):
+        """コーナーから続く石は確定し、挟まれうる石は確定しないか"""
+        self.assertEqual(stable_mask([1, 1, 1, 0, 0, 0, 0, 0]), 0b111)
+        self.assertEqual(stable_mask([0, 1, 1, 0, 0, 0, 0, 0]), 0)
+        # コーナーの隣の相手の石は、空きに置かれると挟まれて返る
+        self.assertEqual(stable_mask([1, 2, 2, 0, 0, 0, 0, 0]), 0b1)
+        self.assertEqual(stable_mask([1, 2, 2, 2, 2, 2, 2, 1]), 0b11111111)
+
+    def test_contains_board_stability(self):
+        """盤面全体で確定と判定される辺の石は、辺だけの解析でも確定しているか"""
+        for index in range(EDGE_CONFIGS):
+            cells = edge_cells(index)
+            own = sum(1 << i for i, cell in enumerate(cells) if cell == 1)
+            opponent = sum(1 << i for i, cell in enumerate(cells) if cell == 2)
+            board_stable = stable_discs(own, opponent)
+            self.assertEqual(board_stable & ~stable_mask(cells), 0)
+
+    def test_stronger_ai_lookup(self):
+        """StrongerAI の辺評価がテーブル4回の参照と一致するか"""
+        board = [[None] * 8 for _ in range(8)]
+        for i in range(8):
+            board[0][i] = Constants.WHITE
+        board[7][1] = Constants.BLACK
+        ai = StrongerAI(None)
+        expected = (
+            self.table[edge_index([1] * 8)]
+            + self.table[edge_index([0, 2, 0, 0, 0, 0, 0, 0])]
+            + self.table[edge_index([1, 0, 0, 0, 0, 0, 0, 0])] * 2
+        )
+        self.assertEqual(ai.evaluate_edge_patterns(board), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from ai.bitboard import AI_BLACK, AI_WHITE, position_key
+from ai.endgame_database import EndgameDatabase, RECORD_SIZE
+from ai.world_class_ai import WorldAI
+
+
+def play_random_until(ai, empties, seed):
+    """初期局面からランダムに打ち進め、空きマスが empties 個の局面を作る"""
+    rng = random.Random(seed)
+    board = [[0] * 8 for _ in range(8)]
+    board[3][3] = board[4][4] = AI_WHITE
+    board[3][4] = board[4][3] = AI_BLACK
+    player = AI_BLACK
+    while sum(row.count(0) for row in board) > empties:
+        moves = ai.get_valid_moves(board, player)
+        opponent = -player
+        if not moves:
+            if not ai.get_valid_moves(board, opponent):
+                return None, None
+            player = opponent
+            continue
+        board = ai.make_move(board, rng.choice(moves), player)
+        player = opponent
+    if len(ai.get_valid_moves(board, player)) < 2:
+        return None, None
+    return board, player
+
+
+class TestEndgameDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "endgame.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_put_and_get(self):
+        """追記した結果が取得できるか"""
+        with EndgameDatabase(self.path) as db:
+            db.put((1, 2, AI_BLACK), 10, (2, 3))
+            db.put((3, 4, AI_WHITE), -6)
+            self.assertEqual(db.get((1, 2, AI_BLACK)), (10, (2, 3)))
+            self.assertEqual(db.get((3, 4, AI_WHITE)), (-6, None))
+            self.assertIsNone(db.get((5, 6, AI_BLACK)))
+
+    def test_persistence(self):
+        """再オープン後もインデックスが復元されるか"""
+        with EndgameDatabase(self.path) as db:
+            db.put((1, 2, AI_BLACK), 10, (2, 3))
+        with EndgameDatabase(self.path) as db:
+            self.assertEqual(len(db), 1)
+            self.assertEqual(db.get((1, 2, AI_BLACK)), (10, (2, 3)))
+
+    def test_move_overrides_score_only_record(self):
+        """スコアのみのレコードは最善手付きで上書きされる"""
+        with EndgameDatabase(self.path) as db:
+            db.put((1, 2, AI_BLACK), 4)
+            db.put((1, 2, AI_BLACK), 4, (0, 0))
+        with EndgameDatabase(self.path) as db:
+            self.assertEqual(db.get((1, 2, AI_BLACK)), (4, (0, 0)))
+
+    def test_truncated_tail_is_ignored(self):
+        """書き込み途中の半端なレコードは読み飛ばされる"""
+        with EndgameDatabase(self.path) as db:
+            db.put((1, 2, AI_BLACK), 10, (2, 3))
+        with open(self.path, "ab") as f:
+            f.write(b"\x01\x02\x03")
+        with EndgameDatabase(self.path) as db:
+            self.assertEqual(len(db), 1)
+            db.put((7, 8, AI_WHITE), 2, (1, 1))
+        self.assertEqual(os.path.getsize(self.path), RECORD_SIZE * 2)
+
+    def test_hot_cache_is_bounded(self):
+        """ホットキャッシュが指定サイズを超えないか"""
+        with EndgameDatabase(self.path, cache_size=8) as db:
+            for i in range(50):
+                db.put((i, 0, AI_BLACK), i % 64, (0, 0))
+            for i in range(50):
+                self.assertEqual(db.get((i, 0, AI_BLACK))[0], i % 64)
+            self.assertLessEqual(len(db.hot_cache), 8)
+
+    def test_world_ai_uses_database(self):
+        """WorldAIが解いた結果を保存し、次回は探索せずに再利用するか"""
+        ai = WorldAI(None)
+        board, player = None, None
+        seed = 0
+        while board is None:
+            board, player = play_random_until(ai, 10, seed)
+            seed += 1
+
+        with EndgameDatabase(self.path) as db:
+            ai.endgame_db = db
+            move = ai.get_move(board, player, time_limit=30)
+            self.assertIsNotNone(db.get(position_key(board, player)))
+
+        with EndgameDatabase(self.path) as db:
+            fresh_ai = WorldAI(None, endgame_db=db)
+            fresh_ai.minimax_endgame = None  # 探索が呼ばれたら失敗させる
+            self.assertEqual(fresh_ai.get_move(board, player, time_limit=30), move)
+
+    def test_solve_time_limit(self):
+        """time_limit 内に読み切れなければ打ち切り、途中の値を保存しないか"""
+        board, player = None, None
+        seed = 0
+        while board is None:
+            board, player = play_random_until(WorldAI(None), 18, seed)
+            seed += 1
+        with EndgameDatabase(self.path) as db:
+            ai = WorldAI(None, endgame_db=db)
+            started = time.time()
+            self.assertEqual(
+                ai.solve_endgame(board, player, time_limit=0.3), (None, None)
+            )
+            self.assertLess(time.time() - started, 2)
+            self.assertTrue(ai.time_limit_reached)
+            self.assertIsNone(db.get(position_key(board, player)))
+            # 期限はその呼び出しだけに効く
+            self.assertIsNone(ai.endgame_deadline)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+from constants import Constants
+from game_analyzer import GameAnalyzer
+from game_logic import GameLogic
+from ai.engine_pool import EnginePool
+
+
+class TestEnginePool(unittest.TestCase):
+    def setUp(self):
+        self.pool = EnginePool()
+        self.logic = GameLogic()
+
+    def test_reuse_keeps_caches(self):
+        """返したエンジンがキャッシュを保ったまま次に貸し出されるか"""
+        engine = self.pool.acquire(Constants.AI_TYPE_WORLD, self.logic)
+        engine.transposition_table["key"] = {"value": 1}
+        engine.cancel()
+        self.pool.release(engine)
+        self.assertEqual(self.pool.idle_count(), 1)
+
+        again = self.pool.acquire(Constants.AI_TYPE_WORLD, self.logic)
+        self.assertIs(again, engine)
+        self.assertIn("key", again.transposition_table)
+        # 探索ごとの状態は戻っている
+        self.assertFalse(again.cancelled)
+        self.assertEqual(self.pool.created, 1)
+
+        self.pool.release(again, clear_caches=True)
+        self.assertEqual(engine.transposition_table, {})
+
+    def test_engines_per_turn(self):
+        """手番が違えば別のエンジンを使うか"""
+        black = self.pool.acquire(Constants.AI_TYPE_WORLD, self.logic)
+        self.pool.release(black)
+        self.logic.state.turn = Constants.WHITE
+        white = self.pool.acquire(Constants.AI_TYPE_WORLD, self.logic)
+        self.assertIsNot(white, black)
+        self.assertEqual(self.pool.created, 2)
+        self.pool.release(white)
+
+    def test_position_is_copied(self):
+        """借りたエンジンの GameLogic に局面が写り、元の GameLogic は変わらないか"""
+        self.logic.state.turbo = True
+        self.logic.place_stone(2, 3)
+        engine = self.pool.acquire(Constants.AI_TYPE_STRONGER, self.logic)
+        self.assertIsNot(engine.game_logic, self.logic)
+        self.assertEqual(engine.game_logic.board, self.logic.board)
+        self.assertEqual(engine.game_logic.state.turn, Constants.WHITE)
+        engine.game_logic.place_stone(*engine.game_logic.get_valid_moves()[0])
+        self.assertEqual(self.logic.count_stones(), (4, 1))
+        self.pool.release(engine)
+
+        # 次に借りたときは GameLogic が初期状態から作り直される
+        engine = self.pool.acquire(Constants.AI_TYPE_STRONGER)
+        self.assertEqual(engine.game_logic.count_stones(), (2, 2))
+        self.assertEqual(engine.game_logic.state.move_history, [])
+        self.assertEqual(engine.game_logic.state.turn, Constants.BLACK)
+        self.pool.release(engine)
+
+    def test_release_limits(self):
+        """待機数の上限を超えた分は手放し、借りていないエンジンは返せないか"""
+        pool = EnginePool(max_idle=1)
+        first = pool.acquire(Constants.AI_TYPE_RANDOM)
+        second = pool.acquire(Constants.AI_TYPE_RANDOM)
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual(pool.idle_count(), 1)
+        with self.assertRaises(ValueError):
+            pool.release(second)
+        pool.clear()
+        self.assertEqual(pool.idle_count(), 0)
+
+    def test_analyzer_borrows(self):
+        """GameAnalyzer がプールのエンジンを使い回すか"""
+        analyzer = GameAnalyzer(self.pool)
+        results = analyzer.analyze_moves(self.logic, num_moves=2, time_limit=0.2)
+        self.assertTrue(results)
+        self.assertIn(results[0]["move"], self.logic.get_valid_moves())
+        self.assertEqual(self.pool.created, 1)
+        self.assertEqual(self.pool.idle_count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import threading
+import time
+import unittest
+
+from constants import Constants
+from game_logic import GameLogic
+from ai.ai_strategy import AIStrategy
+from ai.executor import AIExecutor, ProcessAIExecutor
+from ai.random_ai import RandomAI
+from ai.world_class_ai import WorldAI
+
+
+class _FixedAI(AIStrategy):
+    """決まった手を返すだけのAI（release が set されるまで待つ）"""
+
+    def __init__(self, move, release=None):
+        super().__init__(None)
+        self.move = move
+        self.release = release
+        self.thinking = False
+        self.show_thinking_indicator = False
+
+    def get_move(self):
+        if self.release is not None:
+            while not self.release.wait(0.01):
+                if self.cancelled:
+                    return None
+        if self.move == "error":
+            raise RuntimeError("error")
+        return self.move
+
+
+def _wait(executor, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        done, move = executor.poll()
+        if done:
+            return move
+        time.sleep(0.005)
+    raise AssertionError("思考が終わらない")
+
+
+class TestAIExecutor(unittest.TestCase):
+    def test_submit_and_poll(self):
+        """ワーカーで選んだ手が poll で受け取れるか"""
+        ai = _FixedAI((2, 3))
+        executor = AIExecutor(ai)
+        self.assertIsNotNone(executor.submit())
+        self.assertTrue(ai.thinking)
+        self.assertEqual(_wait(executor), (2, 3))
+        self.assertFalse(executor.busy)
+        self.assertFalse(ai.thinking)
+        # 結果は一度しか渡さない
+        self.assertEqual(executor.poll(), (False, None))
+
+    def test_poll_while_thinking(self):
+        """思考中は結果待ちになり、同じ思考を二重に始めないか"""
+        release = threading.Event()
+        ai = _FixedAI((4, 5), release)
+        executor = AIExecutor(ai)
+        future = executor.submit()
+        self.assertEqual(executor.poll(), (False, None))
+        self.assertIs(executor.submit(), future)
+        release.set()
+        self.assertEqual(_wait(executor), (4, 5))
+
+    def test_cancel(self):
+        """打ち切った思考の結果は捨てられるか"""
+        release = threading.Event()
+        ai = _FixedAI((4, 5), release)
+        executor = AIExecutor(ai)
+        executor.submit()
+        executor.cancel()
+        self.assertTrue(ai.cancelled)
+        self.assertFalse(executor.busy)
+        self.assertEqual(executor.poll(), (False, None))
+        # 前の思考が終われば次の思考を始められる
+        executor._thread.join(5.0)
+        ai.release = None
+        self.assertIsNotNone(executor.submit())
+        self.assertFalse(ai.cancelled)
+        self.assertEqual(_wait(executor), (4, 5))
+
+    def test_error(self):
+        """思考中の例外は着手なしとして扱われるか"""
+        executor = AIExecutor(_FixedAI("error"))
+        executor.submit()
+        self.assertIsNone(_wait(executor))
+
+
+class TestProcessAIExecutor(unittest.TestCase):
+    def setUp(self):
+        self.game_logic = GameLogic()
+
+    def test_submit_and_poll(self):
+        """子プロセスで選んだ手が合法手として返ってくるか"""
+        self.game_logic.state.turn = Constants.WHITE
+        executor = ProcessAIExecutor(RandomAI(self.game_logic))
+        self.addCleanup(executor.close)
+        executor.submit()
+        self.assertTrue(executor.busy)
+        move = _wait(executor, 30.0)
+        self.assertIn(move, self.game_logic.get_valid_moves(Constants.WHITE))
+        # 子プロセスは使い回す
+        process = executor.process
+        executor.submit()
+        _wait(executor, 30.0)
+        self.assertIs(executor.process, process)
+
+    def test_cancel(self):
+        """打ち切った探索がすぐに戻り、次の探索を始められるか"""
+        ai = WorldAI(self.game_logic)
+        ai.difficulty = 3
+        executor = ProcessAIExecutor(ai)
+        self.addCleanup(executor.close)
+        self.game_logic.state.turn = Constants.WHITE
+        executor.submit()
+        time.sleep(1.0)
+        executor.cancel()
+        self.assertFalse(executor.busy)
+        start = time.time()
+        while executor.submit() is None:
+            self.assertLess(time.time() - start, 2.0)
+            time.sleep(0.01)
+        executor.cancel()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestHeadlessCore(unittest.TestCase):
+    def test_core_does_not_import_pygame(self):
+        """ゲームロジックとAIの読み込みでpygameが読み込まれないか"""
+        code = (
+            "import sys\n"
+            "import game_logic, game_record\n"
+            "from ai import WorldAI\n"
+            "logic = game_logic.GameLogic()\n"
+            "logic.place_stone(5, 4)\n"
+            "logic.state.set_message('test')\n"
+            "WorldAI(logic)\n"
+            "print('pygame' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
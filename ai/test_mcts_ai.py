@@ -0,0 +1,99 @@
+import random
+import threading
+import time
+import unittest
+
+from constants import Constants
+from game_logic import GameLogic
+from ai.bitboard import AI_BLACK, AI_WHITE
+from ai.mcts_ai import MCTSAI, MCTSSearch, SELECTION_PUCT, playout
+
+
+class TestMCTSAI(unittest.TestCase):
+    def setUp(self):
+        self.logic = GameLogic()
+
+    def test_playout(self):
+        """プレイアウトが終局まで進み、勝者を返すか"""
+        rng = random.Random(0)
+        black = (1 << 28) | (1 << 35)
+        white = (1 << 27) | (1 << 36)
+        for _ in range(20):
+            self.assertIn(playout(black, white, AI_BLACK, rng), (AI_BLACK, AI_WHITE, 0))
+        # 打てる手が無い盤面はそのまま石数で判定する
+        self.assertEqual(playout((1 << 64) - 2, 1, AI_WHITE, rng), AI_BLACK)
+
+    def test_get_move(self):
+        """UCT / PUCT のどちらでも合法手を返すか"""
+        for selection in ("uct", SELECTION_PUCT):
+            ai = MCTSAI(self.logic, max_playouts=100, selection=selection, seed=0)
+            move = ai.get_move()
+            self.assertIn(move, self.logic.get_valid_moves(Constants.BLACK))
+            self.assertEqual(ai.last_playouts, 100)
+            stats = ai.search.root_stats()
+            self.assertEqual(sum(visits for visits, _ in stats.values()), 100)
+
+    def test_tree_reuse(self):
+        """実際に進んだ局面の部分木を次の探索で使い回すか"""
+        ai = MCTSAI(self.logic, max_playouts=300, seed=0)
+        self.logic.state.turn = Constants.WHITE
+        self.logic.state.board.set_cell(2, 3, Constants.BLACK)
+        self.logic.state.board.set_cell(3, 3, Constants.BLACK)
+        x, y = ai.get_move()
+        self.logic.state.turbo = True
+        self.logic.place_stone(x, y)
+        reply = self.logic.get_valid_moves(Constants.BLACK)[0]
+        self.logic.place_stone(*reply)
+        old_root = ai.search.root
+        ai.get_move()
+        self.assertIsNot(ai.search.root, old_root)
+        self.assertIsNone(ai.search.root.parent)
+        # 再利用した部分木の訪問回数の上に今回の探索が積み上がる
+        self.assertGreater(ai.search.root.visits, 300)
+
+    def test_no_moves(self):
+        """打てる手が無ければ None、1つしか無ければ探索せずにそれを返す"""
+        search = MCTSSearch(0, 1, AI_BLACK)
+        search.run(0, max_playouts=1)
+        self.assertEqual(search.root_stats(), {})
+        self.logic.state.board.set_cells([[None] * 8 for _ in range(8)])
+        self.assertIsNone(MCTSAI(self.logic).get_move())
+        self.logic.state.board.set_cell(0, 0, Constants.BLACK)
+        self.logic.state.board.set_cell(0, 1, Constants.WHITE)
+        self.assertEqual(MCTSAI(self.logic).get_move(), (0, 2))
+
+    def test_cancel_and_close_pool(self):
+        """cancel() がワーカープロセスの探索も止め、close() でプールを終了するか"""
+        ai = MCTSAI(self.logic, workers=2, seed=0)
+        valid_moves = self.logic.get_valid_moves(Constants.BLACK)
+        # ワーカーのジョブが始まる前に打ち切る場合と、探索中に打ち切る場合
+        for delay in (0.0, 0.5):
+            ai.reset()
+            ai.time_limit = 30
+            result = []
+            thread = threading.Thread(target=lambda: result.append(ai.get_move()))
+            thread.start()
+            time.sleep(delay)
+            ai.cancel()
+            thread.join(10)
+            self.assertFalse(thread.is_alive())
+            self.assertIn(result[0], valid_moves)
+
+            # 打ち切った探索のジョブが残っていなければ、次の探索はすぐに終わる
+            ai.reset()
+            ai.time_limit = 0.2
+            started = time.time()
+            self.assertIn(ai.get_move(), valid_moves)
+            self.assertLess(time.time() - started, 5)
+
+        pool = ai.pool
+        self.assertIsNotNone(pool)
+        ai.reset(clear_caches=True)
+        self.assertIsNone(ai.pool)
+        with self.assertRaises(RuntimeError):
+            pool.submit(int)
+        ai.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
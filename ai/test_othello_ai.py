@@ -52,16 +52,27 @@ class MockGameLogic:
             return [(2, 4), (3, 5), (4, 2), (5, 3)]
 
 
-# モジュールのパッチ
-sys.modules["constants"] = MagicMock()
-sys.modules["constants"].Constants = MockConstants
-sys.modules["board"] = MagicMock()
-sys.modules["board"].Board = MockBoard
-sys.modules["ai.ai_strategy"] = MagicMock()
-sys.modules["ai.ai_strategy"].AIStrategy = MagicMock
-
-# AIモジュールをインポート（パッチ後に行う必要があります）
-from world_class_ai import WorldAI, AI_BLACK, AI_WHITE, AI_EMPTY
+# 盤面サイズごとのテーブルは本物の board で作るので、差し替える前に読み込んでおく
+import ai.board_tables  # noqa: E402,F401
+
+# モジュールのパッチ（他のテストに影響しないよう、インポートの間だけ差し替える）
+mock_constants = MagicMock()
+mock_constants.Constants = MockConstants
+mock_board = MagicMock()
+mock_board.Board = MockBoard
+mock_ai_strategy = MagicMock()
+mock_ai_strategy.AIStrategy = MagicMock
+
+with patch.dict(
+    sys.modules,
+    {
+        "constants": mock_constants,
+        "board": mock_board,
+        "ai.ai_strategy": mock_ai_strategy,
+    },
+):
+    # AIモジュールをインポート（パッチ後に行う必要があります）
+    from world_class_ai import WorldAI, AI_BLACK, AI_WHITE, AI_EMPTY
 
 
 class TestWorldAI(unittest.TestCase):
@@ -153,22 +164,15 @@ class TestWorldAI(unittest.TestCase):
         # 時間制限を守っているか確認（少し余裕を持たせる）
         self.assertLessEqual(end_time - start_time, 1.5)
 
-    def test_start_thinking(self):
-        """思考プロセスが正しく動作するかテスト"""
-        # 思考を開始
-        self.ai.start_thinking()
-        self.assertTrue(self.ai.thinking)  # 思考フラグが立っているか確認
-
-        # 思考完了まで少し待つ
-        time.sleep(2)
+    def test_select_move(self):
+        """select_move が手を返すだけで盤面を変更しないかテスト"""
+        self.game_logic.state.turn = MockConstants.BLACK
+        move = self.ai.select_move()
+        self.assertIn(move, [(2, 3), (3, 2), (4, 5), (5, 4)])
 
-        # 思考が完了したか確認
-        self.assertFalse(self.ai.thinking)
-
-        # いずれかのアクションが実行されたか確認
-        self.assertTrue(
-            self.game_logic.placed_move is not None or self.game_logic.passed
-        )
+        # 盤面の変更（着手・パス）は呼び出し側の仕事
+        self.assertIsNone(self.game_logic.placed_move)
+        self.assertFalse(self.game_logic.passed)
 
     def test_specific_board_positions(self):
         """特定の盤面で正しい判断をするかテスト"""
@@ -201,6 +205,41 @@ class TestWorldAI(unittest.TestCase):
         # 少なくとも1つの安定石（コーナー）があるはず
         self.assertGreaterEqual(stability, 1)
 
+    def test_analyze_multi_pv(self):
+        """上位の候補手が評価値と読み筋つきで返るか"""
+        results = self.ai.analyze(self.standard_board, AI_BLACK, 0.5, num_moves=2)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["bound"], "exact")
+        self.assertGreaterEqual(results[0]["score"], results[1]["score"])
+        for result in results:
+            self.assertEqual(result["pv"][0], result["move"])
+
+    def test_analyze_endgame_exact(self):
+        """終盤では上位の手に完全読みと同じ石数差が付くか"""
+        board = [[AI_BLACK] * 8 for _ in range(8)]
+        board[7] = [AI_WHITE] * 8
+        board[0][0] = board[0][1] = board[1][0] = AI_EMPTY
+        board[1][1] = AI_WHITE
+        results = self.ai.analyze(board, AI_WHITE, 1, num_moves=1)
+        score, move = WorldAI(None).solve_endgame(board, AI_WHITE)
+        self.assertEqual(results[0]["score"], score)
+        self.assertEqual(results[0]["bound"], "exact")
+        self.assertEqual(results[0]["move"], move)
+
+    def test_staged_moves(self):
+        """ハッシュムーブだけなら全合法手を生成せずに返すか"""
+        with patch.object(self.ai, "get_valid_moves") as get_valid_moves:
+            moves = self.ai.staged_moves(self.standard_board, AI_BLACK, 3, (2, 3))
+            self.assertEqual(next(moves), (2, 3))
+            get_valid_moves.assert_not_called()
+
+        moves = list(self.ai.staged_moves(self.standard_board, AI_BLACK, 3, (2, 3)))
+        self.assertEqual(moves[0], (2, 3))
+        self.assertEqual(
+            sorted(moves),
+            sorted(self.ai.get_valid_moves(self.standard_board, AI_BLACK)),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
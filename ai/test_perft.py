@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from constants import Constants
+from game_logic import GameLogic
+from ai.perft import GENERATORS, KNOWN_COUNTS, perft, position_from_moves
+
+
+def _opponent(color):
+    return Constants.WHITE if color == Constants.BLACK else Constants.BLACK
+
+
+class TestPerft(unittest.TestCase):
+    def test_known_counts(self):
+        """初期局面からの値が全ての合法手生成で既知の値と一致するか"""
+        cells, color = position_from_moves("")
+        for generator in GENERATORS:
+            for depth in range(1, 5):
+                self.assertEqual(
+                    perft(cells, color, depth, generator),
+                    KNOWN_COUNTS[depth - 1],
+                    generator,
+                )
+
+    def test_passes_and_game_over(self):
+        """パスや終局を含む終盤の局面でも各合法手生成が一致するか"""
+        rules = GameLogic()
+        rng = random.Random(0)
+        for _ in range(8):
+            cells, color = position_from_moves("")
+            while True:
+                moves = rules.get_valid_moves(color, cells)
+                empties = sum(row.count(None) for row in cells)
+                if empties <= 8 or not (
+                    moves or rules.get_valid_moves(_opponent(color), cells)
+                ):
+                    break
+                if moves:
+                    x, y = rng.choice(moves)
+                    cells = rules.make_move_for_board(cells, x, y, color)
+                color = _opponent(color)
+            # 空きが8つなので、深さ9ならほぼ全ての手順が終局やパスを含む
+            counts = {
+                g: perft(cells, color, 9, g) for g in ("world", "bitboard", "numpy")
+            }
+            self.assertEqual(len(set(counts.values())), 1, counts)
+            self.assertEqual(
+                perft(cells, color, 3, "game_logic"), perft(cells, color, 3, "bitboard")
+            )
+
+    def test_position_from_moves(self):
+        """手順から局面と手番を作れるか"""
+        cells, color = position_from_moves("f5d6")
+        self.assertEqual(color, Constants.BLACK)
+        self.assertEqual(
+            perft(cells, color, 1), len(GameLogic().get_valid_moves(color, cells))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
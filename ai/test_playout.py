@@ -0,0 +1,82 @@
+import random
+import unittest
+from collections import Counter
+
+import numpy as np
+
+from ai.bitboard import AI_BLACK, AI_WHITE, flip_discs, legal_moves, random_bit
+from ai.playout import flips_batch, play_game, play_games, weighted_bit
+
+START_BLACK = (1 << 28) | (1 << 35)
+START_WHITE = (1 << 27) | (1 << 36)
+
+
+class TestPlayout(unittest.TestCase):
+    def test_random_bit(self):
+        """立っているビットだけを、ほぼ同じ頻度で選ぶか"""
+        rng = random.Random(0)
+        counts = Counter(random_bit(0b1011001, rng) for _ in range(4000))
+        self.assertEqual(set(counts), {0b1, 0b1000, 0b10000, 0b1000000})
+        self.assertGreater(min(counts.values()), 800)
+
+    def test_weighted_bit(self):
+        """重みが 0 のマスは選ばず、重みに比例して選ぶか"""
+        rng = random.Random(0)
+        weights = [0.0] * 64
+        weights[0] = 3.0
+        weights[3] = 1.0
+        counts = Counter(weighted_bit(0b1011001, weights, rng) for _ in range(4000))
+        self.assertEqual(set(counts), {0b1, 0b1000})
+        self.assertAlmostEqual(counts[0b1] / 4000, 0.75, delta=0.05)
+
+    def test_play_game(self):
+        """終局まで打って石数差を返すか"""
+        rng = random.Random(0)
+        for player in (AI_BLACK, AI_WHITE):
+            for _ in range(20):
+                diff = play_game(START_BLACK, START_WHITE, player, rng)
+                self.assertLessEqual(abs(diff), 64)
+        # 打てる手が無ければそのままの石数差
+        self.assertEqual(play_game((1 << 64) - 2, 1, AI_WHITE, rng), 62)
+
+    def test_flips_batch(self):
+        """まとめて計算した返る石が flip_discs と一致するか"""
+        rng = random.Random(1)
+        rows = []
+        for _ in range(50):
+            own, opponent = START_BLACK, START_WHITE
+            for _ in range(rng.randrange(1, 40)):
+                moves = legal_moves(own, opponent)
+                if not moves:
+                    own, opponent = opponent, own
+                    continue
+                move = random_bit(moves, rng)
+                flipped = flip_discs(own, opponent, move)
+                rows.append((own, opponent, move, flipped))
+                own, opponent = opponent & ~flipped, own | move | flipped
+        own, opponent, move, expected = (
+            np.array(c, dtype=np.uint64) for c in zip(*rows)
+        )
+        self.assertTrue((flips_batch(own, opponent, move) == expected).all())
+
+    def test_play_games(self):
+        """まとめて打った結果が1局ずつ打った結果と同じ分布になるか"""
+        diffs = play_games(START_BLACK, START_WHITE, AI_BLACK, count=2000, seed=0)
+        self.assertEqual(len(diffs), 2000)
+        self.assertLessEqual(np.abs(diffs).max(), 64)
+        rng = random.Random(0)
+        single = [
+            play_game(START_BLACK, START_WHITE, AI_BLACK, rng) for _ in range(500)
+        ]
+        self.assertAlmostEqual(diffs.mean(), np.mean(single), delta=3.0)
+        # 同じ seed なら同じ結果
+        self.assertTrue(
+            (
+                play_games(START_BLACK, START_WHITE, AI_BLACK, 50, seed=3)
+                == play_games(START_BLACK, START_WHITE, AI_BLACK, 50, seed=3)
+            ).all()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from constants import Constants
+from game_logic import GameLogic
+from ai.registry import AI_TYPES, create_ai, get_ai_class
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestRegistry(unittest.TestCase):
+    def test_lazy_import(self):
+        """登録表を読み込んだだけでは各AIのモジュールを読み込まないか"""
+        code = (
+            "import sys, ai.registry as r;"
+            "print(any(m in sys.modules for m, _ in r.AI_MODULES.values()));"
+            "r.get_ai_class('world');"
+            "print('ai.world_class_ai' in sys.modules, 'ai.stronger_ai' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        self.assertEqual(output, ["False", "True", "False"])
+
+    def test_create_ai(self):
+        """全てのAIタイプで AI を作れるか"""
+        logic = GameLogic()
+        names = {
+            Constants.AI_TYPE_RANDOM: "RandomAI",
+            Constants.AI_TYPE_MINIMAX: "MinimaxAI",
+            Constants.AI_TYPE_STRONGER: "StrongerAI",
+            Constants.AI_TYPE_WORLD: "WorldAI",
+            Constants.AI_TYPE_MCTS: "MCTSAI",
+        }
+        self.assertEqual(set(AI_TYPES), set(names))
+        for ai_type, name in names.items():
+            ai = create_ai(ai_type, logic)
+            self.assertEqual(type(ai).__name__, name)
+            self.assertIs(ai.game_logic, logic)
+        self.assertEqual(create_ai(Constants.AI_TYPE_STRONGER, logic, depth=2).depth, 2)
+        with self.assertRaises(ValueError):
+            get_ai_class("unknown")
+
+    def test_stronger_tables_shared(self):
+        """StrongerAI の表が全インスタンスで共有され、書き換えられないか"""
+        first = create_ai(Constants.AI_TYPE_STRONGER, GameLogic())
+        second = create_ai(Constants.AI_TYPE_STRONGER, GameLogic())
+        self.assertIs(first._position_weights, second._position_weights)
+        self.assertIs(first._opening_database, second._opening_database)
+        with self.assertRaises(TypeError):
+            first._position_weights["opening"] = None
+        with self.assertRaises(TypeError):
+            first._position_weights["opening"][0][0] = 0
+        self.assertEqual(first._position_weights["midgame"][0][0], 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import random
+import unittest
+
+from ai.bitboard import board_to_bitboards, AI_BLACK, AI_WHITE, AI_EMPTY
+from ai.stability import board_stability, count_stable, stable_discs
+from ai.world_class_ai import STABILITY_MIN_EMPTIES, WorldAI
+
+
+def _bit(r, c, size=8):
+    return 1 << (r * size + c)
+
+
+class TestStability(unittest.TestCase):
+    def test_corner_and_edge(self):
+        """コーナーとそこから辺に沿って続く石が確定石になるか"""
+        own = _bit(0, 0) | _bit(0, 1) | _bit(0, 2) | _bit(1, 1)
+        opponent = _bit(0, 4)
+        stable = stable_discs(own, opponent)
+        # (1, 1) は横の隣が空いているので確定しない
+        self.assertEqual(stable, _bit(0, 0) | _bit(0, 1) | _bit(0, 2))
+        # コーナーが無ければ辺の石は確定しない
+        self.assertEqual(stable_discs(_bit(0, 1) | _bit(0, 2), 0), 0)
+
+    def test_full_lines(self):
+        """全方向の列が埋まっていれば中央の石も確定するか"""
+        full = (1 << 64) - 1
+        own = _bit(3, 3)
+        self.assertEqual(stable_discs(own, full & ~own), own)
+        # 1マスでも空いている列があれば確定しない（(3, 7) が空き）
+        self.assertEqual(stable_discs(own, full & ~own & ~_bit(3, 7)), 0)
+
+    def test_other_sizes(self):
+        """6x6 の盤でもコーナーが確定石になるか"""
+        self.assertEqual(count_stable(_bit(5, 5, 6) | _bit(5, 4, 6), 0, 6), 2)
+
+    def test_never_flipped(self):
+        """確定石とされた石がその後のランダムな対局で返されないか"""
+        rng = random.Random(0)
+        for _ in range(30):
+            board = [[AI_EMPTY] * 8 for _ in range(8)]
+            board[3][3] = board[4][4] = AI_WHITE
+            board[3][4] = board[4][3] = AI_BLACK
+            history = [[row[:] for row in board]]
+            player = AI_BLACK
+            passes = 0
+            while passes < 2:
+                moves = _valid_moves(board, player)
+                if moves:
+                    _play(board, rng.choice(moves), player)
+                    history.append([row[:] for row in board])
+                    passes = 0
+                else:
+                    passes += 1
+                player = -player
+
+            for i, position in enumerate(history):
+                black, white = board_to_bitboards(position)
+                for own, opponent, color in ((black, white, 1), (white, black, -1)):
+                    stable = stable_discs(own, opponent)
+                    for later in history[i:]:
+                        for k in range(64):
+                            if stable >> k & 1:
+                                self.assertEqual(later[k // 8][k % 8], color)
+
+    def test_board_stability(self):
+        board = [[AI_EMPTY] * 8 for _ in range(8)]
+        board[0][0] = board[0][1] = AI_BLACK
+        self.assertEqual(board_stability(board, AI_BLACK), 2)
+        self.assertEqual(board_stability(board, AI_WHITE), 0)
+
+    def test_endgame_cutoff(self):
+        """確定石から決まる結果の範囲が窓の外なら、探索せずにその値を返すか"""
+        ai = WorldAI(None)
+        board = [[AI_EMPTY] * 8 for _ in range(8)]
+        for c in range(8):
+            board[0][c] = board[1][c] = AI_WHITE  # 白の確定石16個
+        board[4][4] = AI_BLACK
+        depth = STABILITY_MIN_EMPTIES
+        # 黒から見た結果は 64 - 2 * 16 = 32 以下
+        self.assertEqual(ai._stability_cutoff(board, depth, 40, 64, AI_BLACK, True), 32)
+        self.assertIsNone(ai._stability_cutoff(board, depth, 20, 64, AI_BLACK, True))
+        # 白から見れば 2 * 16 - 64 = -32 以上
+        self.assertEqual(
+            ai._stability_cutoff(board, depth, -64, -40, AI_WHITE, True), -32
+        )
+        # 残りの探索が小さい局面では試さない
+        self.assertIsNone(
+            ai._stability_cutoff(board, depth - 1, 40, 64, AI_BLACK, True)
+        )
+
+
+DIRECTIONS = [(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)]
+
+
+def _flips(board, r, c, player):
+    if board[r][c] != AI_EMPTY:
+        return []
+    flips = []
+    for dr, dc in DIRECTIONS:
+        line = []
+        nr, nc = r + dr, c + dc
+        while 0 <= nr < 8 and 0 <= nc < 8 and board[nr][nc] == -player:
+            line.append((nr, nc))
+            nr += dr
+            nc += dc
+        if line and 0 <= nr < 8 and 0 <= nc < 8 and board[nr][nc] == player:
+            flips += line
+    return flips
+
+
+def _valid_moves(board, player):
+    return [(r, c) for r in range(8) for c in range(8) if _flips(board, r, c, player)]
+
+
+def _play(board, move, player):
+    for r, c in _flips(board, move[0], move[1], player):
+        board[r][c] = player
+    board[move[0]][move[1]] = player
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+from constants import Constants
+from ai.tournament import (
+    SPRT,
+    EnginePlayer,
+    EngineSpec,
+    Tournament,
+    elo_interval,
+    generate_openings,
+    play_game,
+)
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self):
+        self.random_a = EngineSpec("random-a", Constants.AI_TYPE_RANDOM)
+        self.random_b = EngineSpec("random-b", Constants.AI_TYPE_RANDOM)
+
+    def test_play_game(self):
+        """1局を終局まで打てるか"""
+        score = play_game(self.random_a, self.random_b, ((5, 4),))
+        self.assertTrue(-64 <= score <= 64)
+
+    def test_time_limit_option(self):
+        """思考時間をコンストラクタで受け取るAIには EngineSpec の時間が渡るか"""
+        player = EnginePlayer(EngineSpec("mcts", Constants.AI_TYPE_MCTS, 0.3))
+        self.assertEqual(player.ai.time_limit, 0.3)
+        player.close()
+        # 受け取らないAIはそのまま作る
+        player = EnginePlayer(EngineSpec("random", Constants.AI_TYPE_RANDOM, 0.3))
+        self.assertFalse(hasattr(player.ai, "time_limit"))
+
+    def test_generate_openings(self):
+        """オープニングが重複なく指定数だけ作られるか"""
+        openings = generate_openings(plies=2, count=5, seed=0)
+        self.assertEqual(len(openings), 5)
+        self.assertTrue(all(len(moves) == 2 for moves in openings))
+        self.assertEqual(len(set(openings)), 5)
+
+    def test_round_robin_swaps_colours(self):
+        """各オープニングを先後入れ替えて打つか"""
+        engines = [self.random_a, self.random_b, EngineSpec("c", "random")]
+        tournament = Tournament(engines, generate_openings(2, 2, seed=0), workers=0)
+        schedule = tournament.schedule()
+        self.assertEqual(len(schedule), 3 * 2 * 2)
+        self.assertEqual(
+            sum(1 for game in schedule if game[2]),
+            sum(1 for game in schedule if not game[2]),
+        )
+        tournament.run()
+        total_games = sum(sum(result) for result in tournament.results.values())
+        self.assertEqual(total_games, len(schedule))
+        ratings = tournament.ratings()
+        self.assertAlmostEqual(sum(ratings), 0.0, places=6)
+
+    def test_process_pool(self):
+        """プロセスプールでも全局が記録されるか"""
+        tournament = Tournament(
+            [self.random_a, self.random_b], generate_openings(2, 2, seed=0), workers=2
+        )
+        tournament.run()
+        self.assertEqual(sum(tournament.totals(0)), 4)
+
+    def test_elo_interval(self):
+        """勝率5割ならElo差0、区間は対称になるか"""
+        elo, lower, upper = elo_interval(40, 20, 40)
+        self.assertAlmostEqual(elo, 0.0)
+        self.assertAlmostEqual(lower, -upper)
+        self.assertLess(lower, 0)
+
+    def test_sprt(self):
+        """大差がつけばH1、負け越せばH0で決着するか"""
+        sprt = SPRT(elo0=0, elo1=10)
+        self.assertIsNone(sprt.status(5, 0, 5))
+        self.assertEqual(sprt.status(900, 50, 50), "H1")
+        self.assertEqual(sprt.status(50, 50, 900), "H0")
+
+    def test_sprt_stops_gauntlet_early(self):
+        """SPRTが決着したら残りの対局を打ち切るか"""
+        minimax = EngineSpec("minimax", Constants.AI_TYPE_MINIMAX, depth=1)
+        tournament = Tournament(
+            [minimax, self.random_a],
+            generate_openings(2, 8, seed=0),
+            mode="gauntlet",
+            workers=0,
+            sprt=SPRT(elo0=0, elo1=400, alpha=0.2, beta=0.2),
+        )
+        tournament.run()
+        played = sum(tournament.totals(0))
+        self.assertIsNotNone(tournament.sprt_result)
+        self.assertLess(played, len(tournament.schedule()))
+
+
+if __name__ == "__main__":
+    unittest.main()
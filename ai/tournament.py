@@ -0,0 +1,420 @@
+import argparse
+import inspect
+import itertools
+import math
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from constants import Constants
+from game_logic import GameLogic
+from ai.registry import AI_TYPES, get_ai_class
+from ai.world_class_ai import WorldAI, AI_WHITE
+
+
+def _opponent(color):
+    return Constants.WHITE if color == Constants.BLACK else Constants.BLACK
+
+
+class EngineSpec:
+    """対局に参加するAIの設定（プロセス間で受け渡せるように値だけを持つ）"""
+
+    def __init__(self, name, ai_type, time_limit=1.0, **options):
+        if ai_type not in AI_TYPES:
+            raise ValueError(f"不明なAIタイプです: {ai_type}")
+        self.name = name
+        self.ai_type = ai_type
+        self.time_limit = time_limit
+        self.options = options  # AIインスタンスに設定する属性 (例: depth=2)
+
+    def __repr__(self):
+        return f"EngineSpec({self.name!r}, {self.ai_type!r})"
+
+
+class EnginePlayer:
+    """EngineSpec から作ったAIに、任意の盤面・手番で1手を選ばせるラッパー
+
+    既存のAIは白番として game_logic の盤面を読むため、黒番のときは
+    石の色を入れ替えた盤面を見せて白番として考えさせる。
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.logic = GameLogic()
+        ai_class = get_ai_class(spec.ai_type)
+        kwargs = {}
+        # 思考時間をコンストラクタで受け取るAI（MCTSAI など）にはそれを渡す
+        if "time_limit" in inspect.signature(ai_class).parameters:
+            kwargs["time_limit"] = spec.time_limit
+        self.ai = ai_class(self.logic, **kwargs)
+        for name, value in spec.options.items():
+            setattr(self.ai, name, value)
+
+    def close(self):
+        """AIが持つ資源（プロセスプールなど）を手放す"""
+        self.ai.close()
+
+    def select_move(self, board, color):
+        """board 上で color が打つ手を返す"""
+        if color == Constants.WHITE:
+            view = [row[:] for row in board]
+        else:
+            swap = {Constants.BLACK: Constants.WHITE, Constants.WHITE: Constants.BLACK}
+            view = [[swap.get(cell) for cell in row] for row in board]
+        self.logic.state.board.set_cells(view)
+        self.logic.state.turn = Constants.WHITE
+
+        if isinstance(self.ai, WorldAI):
+            ai_board = self.ai._convert_board(self.logic.state.board)
+            return self.ai.get_move(ai_board, AI_WHITE, self.spec.time_limit)
+        return self.ai.get_move()
+
+
+def play_game(black_spec, white_spec, opening=()):
+    """1局対局し、黒から見た石数差を返す（不正な手を返したAIは負け）"""
+    rules = GameLogic()
+    players = {
+        Constants.BLACK: EnginePlayer(black_spec),
+        Constants.WHITE: EnginePlayer(white_spec),
+    }
+    try:
+        return _play_out(rules, players, opening)
+    finally:
+        for player in players.values():
+            player.close()
+
+
+def _play_out(rules, players, opening):
+    """play_game の本体。opening を打ってから終局まで対局する"""
+    board = rules.board
+    color = Constants.BLACK
+    for x, y in opening:
+        board = rules.make_move_for_board(board, x, y, color)
+        color = _opponent(color)
+
+    while True:
+        valid_moves = rules.get_valid_moves(color, board)
+        if not valid_moves:
+            if not rules.has_valid_move(_opponent(color), board):
+                break
+            color = _opponent(color)
+            continue
+
+        move = players[color].select_move(board, color)
+        if move is None or tuple(move) not in valid_moves:
+            size = Constants.BOARD_SIZE
+            return -size * size if color == Constants.BLACK else size * size
+        board = rules.make_move_for_board(board, move[0], move[1], color)
+        color = _opponent(color)
+
+    black_count, white_count = rules.count_stones(board)
+    return black_count - white_count
+
+
+def _play_scheduled_game(i, j, i_is_black, black_spec, white_spec, opening):
+    """プロセスプールから呼ぶための関数（トップレベルでないと pickle できない）"""
+    return i, j, i_is_black, play_game(black_spec, white_spec, opening)
+
+
+def generate_openings(plies=4, count=None, seed=None):
+    """初期局面から plies 手進めた異なる局面への手順を返す
+
+    静的評価値の絶対値が小さい（互角に近い）局面から順に count 個選ぶ。
+    同じ評価の局面の並びは seed で決まる。
+    """
+    rules = GameLogic()
+    evaluator = WorldAI(None)
+    sequences = {}
+
+    def expand(board, color, moves):
+        if len(moves) == plies:
+            key = tuple(tuple(row) for row in board)
+            sequences.setdefault(key, (tuple(moves), board, color))
+            return
+        valid_moves = rules.get_valid_moves(color, board)
+        for x, y in valid_moves:
+            new_board = rules.make_move_for_board(board, x, y, color)
+            expand(new_board, _opponent(color), moves + [(x, y)])
+
+    expand(rules.board, Constants.BLACK, [])
+
+    scored = []
+    for moves, board, color in sequences.values():
+        ai_board = evaluator._convert_board(board)
+        ai_player = evaluator._convert_to_ai_player(color)
+        scored.append((abs(evaluator.evaluate_board(ai_board, ai_player)), moves))
+
+    random.Random(seed).shuffle(scored)
+    scored.sort(key=lambda item: item[0])
+    openings = [moves for _, moves in scored]
+    return openings[:count] if count is not None else openings
+
+
+def elo_from_score(score):
+    """勝率 (0〜1) をElo差に変換する"""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def elo_interval(wins, draws, losses, z=1.96):
+    """勝敗数から (Elo差, 下限, 上限) を返す（正規近似の信頼区間）"""
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0, float("-inf"), float("inf")
+    score = (wins + draws / 2) / games
+    variance = (
+        wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score**2
+    ) / games
+    margin = z * math.sqrt(variance / games)
+    return (
+        elo_from_score(score),
+        elo_from_score(score - margin),
+        elo_from_score(score + margin),
+    )
+
+
+class SPRT:
+    """逐次確率比検定 (SPRT) による早期打ち切り判定
+
+    H0: Elo差 = elo0、H1: Elo差 = elo1 として対数尤度比を正規近似で計算する。
+    """
+
+    def __init__(self, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower_bound = math.log(beta / (1 - alpha))
+        self.upper_bound = math.log((1 - beta) / alpha)
+
+    def llr(self, wins, draws, losses):
+        """現在の対数尤度比"""
+        games = wins + draws + losses
+        if games == 0:
+            return 0.0
+        score = (wins + draws / 2) / games
+        variance = (
+            wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score**2
+        ) / games
+        if variance == 0:
+            # 全局同じ結果だと分散が0になるため、引き分け1局分を仮に足して見積もる
+            variance = (0.5 - score) ** 2 / (games + 1)
+            if variance == 0:
+                return 0.0
+        s0 = 1 / (1 + 10 ** (-self.elo0 / 400))
+        s1 = 1 / (1 + 10 ** (-self.elo1 / 400))
+        return games * (s1 - s0) * (2 * score - s0 - s1) / (2 * variance)
+
+    def status(self, wins, draws, losses):
+        """検定結果を "H1"（改善あり）/ "H0"（改善なし）/ None（継続）で返す"""
+        llr = self.llr(wins, draws, losses)
+        if llr >= self.upper_bound:
+            return "H1"
+        if llr <= self.lower_bound:
+            return "H0"
+        return None
+
+
+class Tournament:
+    """AI同士の総当たり戦 / ガントレット戦を行い、Eloを計算するクラス
+
+    各オープニングは先後を入れ替えて2局ずつ打つ。
+    mode="gauntlet" では engines[0] が他の全AIと対戦し、sprt を指定すると
+    engines[0] の通算成績で検定が決着した時点で残りの対局を打ち切る。
+    workers=0 の場合はプロセスを使わずにその場で対局する。
+    """
+
+    def __init__(
+        self, engines, openings, mode="round_robin", rounds=1, workers=None, sprt=None
+    ):
+        if mode not in ("round_robin", "gauntlet"):
+            raise ValueError(f"不明な対戦形式です: {mode}")
+        if len(engines) < 2:
+            raise ValueError("2つ以上のAIが必要です")
+        self.engines = list(engines)
+        self.openings = list(openings) or [()]
+        self.mode = mode
+        self.rounds = rounds
+        self.workers = workers
+        self.sprt = sprt
+        self.sprt_result = None
+
+        # results[(i, j)] = [i の勝ち, 引き分け, i の負け]
+        self.results = {}
+
+    def pairings(self):
+        """対戦するAIの組 (i, j) の一覧"""
+        if self.mode == "gauntlet":
+            return [(0, j) for j in range(1, len(self.engines))]
+        return list(itertools.combinations(range(len(self.engines)), 2))
+
+    def schedule(self):
+        """(i, j, i が黒番か, オープニング) の対局一覧。先後交換の2局を並べる"""
+        games = []
+        for _ in range(self.rounds):
+            for opening in self.openings:
+                for i, j in self.pairings():
+                    games.append((i, j, True, opening))
+                    games.append((i, j, False, opening))
+        return games
+
+    def record(self, i, j, i_is_black, black_score):
+        """1局の結果を記録する"""
+        score = black_score if i_is_black else -black_score
+        entry = self.results.setdefault((i, j), [0, 0, 0])
+        if score > 0:
+            entry[0] += 1
+        elif score == 0:
+            entry[1] += 1
+        else:
+            entry[2] += 1
+
+    def totals(self, index):
+        """engines[index] の通算 (勝ち, 引き分け, 負け)"""
+        wins = draws = losses = 0
+        for (i, j), (w, d, l) in self.results.items():
+            if i == index:
+                wins, draws, losses = wins + w, draws + d, losses + l
+            elif j == index:
+                wins, draws, losses = wins + l, draws + d, losses + w
+        return wins, draws, losses
+
+    def _check_sprt(self):
+        if self.sprt is None:
+            return False
+        self.sprt_result = self.sprt.status(*self.totals(0))
+        return self.sprt_result is not None
+
+    def run(self, callback=None):
+        """全対局を実行する。callback(i, j, 黒から見た石数差) は1局ごとに呼ばれる"""
+
+        def game_args(game):
+            i, j, i_is_black, opening = game
+            a, b = self.engines[i], self.engines[j]
+            black, white = (a, b) if i_is_black else (b, a)
+            return i, j, i_is_black, black, white, opening
+
+        def finish(i, j, i_is_black, black_score):
+            self.record(i, j, i_is_black, black_score)
+            if callback is not None:
+                callback(i, j, black_score)
+            return self._check_sprt()
+
+        games = [game_args(game) for game in self.schedule()]
+
+        if self.workers == 0:
+            for i, j, i_is_black, black, white, opening in games:
+                if finish(i, j, i_is_black, play_game(black, white, opening)):
+                    break
+            return self.results
+
+        workers = self.workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # 打ち切り時に無駄な対局が残らないよう、投入数はワーカー数の2倍までに抑える
+            max_in_flight = workers * 2
+            queue = iter(games)
+            pending = set()
+            stopped = False
+            while True:
+                while not stopped and len(pending) < max_in_flight:
+                    game = next(queue, None)
+                    if game is None:
+                        break
+                    pending.add(executor.submit(_play_scheduled_game, *game))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if not stopped and finish(*future.result()):
+                        stopped = True
+                if stopped:
+                    for future in pending:
+                        future.cancel()
+                    pending = set()
+        return self.results
+
+    def ratings(self, iterations=200):
+        """全対局の結果から各AIのEloを最尤推定する（平均0）"""
+        n = len(self.engines)
+        strengths = [1.0] * n
+        for _ in range(iterations):
+            new_strengths = []
+            for k in range(n):
+                wins, draws, _ = self.totals(k)
+                points = wins + draws / 2
+                denominator = 0.0
+                for (i, j), (w, d, l) in self.results.items():
+                    if k not in (i, j):
+                        continue
+                    other = j if i == k else i
+                    denominator += (w + d + l) / (strengths[k] + strengths[other])
+                # 全勝・全敗のAIが発散しないように0.5勝分を足す
+                new_strengths.append((points + 0.5) / (denominator + 1e-9))
+            mean_log = sum(math.log(s) for s in new_strengths) / n
+            strengths = [s / math.exp(mean_log) for s in new_strengths]
+        return [400 * math.log10(s) for s in strengths]
+
+    def standings(self):
+        """(名前, 対局数, 勝ち, 引き分け, 負け, Elo, 区間下限, 区間上限) の一覧"""
+        ratings = self.ratings()
+        rows = []
+        for k, engine in enumerate(self.engines):
+            wins, draws, losses = self.totals(k)
+            center, lower, upper = elo_interval(wins, draws, losses)
+            rows.append(
+                (
+                    engine.name,
+                    wins + draws + losses,
+                    wins,
+                    draws,
+                    losses,
+                    ratings[k],
+                    ratings[k] + (lower - center),
+                    ratings[k] + (upper - center),
+                )
+            )
+        rows.sort(key=lambda row: row[5], reverse=True)
+        return rows
+
+
+def format_standings(rows):
+    """standings() の結果を表形式の文字列にする"""
+    lines = [f"{'Name':<16}{'Games':>7}{'W':>6}{'D':>6}{'L':>6}{'Elo':>9}  95% CI"]
+    for name, games, wins, draws, losses, elo, lower, upper in rows:
+        lines.append(
+            f"{name:<16}{games:>7}{wins:>6}{draws:>6}{losses:>6}{elo:>9.1f}"
+            f"  [{lower:.1f}, {upper:.1f}]"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI同士の対戦でEloを計測する")
+    parser.add_argument(
+        "engines", nargs="+", help="AIタイプ（例: random minimax world）"
+    )
+    parser.add_argument(
+        "--mode", choices=["round_robin", "gauntlet"], default="round_robin"
+    )
+    parser.add_argument("--openings", type=int, default=8, help="オープニング数")
+    parser.add_argument("--plies", type=int, default=4, help="オープニングの手数")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--time-limit", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--sprt", nargs=2, type=float, metavar=("ELO0", "ELO1"))
+    args = parser.parse_args()
+
+    engines = [
+        EngineSpec(f"{ai_type}#{k}", ai_type, args.time_limit)
+        for k, ai_type in enumerate(args.engines)
+    ]
+    openings = generate_openings(args.plies, args.openings, seed=0)
+    sprt = SPRT(*args.sprt) if args.sprt else None
+    tournament = Tournament(
+        engines, openings, args.mode, args.rounds, args.workers, sprt
+    )
+    tournament.run()
+    print(format_standings(tournament.standings()))
+    if sprt is not None:
+        print(f"SPRT: {tournament.sprt_result or '未決着'}")
+
+
+if __name__ == "__main__":
+    main()
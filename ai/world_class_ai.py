@@ -1,63 +1,59 @@
 import random
 import time
-import threading
 from constants import Constants
 from typing import List, Tuple, Optional, Dict
 from ai.ai_strategy import AIStrategy
+from ai.bitboard import board_to_bitboards, position_key
+from ai.board_tables import get_board_tables
+from ai.stability import board_stability, count_stable, get_tables, stable_discs
 from board import Board
+from move_cache import shared_move_cache
 
 # 定数の定義
 AI_BLACK = 1
 AI_WHITE = -1
 AI_EMPTY = 0
-DIRECTIONS = [(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)]
-
-# コーナー位置
-CORNERS = [(0, 0), (0, 7), (7, 0), (7, 7)]
-
-# X-squares (危険地帯)
-X_SQUARES = {(0, 0): [(1, 1)], (0, 7): [(1, 6)], (7, 0): [(6, 1)], (7, 7): [(6, 6)]}
-
-# C-squares (注意が必要な場所)
-C_SQUARES = {
-    (0, 0): [(0, 1), (1, 0)],
-    (0, 7): [(0, 6), (1, 7)],
-    (7, 0): [(7, 1), (6, 0)],
-    (7, 7): [(7, 6), (6, 7)],
-}
-
-# 位置の価値（静的評価）
-POSITION_WEIGHTS = [
-    [100, -20, 10, 5, 5, 10, -20, 100],
-    [-20, -50, -2, -2, -2, -2, -50, -20],
-    [10, -2, -1, -1, -1, -1, -2, 10],
-    [5, -2, -1, -1, -1, -1, -2, 5],
-    [5, -2, -1, -1, -1, -1, -2, 5],
-    [10, -2, -1, -1, -1, -1, -2, 10],
-    [-20, -50, -2, -2, -2, -2, -50, -20],
-    [100, -20, 10, 5, 5, 10, -20, 100],
-]
+
+# 対局・分析で完全読みに使う思考時間の割合。読み切れなければ
+# 残りの時間で反復深化の探索をする
+ENDGAME_TIME_SHARE = 0.5
+
+# 確定石による枝刈りを試す最小の空きマス数。確定石を数える手間は
+# 数ノード分の探索と同じくらいなので、残りの探索が小さい局面では試さない
+STABILITY_MIN_EMPTIES = 6
+
+# ゲーム側の石の色 -> AI側のコード
+_GAME_TO_AI = {Constants.BLACK: AI_BLACK, Constants.WHITE: AI_WHITE}
 
 
 class WorldAI(AIStrategy):
-    def __init__(self, game_logic, board_size=8):
+    def __init__(self, game_logic, board_size=8, endgame_db=None):
         super().__init__(game_logic)
         self.board_size = board_size
+        # 盤面サイズごとの角・位置の重み・隣接マス・列のテーブル
+        self.tables = get_board_tables(board_size)
         self.game_logic = game_logic
         self.max_time = 10
         self.start_time = 0
         self.time_limit_reached = False
+        # solve_endgame の読み切りの期限（time.time() の値、None なら無制限）
+        self.endgame_deadline = None
         self.nodes_expanded = 0
         self.cutoffs = 0
         self.thinking = False
+        self.cancelled = False
         self.difficulty = 3
 
         # トランスポジションテーブル (Hash -> {value, depth, flag, best_move})
         self.transposition_table = {}
-        # キャッシュ
-        self.valid_cache = {}
+        # 合法手のキャッシュ（上限つき、ゲームロジックと共有）
+        self.valid_cache = shared_move_cache
         # キラー手
         self.killer_moves = {}
+        # 終盤完全読みの永続データベース (EndgameDatabase, 任意)
+        self.endgame_db = endgame_db
+        # analyze 用の終盤キャッシュ (呼び出しをまたいで保持する)
+        self.endgame_cache = {}
 
     def _convert_to_ai_player(self, game_player):
         if game_player == Constants.BLACK:
@@ -74,67 +70,53 @@ class WorldAI(AIStrategy):
         return None
 
     def _convert_board(self, game_board):
-        ai_board = [
-            [AI_EMPTY for _ in range(self.board_size)] for _ in range(self.board_size)
-        ]
+        # Board は AI と同じ値のコード列を持っているので、それをそのまま使う
+        if hasattr(game_board, "code_rows"):
+            return game_board.code_rows()
         if isinstance(game_board, Board):
-            for i in range(self.board_size):
-                for j in range(self.board_size):
-                    cell = game_board.get_cell(i, j)
-                    if cell == Constants.BLACK:
-                        ai_board[i][j] = AI_BLACK
-                    elif cell == Constants.WHITE:
-                        ai_board[i][j] = AI_WHITE
-            return ai_board
+            return [
+                [
+                    _GAME_TO_AI.get(game_board.get_cell(i, j), AI_EMPTY)
+                    for j in range(self.board_size)
+                ]
+                for i in range(self.board_size)
+            ]
         # Fallback for list of lists
-        if hasattr(game_board, "__getitem__"):
-            try:
-                for i in range(self.board_size):
-                    for j in range(self.board_size):
-                        cell = game_board[i][j]
-                        if cell == Constants.BLACK:
-                            ai_board[i][j] = AI_BLACK
-                        elif cell == Constants.WHITE:
-                            ai_board[i][j] = AI_WHITE
-            except:
-                pass
-        return ai_board
-
-    def start_thinking(self):
-        self.thinking = True
-        game_board = self.game_logic.state.board
-        game_player = Constants.WHITE  # AI設定
-
-        board = self._convert_board(game_board)
-        player = self._convert_to_ai_player(game_player)
+        try:
+            return [
+                [
+                    _GAME_TO_AI.get(game_board[i][j], AI_EMPTY)
+                    for j in range(self.board_size)
+                ]
+                for i in range(self.board_size)
+            ]
+        except (TypeError, IndexError, KeyError):
+            return [[AI_EMPTY] * self.board_size for _ in range(self.board_size)]
+
+    def reset(self, clear_caches=False):
+        """探索ごとの状態を戻す
+
+        clear_caches が True ならトランスポジションテーブルと終盤キャッシュも捨てる。
+        """
+        super().reset(clear_caches)
+        self.time_limit_reached = False
+        self.killer_moves = {}
+        if clear_caches:
+            self.transposition_table.clear()
+            self.endgame_cache.clear()
 
-        time_limit = 1
+    def _time_limit(self):
+        """難易度に応じた思考時間（秒）"""
         if self.difficulty == 2:
-            time_limit = 3
-        elif self.difficulty >= 3:
-            time_limit = 5
+            return 3
+        if self.difficulty >= 3:
+            return 5
+        return 1
 
-        def think_and_move(board, player, time_limit):
-            try:
-                move = self.get_move(board, player, time_limit)
-                if move is not None:
-                    grid_x, grid_y = move
-                    self.game_logic.place_stone(grid_x, grid_y)
-                else:
-                    self.game_logic.pass_turn()
-            except Exception as e:
-                print(f"AI Error: {e}")
-                import traceback
-
-                traceback.print_exc()
-            finally:
-                self.thinking = False
-
-        thinking_thread = threading.Thread(
-            target=think_and_move, args=(board, player, time_limit)
-        )
-        thinking_thread.daemon = True
-        thinking_thread.start()
+    def select_move(self):
+        board = self._convert_board(self.game_logic.state.board)
+        player = self._convert_to_ai_player(self.game_logic.state.turn)
+        return self.get_move(board, player, self._time_limit())
 
     def get_move(
         self, board: List[List[int]], player: int, time_limit: int = 10
@@ -144,7 +126,6 @@ class WorldAI(AIStrategy):
         self.start_time = time.time()
         self.time_limit_reached = False
         self.nodes_expanded = 0
-        self.valid_cache = {}
         self.killer_moves = {}
 
         # メモリ管理（適当なサイズでクリア）
@@ -166,11 +147,17 @@ class WorldAI(AIStrategy):
         if empty_count <= 14:
             # 終盤専用のキャッシュを用意（スコアの性質が違うため）
             endgame_cache = {}
-            move = self.endgame_solver(
-                board, player, valid_moves, empty_count, endgame_cache
+            move = self._timed_endgame(
+                time_limit,
+                lambda: self.endgame_solver(
+                    board, player, valid_moves, empty_count, endgame_cache
+                ),
             )
-            self.thinking = False
-            return move
+            if not self.time_limit_reached:
+                self.thinking = False
+                return move
+            # 読み切れなければ残りの時間で通常探索をする
+            self.time_limit_reached = False
 
         # --- 通常探索 (反復深化) ---
         best_move = valid_moves[0]
@@ -229,6 +216,191 @@ class WorldAI(AIStrategy):
         self.thinking = False
         return best_move
 
+    def analyze(self, board, player, time_limit=5, num_moves=3, include_moves=()):
+        """ルートの各手を評価し、評価の高い順に上位 num_moves 手を返す
+
+        戻り値: [{"move", "score", "bound", "depth", "pv"}, ...]
+        bound が "exact" なら score は正確な値、"upper" なら score 以下であることだけが
+        分かっている（上位に入らないと判明した時点で読みを打ち切るため）。
+        include_moves に含めた手は上位に入らなくても正確な値まで読んで末尾に加える。
+        終盤（空き14以下）の score は手番側から見た最終石数差になる。
+        終盤のキャッシュは呼び出しをまたいで保持するので、同じAIで終局側から
+        順に局面を調べると、後の局面の読みが前の局面の探索に再利用される。
+        """
+        self.thinking = True
+        self.max_time = time_limit
+        self.start_time = time.time()
+        self.time_limit_reached = False
+        self.nodes_expanded = 0
+        self.killer_moves = {}
+
+        if len(self.transposition_table) > 200000:
+            self.transposition_table.clear()
+        if len(self.endgame_cache) > 1000000:
+            self.endgame_cache.clear()
+
+        valid_moves = self.get_valid_moves(board, player)
+        if not valid_moves:
+            self.thinking = False
+            return []
+
+        num_moves = max(1, num_moves)
+        empty_count = sum(row.count(AI_EMPTY) for row in board)
+        if empty_count <= 14:
+            endgame_cache = self.endgame_cache
+            results = self._timed_endgame(
+                time_limit,
+                lambda: self._analyze_root(
+                    board,
+                    player,
+                    self.order_moves(board, valid_moves, player, empty_count),
+                    num_moves,
+                    include_moves,
+                    lambda new_board, alpha: self.minimax_endgame(
+                        new_board,
+                        empty_count - 1,
+                        alpha,
+                        float("inf"),
+                        self._opponent(player),
+                        False,
+                        endgame_cache,
+                    ),
+                ),
+            )
+            if not self.time_limit_reached:
+                for result in results:
+                    result["depth"] = empty_count
+                    result["pv"] = self._endgame_pv(
+                        board, result["move"], player, endgame_cache
+                    )
+                self.thinking = False
+                return self._top_results(results, num_moves, include_moves)
+            # 読み切れなければ残りの時間で通常探索をする
+            self.time_limit_reached = False
+
+        # 反復深化。深さごとに前回の評価順で手を並べ直す
+        results = []
+        ordered_moves = self.order_moves(board, valid_moves, player, 2)
+        for depth in range(2, 21):
+            if self.is_time_up():
+                break
+            depth_results = self._analyze_root(
+                board,
+                player,
+                ordered_moves,
+                num_moves,
+                include_moves,
+                lambda new_board, alpha: self.minimax(
+                    new_board,
+                    depth - 1,
+                    alpha,
+                    float("inf"),
+                    self._opponent(player),
+                    False,
+                ),
+            )
+            if self.time_limit_reached:
+                break
+            for result in depth_results:
+                result["depth"] = depth
+            results = depth_results
+            ordered_moves = [result["move"] for result in results]
+
+        if not results:
+            # 最初の深さも読み切れなかった場合は静的な並び順だけ返す
+            results = [
+                {"move": move, "score": None, "bound": None, "depth": 0}
+                for move in ordered_moves
+            ]
+        for result in results:
+            result["pv"] = self._principal_variation(board, result["move"], player)
+        self.thinking = False
+        return self._top_results(results, num_moves, include_moves)
+
+    def _top_results(self, results, num_moves, include_moves):
+        top = results[:num_moves]
+        return top + [r for r in results[num_moves:] if r["move"] in include_moves]
+
+    def _analyze_root(self, board, player, moves, num_moves, include_moves, search):
+        """ルートの各手を search(子局面, alpha) で評価する
+
+        上位 num_moves 手が揃った後は、その最下位の値を alpha にした窓で読む。
+        上位に入らない手は上界が分かった時点で打ち切られ、上位に入る手だけが
+        正確な値まで読まれる。
+        """
+        exact_scores = []
+        results = []
+        for move in moves:
+            alpha = float("-inf")
+            if len(exact_scores) >= num_moves and move not in include_moves:
+                alpha = exact_scores[num_moves - 1]
+            score = search(self.make_move(board, move, player), alpha)
+            if self.time_limit_reached:
+                break
+            bound = "exact" if score > alpha else "upper"
+            if bound == "exact":
+                exact_scores.append(score)
+                exact_scores.sort(reverse=True)
+            results.append({"move": move, "score": score, "bound": bound})
+
+        # 正確な値の手を先に、同じ値なら上界の手より前に並べる
+        results.sort(key=lambda r: (r["score"], r["bound"] == "exact"), reverse=True)
+        return results
+
+    def _opponent(self, player):
+        return AI_WHITE if player == AI_BLACK else AI_BLACK
+
+    def _principal_variation(self, board, move, player, max_length=20):
+        """トランスポジションテーブルの最善手をたどって読み筋を作る"""
+        pv = [move]
+        board = self.make_move(board, move, player)
+        player = self._opponent(player)
+        seen = {self.hash_board(board)}
+        while len(pv) < max_length:
+            valid_moves = self.get_valid_moves(board, player)
+            if not valid_moves:
+                if self.is_game_over(board):
+                    break
+                # パス
+                player = self._opponent(player)
+                continue
+            entry = self.transposition_table.get(self.hash_board(board))
+            if entry is None or entry.get("best_move") not in valid_moves:
+                break
+            next_move = entry["best_move"]
+            pv.append(next_move)
+            board = self.make_move(board, next_move, player)
+            player = self._opponent(player)
+            board_hash = self.hash_board(board)
+            if board_hash in seen:
+                break
+            seen.add(board_hash)
+        return pv
+
+    def _endgame_pv(self, board, move, player, cache):
+        """終盤キャッシュに残った最善手をたどって読み筋を作る"""
+        pv = [move]
+        board = self.make_move(board, move, player)
+        player = self._opponent(player)
+        maximizing_player = False
+        while True:
+            entry = cache.get((self.hash_board(board), player, maximizing_player))
+            if entry is None:
+                break
+            next_move = entry[2]
+            if next_move is None:
+                if self.get_valid_moves(board, player) or self.is_game_over(board):
+                    break
+                # パス
+                player = self._opponent(player)
+                maximizing_player = not maximizing_player
+                continue
+            pv.append(next_move)
+            board = self.make_move(board, next_move, player)
+            player = self._opponent(player)
+            maximizing_player = not maximizing_player
+        return pv
+
     def minimax(self, board, depth, alpha, beta, player, maximizing_player):
         self.nodes_expanded += 1
         if self.nodes_expanded & 1023 == 0:
@@ -255,31 +427,25 @@ class WorldAI(AIStrategy):
             # 深さが足りなくても、最善手の情報はムーブオーダリングに使える
             tt_move = entry.get("best_move")
 
-        if depth == 0 or self.is_game_over(board):
-            current_turn_player = (
-                player
-                if maximizing_player
-                else (AI_WHITE if player == AI_BLACK else AI_BLACK)
-            )
+        current_turn_player = (
+            player
+            if maximizing_player
+            else (AI_WHITE if player == AI_BLACK else AI_BLACK)
+        )
+        if depth == 0:
             return self.evaluate_board(board, current_turn_player)
 
-        valid_moves = self.get_valid_moves(board, player)
-
-        if not valid_moves:
-            opponent = AI_WHITE if player == AI_BLACK else AI_BLACK
-            return self.minimax(
-                board, depth, alpha, beta, opponent, not maximizing_player
-            )
-
-        # TT Moveを渡してオーダリング
-        ordered_moves = self.order_moves(board, valid_moves, player, depth, tt_move)
+        # 手は段階的に生成する（ハッシュムーブでカットできれば残りは生成しない）
+        ordered_moves = self.staged_moves(board, player, depth, tt_move)
 
         opponent = AI_WHITE if player == AI_BLACK else AI_BLACK
         best_move = None
+        searched = 0
 
         if maximizing_player:
             value = float("-inf")
             for move in ordered_moves:
+                searched += 1
                 new_board = self.make_move(board, move, player)
                 score = self.minimax(new_board, depth - 1, alpha, beta, opponent, False)
 
@@ -302,6 +468,7 @@ class WorldAI(AIStrategy):
         else:  # Minimizing player
             value = float("inf")
             for move in ordered_moves:
+                searched += 1
                 new_board = self.make_move(board, move, player)
                 score = self.minimax(new_board, depth - 1, alpha, beta, opponent, True)
 
@@ -321,6 +488,14 @@ class WorldAI(AIStrategy):
             if value >= beta:
                 flag = "lower"
 
+        if searched == 0:
+            # 打てる手が無い: 相手も打てなければ終局、そうでなければパス
+            if not self.get_valid_moves(board, opponent):
+                return self.evaluate_board(board, current_turn_player)
+            return self.minimax(
+                board, depth, alpha, beta, opponent, not maximizing_player
+            )
+
         if not self.time_limit_reached:
             # ベストムーブも保存するのが重要
             self.transposition_table[board_hash] = {
@@ -346,17 +521,17 @@ class WorldAI(AIStrategy):
 
         opponent = AI_WHITE if player == AI_BLACK else AI_BLACK
         empty_count = sum(row.count(AI_EMPTY) for row in board)
-        disk_count = 64 - empty_count
+        disk_count = self.tables.squares - empty_count
 
         # フェーズ別重み設定
         # 序盤はモビリティ(着手可能数)と開放度(Frontier)を最重要視
-        if disk_count <= 20:
+        if disk_count <= self.tables.opening_discs:
             w_pos = 5
             w_mob = 30  # 序盤重視
             w_front = 15  # 開放度重視
             w_stab = 1
             w_par = 0
-        elif disk_count <= 50:
+        elif disk_count <= self.tables.midgame_discs:
             w_pos = 10
             w_mob = 15
             w_front = 5
@@ -373,12 +548,12 @@ class WorldAI(AIStrategy):
 
         # Position
         pos_score = 0
-        for r in range(8):
-            for c in range(8):
-                if board[r][c] == player:
-                    pos_score += POSITION_WEIGHTS[r][c]
-                elif board[r][c] == opponent:
-                    pos_score -= POSITION_WEIGHTS[r][c]
+        for row, weights in zip(board, self.tables.position_weights):
+            for cell, weight in zip(row, weights):
+                if cell == player:
+                    pos_score += weight
+                elif cell == opponent:
+                    pos_score -= weight
         score += pos_score * w_pos
 
         # Mobility
@@ -407,66 +582,177 @@ class WorldAI(AIStrategy):
         return score
 
     def calculate_stability_fast(self, board, player):
-        stability = 0
-        for cr, cc in CORNERS:
-            if board[cr][cc] == player:
-                stability += 10
-                # 横方向
-                dc = 1 if cc == 0 else -1
-                curr_c = cc + dc
-                while 0 <= curr_c < 8 and board[cr][curr_c] == player:
-                    stability += 1
-                    curr_c += dc
-                # 縦方向
-                dr = 1 if cr == 0 else -1
-                curr_r = cr + dr
-                while 0 <= curr_r < 8 and board[curr_r][cc] == player:
-                    stability += 1
-                    curr_r += dr
-        return stability
+        """確定石の評価値（コーナー1つにつき10、それ以外の確定石1つにつき1）"""
+        black, white = board_to_bitboards(board)
+        own, opponent = (black, white) if player == AI_BLACK else (white, black)
+        stable = stable_discs(own, opponent, self.board_size)
+        corners = get_tables(self.board_size).corners
+        return 10 * bin(stable & corners).count("1") + bin(stable & ~corners).count("1")
+
+    def calculate_stability(self, board, player):
+        """player の確定石の数"""
+        return board_stability(board, player)
 
     def count_frontier_discs(self, board, player):
         count = 0
-        for r in range(8):
-            for c in range(8):
-                if board[r][c] == player:
-                    for dr, dc in DIRECTIONS:
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < 8 and 0 <= nc < 8 and board[nr][nc] == AI_EMPTY:
-                            count += 1
-                            break
+        neighbours = self.tables.neighbours
+        for r, c in self.tables.cells:
+            if board[r][c] == player:
+                for nr, nc in neighbours[r][c]:
+                    if board[nr][nc] == AI_EMPTY:
+                        count += 1
+                        break
         return count
 
+    def _timed_endgame(self, time_limit, solve):
+        """思考時間の ENDGAME_TIME_SHARE 倍を期限にして solve() で読み切る
+
+        期限までに読み切れなければ time_limit_reached が True になる
+        （solve() の戻り値は途中のものなので使わないこと）。
+        """
+        self.endgame_deadline = self.start_time + time_limit * ENDGAME_TIME_SHARE
+        try:
+            return solve()
+        finally:
+            self.endgame_deadline = None
+
     def endgame_solver(self, board, player, valid_moves, empty_count, cache):
+        return self._solve_endgame(board, player, valid_moves, empty_count, cache)[1]
+
+    def solve_endgame(self, board, player, time_limit=None):
+        """局面を終局まで読み切り、(手番側から見た最終石数差, 最善手) を返す
+
+        time_limit 秒以内に読み切れなければ (None, None) を返す
+        （time_limit_reached が True になる。途中の値はキャッシュしない）。
+        """
+        self.start_time = time.time()
+        self.time_limit_reached = False
+        self.nodes_expanded = 0
+        if time_limit is not None:
+            self.endgame_deadline = self.start_time + time_limit
+        try:
+            return self._solve_position(board, player)
+        finally:
+            self.endgame_deadline = None
+
+    def _solve_position(self, board, player):
+        valid_moves = self.get_valid_moves(board, player)
+        opponent = AI_WHITE if player == AI_BLACK else AI_BLACK
+        if not valid_moves:
+            if not self.get_valid_moves(board, opponent):
+                player_disks = sum(row.count(player) for row in board)
+                opponent_disks = sum(row.count(opponent) for row in board)
+                return player_disks - opponent_disks, None
+            # パスして相手の手番で読む
+            score, _ = self._solve_position(board, opponent)
+            return (None if score is None else -score), None
+
+        empty_count = sum(row.count(AI_EMPTY) for row in board)
+        score, move = self._solve_endgame(board, player, valid_moves, empty_count, {})
+        if self.time_limit_reached:
+            return None, None
+        return score, move
+
+    def _solve_endgame(self, board, player, valid_moves, empty_count, cache):
+        # 永続データベースに確定済みの結果があれば探索しない
+        root_key = None
+        if self.endgame_db is not None:
+            root_key = position_key(board, player)
+            entry = self.endgame_db.get(root_key)
+            if entry is not None and entry[1] in valid_moves:
+                return entry
+
         best_move = None
         best_score = float("-inf")
         opponent = AI_WHITE if player == AI_BLACK else AI_BLACK
 
         for move in valid_moves:
             new_board = self.make_move(board, move, player)
-            score = self.minimax_endgame(
-                new_board,
-                empty_count - 1,
-                float("-inf"),
-                float("inf"),
-                opponent,
-                False,
-                cache,
-            )
+            child_key = None
+            score = None
+            if self.endgame_db is not None:
+                child_key = position_key(new_board, opponent)
+                entry = self.endgame_db.get(child_key)
+                if entry is not None:
+                    # 相手視点のスコアなので符号を反転する
+                    score = -entry[0]
+            if score is None:
+                score = self.minimax_endgame(
+                    new_board,
+                    empty_count - 1,
+                    float("-inf"),
+                    float("inf"),
+                    opponent,
+                    False,
+                    cache,
+                )
+                if self._endgame_stopped():
+                    break
+                if child_key is not None:
+                    self.endgame_db.put(child_key, -score)
             if score > best_score:
                 best_score = score
                 best_move = move
-        return best_move
+
+        if root_key is not None and best_move is not None:
+            if not self._endgame_stopped():
+                self.endgame_db.put(root_key, best_score, best_move)
+        return best_score, best_move
+
+    def _stability_cutoff(self, board, depth, alpha, beta, player, maximizing_player):
+        """確定石から結果の範囲を求め、αβ窓の外ならその値を返す（それ以外は None）
+
+        相手の確定石は最後まで残るので結果の上限が、自分の確定石からは下限が決まる。
+        """
+        if depth < STABILITY_MIN_EMPTIES:
+            return None
+        total = self.board_size * self.board_size
+        black, white = board_to_bitboards(board)
+        root_player = player if maximizing_player else self._opponent(player)
+        if root_player == AI_BLACK:
+            root_bits, other_bits = black, white
+        else:
+            root_bits, other_bits = white, black
+        if alpha >= total - 2 * other_bits.bit_count():
+            upper = total - 2 * count_stable(other_bits, root_bits, self.board_size)
+            if upper <= alpha:
+                return upper
+        if beta <= 2 * root_bits.bit_count() - total:
+            lower = 2 * count_stable(root_bits, other_bits, self.board_size) - total
+            if lower >= beta:
+                return lower
+        return None
+
+    def _endgame_stopped(self):
+        """読み切りを打ち切ったか（打ち切り要求、または solve_endgame の期限切れ）"""
+        return self.cancelled or self.time_limit_reached
 
     def minimax_endgame(
         self, board, depth, alpha, beta, player, maximizing_player, cache
     ):
+        # 打ち切り要求・期限切れなら途中の値は捨てられるので、すぐに戻る
+        if self._endgame_stopped():
+            return 0
+        if self.endgame_deadline is not None:
+            # 時刻の確認は1024ノードに1回にする
+            self.nodes_expanded += 1
+            if self.nodes_expanded & 1023 == 0 and time.time() > self.endgame_deadline:
+                self.time_limit_reached = True
+                return 0
+
         board_hash = self.hash_board(board)
         # EndGame専用キャッシュの使用
         # (手番プレイヤー情報もキーに含める必要がある)
+        # αβ窓の外で打ち切られた値は上界/下界としてしか使えないためフラグも保存する
         cache_key = (board_hash, player, maximizing_player)
         if cache_key in cache:
-            return cache[cache_key]
+            cached_value, cached_flag, _ = cache[cache_key]
+            if cached_flag == "exact":
+                return cached_value
+            if cached_flag == "lower" and cached_value >= beta:
+                return cached_value
+            if cached_flag == "upper" and cached_value <= alpha:
+                return cached_value
 
         if self.is_game_over(board) or depth == 0:
             black = sum(row.count(AI_BLACK) for row in board)
@@ -478,42 +764,95 @@ class WorldAI(AIStrategy):
             res = black - white if is_black_current else white - black
             return res
 
+        # 確定石による枝刈り（窓の外なら探索せずに返す。キャッシュしない）
+        bound = self._stability_cutoff(
+            board, depth, alpha, beta, player, maximizing_player
+        )
+        if bound is not None:
+            return bound
+
+        alpha_orig = alpha
+        beta_orig = beta
+        best_move = None
+
         valid_moves = self.get_valid_moves(board, player)
         if not valid_moves:
             opponent = AI_WHITE if player == AI_BLACK else AI_BLACK
-            res = self.minimax_endgame(
+            value = self.minimax_endgame(
                 board, depth, alpha, beta, opponent, not maximizing_player, cache
             )
-            cache[cache_key] = res
-            return res
+        else:
+            opponent = AI_WHITE if player == AI_BLACK else AI_BLACK
+
+            if maximizing_player:
+                value = float("-inf")
+                for move in valid_moves:
+                    new_board = self.make_move(board, move, player)
+                    score = self.minimax_endgame(
+                        new_board, depth - 1, alpha, beta, opponent, False, cache
+                    )
+                    if score > value:
+                        value = score
+                        best_move = move
+                    alpha = max(alpha, value)
+                    if alpha >= beta:
+                        break
+            else:
+                value = float("inf")
+                for move in valid_moves:
+                    new_board = self.make_move(board, move, player)
+                    score = self.minimax_endgame(
+                        new_board, depth - 1, alpha, beta, opponent, True, cache
+                    )
+                    if score < value:
+                        value = score
+                        best_move = move
+                    beta = min(beta, value)
+                    if value <= alpha:
+                        break
+
+        flag = "exact"
+        if value <= alpha_orig:
+            flag = "upper"
+        elif value >= beta_orig:
+            flag = "lower"
+        if not self._endgame_stopped():
+            cache[cache_key] = (value, flag, best_move)
+        return value
+
+    def staged_moves(self, board, player, depth, tt_move=None):
+        """探索する手を段階的に返すジェネレータ
 
+        1. ハッシュムーブ（その1手が打てるかだけを確かめる）
+        2. コーナーとキラー手
+        3. 残りの手（ここで初めて全ての合法手を生成して並べ替える）
+        途中でカットされれば、それ以降の生成と並べ替えは行われない。
+        """
         opponent = AI_WHITE if player == AI_BLACK else AI_BLACK
+        tried = []
+        if tt_move is not None:
+            r, c = tt_move
+            if board[r][c] == AI_EMPTY and self._fast_is_valid(
+                board, r, c, player, opponent
+            ):
+                tried.append(tt_move)
+                yield tt_move
 
-        if maximizing_player:
-            value = float("-inf")
-            for move in valid_moves:
-                new_board = self.make_move(board, move, player)
-                score = self.minimax_endgame(
-                    new_board, depth - 1, alpha, beta, opponent, False, cache
-                )
-                value = max(value, score)
-                alpha = max(alpha, value)
-                if alpha >= beta:
-                    break
-        else:
-            value = float("inf")
-            for move in valid_moves:
-                new_board = self.make_move(board, move, player)
-                score = self.minimax_endgame(
-                    new_board, depth - 1, alpha, beta, opponent, True, cache
-                )
-                value = min(value, score)
-                beta = min(beta, value)
-                if value <= alpha:
-                    break
+        killer = self.killer_moves.get(depth)
+        for move in self.tables.corners + [killer]:
+            if move is None or move in tried:
+                continue
+            r, c = move
+            if board[r][c] == AI_EMPTY and self._fast_is_valid(
+                board, r, c, player, opponent
+            ):
+                tried.append(move)
+                yield move
 
-        cache[cache_key] = value
-        return value
+        rest = [
+            move for move in self.get_valid_moves(board, player) if move not in tried
+        ]
+        yield from self.order_moves(board, rest, player, depth)
 
     def order_moves(self, board, moves, player, depth, tt_move=None):
         """ムーブオーダリング: PV Move(tt_move)を最優先する"""
@@ -528,7 +867,7 @@ class WorldAI(AIStrategy):
                 score += 100000
 
             # 2. コーナー
-            elif move in CORNERS:
+            elif move in self.tables.corners:
                 score += 50000
 
             # 3. キラー手
@@ -539,42 +878,34 @@ class WorldAI(AIStrategy):
             else:
                 # X-square
                 is_x = False
-                for corner, x_sqs in X_SQUARES.items():
+                for corner, x_sqs in self.tables.x_squares.items():
                     if move in x_sqs and board[corner[0]][corner[1]] == AI_EMPTY:
                         score -= 5000
                         is_x = True
                         break
                 if not is_x:
-                    for corner, c_sqs in C_SQUARES.items():
+                    for corner, c_sqs in self.tables.c_squares.items():
                         if move in c_sqs and board[corner[0]][corner[1]] == AI_EMPTY:
                             score -= 2000
                             break
 
                 # 位置重み
                 r, c = move
-                score += POSITION_WEIGHTS[r][c]
+                score += self.tables.position_weights[r][c]
 
                 # フリップ数（簡易計算） - 多いほうが枝刈りしやすい傾向（Mobilityとは逆説的だが探索では有効）
                 # 厳密なシミュレーションをせず、方向探索のみ行う
                 flip_count = 0
-                for dr, dc in DIRECTIONS:
-                    curr_r, curr_c = r + dr, c + dc
+                for ray in self.tables.rays[r][c]:
                     line_flips = 0
-                    while (
-                        0 <= curr_r < 8
-                        and 0 <= curr_c < 8
-                        and board[curr_r][curr_c] == opponent
-                    ):
-                        line_flips += 1
-                        curr_r += dr
-                        curr_c += dc
-                    if (
-                        line_flips > 0
-                        and 0 <= curr_r < 8
-                        and 0 <= curr_c < 8
-                        and board[curr_r][curr_c] == player
-                    ):
-                        flip_count += line_flips
+                    for curr_r, curr_c in ray:
+                        cell = board[curr_r][curr_c]
+                        if cell == opponent:
+                            line_flips += 1
+                            continue
+                        if cell == player:
+                            flip_count += line_flips
+                        break
                 score += flip_count
 
             scored_moves.append((score, move))
@@ -588,7 +919,7 @@ class WorldAI(AIStrategy):
         return hash(tuple(tuple(row) for row in board))
 
     def is_time_up(self) -> bool:
-        return time.time() - self.start_time > self.max_time
+        return self.cancelled or time.time() - self.start_time > self.max_time
 
     def is_game_over(self, board: List[List[int]]) -> bool:
         return not self.get_valid_moves(board, AI_BLACK) and not self.get_valid_moves(
@@ -599,8 +930,9 @@ class WorldAI(AIStrategy):
         board_hash = self.hash_board(board)
         cache_key = (board_hash, player)
 
-        if cache_key in self.valid_cache:
-            return self.valid_cache[cache_key]
+        valid_moves = self.valid_cache.get(cache_key)
+        if valid_moves is not None:
+            return valid_moves
 
         if isinstance(board, Board):
             return self.game_logic.get_valid_moves(self._convert_to_game_player(player))
@@ -616,23 +948,20 @@ class WorldAI(AIStrategy):
                     if self._fast_is_valid(board, i, j, player, opponent):
                         valid_moves.append((i, j))
 
-        self.valid_cache[cache_key] = valid_moves
+        self.valid_cache.put(cache_key, valid_moves)
         return valid_moves
 
     def _fast_is_valid(self, board, r, c, player, opponent):
-        for dr, dc in DIRECTIONS:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < 8 and 0 <= nc < 8 and board[nr][nc] == opponent:
-                nr += dr
-                nc += dc
-                while 0 <= nr < 8 and 0 <= nc < 8:
-                    cell = board[nr][nc]
-                    if cell == player:
-                        return True
-                    if cell == AI_EMPTY:
-                        break
-                    nr += dr
-                    nc += dc
+        for ray in self.tables.rays[r][c]:
+            nr, nc = ray[0]
+            if board[nr][nc] != opponent:
+                continue
+            for nr, nc in ray:
+                cell = board[nr][nc]
+                if cell == player:
+                    return True
+                if cell == AI_EMPTY:
+                    break
         return False
 
     def make_move(
@@ -645,22 +974,15 @@ class WorldAI(AIStrategy):
         new_board[r_start][c_start] = player
         opponent = AI_WHITE if player == AI_BLACK else AI_BLACK
 
-        for dr, dc in DIRECTIONS:
-            r, c = r_start + dr, c_start + dc
+        for ray in self.tables.rays[r_start][c_start]:
             to_flip = []
-            while (
-                0 <= r < self.board_size
-                and 0 <= c < self.board_size
-                and new_board[r][c] == opponent
-            ):
-                to_flip.append((r, c))
-                r += dr
-                c += dc
-            if (
-                0 <= r < self.board_size
-                and 0 <= c < self.board_size
-                and new_board[r][c] == player
-            ):
-                for fr, fc in to_flip:
-                    new_board[fr][fc] = player
+            for r, c in ray:
+                cell = new_board[r][c]
+                if cell == opponent:
+                    to_flip.append((r, c))
+                    continue
+                if cell == player:
+                    for fr, fc in to_flip:
+                        new_board[fr][fc] = player
+                break
         return new_board
@@ -0,0 +1,79 @@
+from collections import deque
+
+# アニメーションの種類
+PLACE = "place"
+FLIP = "flip"
+
+
+class Animation:
+    """1つの石のアニメーション（置く / ひっくり返す）"""
+
+    __slots__ = ("kind", "x", "y", "from_color", "to_color", "progress", "delay")
+
+    def __init__(self, kind, x, y, from_color, to_color, delay=0.0):
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.from_color = from_color  # 置く場合は None
+        self.to_color = to_color
+        self.progress = 0.0
+        self.delay = delay  # 再生開始までの待ち（進行度の単位）
+
+    @property
+    def position(self):
+        return (self.x, self.y)
+
+
+class AnimationScheduler:
+    """再生中のアニメーションを deque で管理する
+
+    全てのアニメーションは同時に進み、delay を持つものはその分だけ遅れて
+    始まる。1手で返る石は置いた石からの距離に応じて少しずつずらして再生する。
+    """
+
+    __slots__ = ("pending",)
+
+    def __init__(self):
+        self.pending = deque()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def __bool__(self):
+        return bool(self.pending)
+
+    def __iter__(self):
+        return iter(self.pending)
+
+    def clear(self):
+        self.pending.clear()
+
+    def add_place(self, x, y, color):
+        self.pending.append(Animation(PLACE, x, y, None, color))
+
+    def add_flip(self, x, y, from_color, to_color, delay=0.0):
+        self.pending.append(Animation(FLIP, x, y, from_color, to_color, delay))
+
+    def advance(self, amount, board):
+        """全てのアニメーションを amount だけ進め、終わった返しを盤面に反映する"""
+        finished = False
+        for animation in self.pending:
+            step = amount
+            if animation.delay > 0:
+                waited = min(animation.delay, step)
+                animation.delay -= waited
+                step -= waited
+            animation.progress += step
+            if animation.progress >= 1.0:
+                finished = True
+                if animation.kind == FLIP:
+                    board.set_cell(animation.x, animation.y, animation.to_color)
+        if finished:
+            self.pending = deque(a for a in self.pending if a.progress < 1.0)
+
+    def finish(self, board):
+        """残りのアニメーションを全て終わらせる"""
+        for animation in self.pending:
+            if animation.kind == FLIP:
+                board.set_cell(animation.x, animation.y, animation.to_color)
+        self.pending.clear()
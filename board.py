@@ -1,9 +1,48 @@
 import copy
+from array import array
 from constants import Constants
 
+# 盤面の1マスを表すコード（AIの AI_BLACK / AI_WHITE / AI_EMPTY と同じ値）
+CELL_CODES = {None: 0, Constants.BLACK: 1, Constants.WHITE: -1}
+CODE_COLORS = {code: color for color, code in CELL_CODES.items()}
+
+
+def build_rays(
+    size=Constants.BOARD_SIZE, directions=Constants.DIRECTIONS, min_length=2
+):
+    """マスごとに、各方向へ盤の端まで進んだマスの列を作る
+
+    rays[x][y] は directions の順に並んだ列のタプル。
+    min_length より短い列（既定では石を挟めない長さ1以下の列）は含めない。
+    """
+    rays = [[None] * size for _ in range(size)]
+    for x in range(size):
+        for y in range(size):
+            lines = []
+            for dx, dy in directions:
+                line = []
+                nx, ny = x + dx, y + dy
+                while 0 <= nx < size and 0 <= ny < size:
+                    line.append((nx, ny))
+                    nx += dx
+                    ny += dy
+                if len(line) >= min_length:
+                    lines.append(tuple(line))
+            rays[x][y] = tuple(lines)
+    return rays
+
+
+# 盤の範囲チェック済みの列（着手判定・反転で使う）
+RAYS = build_rays()
+
 
 class Board:
-    """盤面の状態と操作を管理するクラス"""
+    """盤面の状態と操作を管理するクラス
+
+    cells[x][y] に色を持つのに加えて、同じ内容を codes（array('b')、
+    x * BOARD_SIZE + y の順に 1: 黒 / -1: 白 / 0: 空き）でも保持する。
+    AIへの受け渡しやハッシュ・定石のキーはこちらから変換なしで作る。
+    """
 
     def __init__(self):
         """盤面の初期化"""
@@ -14,11 +53,12 @@ class Board:
         self.cells = [
             [None] * Constants.BOARD_SIZE for _ in range(Constants.BOARD_SIZE)
         ]
+        self.codes = array("b", bytes(Constants.BOARD_SIZE * Constants.BOARD_SIZE))
         mid = Constants.BOARD_SIZE // 2
-        self.cells[mid - 1][mid - 1] = Constants.WHITE
-        self.cells[mid - 1][mid] = Constants.BLACK
-        self.cells[mid][mid - 1] = Constants.BLACK
-        self.cells[mid][mid] = Constants.WHITE
+        self.set_cell(mid - 1, mid - 1, Constants.WHITE)
+        self.set_cell(mid - 1, mid, Constants.BLACK)
+        self.set_cell(mid, mid - 1, Constants.BLACK)
+        self.set_cell(mid, mid, Constants.WHITE)
 
     def get_cell(self, x, y):
         """(x,y)の石の色を取得"""
@@ -30,19 +70,47 @@ class Board:
         """(x,y)に色をセット"""
         if 0 <= x < Constants.BOARD_SIZE and 0 <= y < Constants.BOARD_SIZE:
             self.cells[x][y] = color
+            self.codes[x * Constants.BOARD_SIZE + y] = CELL_CODES[color]
+
+    def set_cells(self, cells):
+        """cells[x][y] 形式の盤面をまるごと読み込む"""
+        self.cells = [list(column) for column in cells]
+        self.codes = array(
+            "b", [CELL_CODES[cell] for column in self.cells for cell in column]
+        )
+
+    def key(self):
+        """盤面を表す64バイトの bytes（ハッシュや定石のキーに使う）"""
+        return self.codes.tobytes()
+
+    def load_key(self, key):
+        """key() で作った bytes から盤面を復元する"""
+        size = Constants.BOARD_SIZE
+        self.codes = array("b", key)
+        self.cells = [
+            [CODE_COLORS[code] for code in self.codes[x * size : (x + 1) * size]]
+            for x in range(size)
+        ]
+
+    def code_rows(self):
+        """codes を cells と同じ [x][y] の入れ子リストにして返す（AI用）"""
+        size = Constants.BOARD_SIZE
+        codes = self.codes
+        return [codes[x * size : (x + 1) * size].tolist() for x in range(size)]
 
     def copy(self):
         """盤面のディープコピーを返す"""
         board_copy = Board()
         board_copy.cells = copy.deepcopy(self.cells)
+        board_copy.codes = array("b", self.codes)
         return board_copy
 
     def count_stones(self):
         """黒石と白石の数をカウント"""
-        black_count = sum(row.count(Constants.BLACK) for row in self.cells)
-        white_count = sum(row.count(Constants.WHITE) for row in self.cells)
+        black_count = self.codes.count(CELL_CODES[Constants.BLACK])
+        white_count = self.codes.count(CELL_CODES[Constants.WHITE])
         return black_count, white_count
 
     def __getitem__(self, key):
         """配列形式でのアクセスをサポート（board[x]の形式）"""
-        return self.cells[key]
\ No newline at end of file
+        return self.cells[key]
@@ -17,8 +17,12 @@ class Constants:
     # 方向ベクトル (8方向)
     DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
 
+    # 対局が終わるたびに棋譜を追記するファイル（1行1局のテキスト形式）
+    GAME_RECORD_FILE = "game_records.txt"
+
     # アニメーション設定
     ANIMATION_SPEED = 0.1
+    ANIMATION_STAGGER = 0.3  # 返す石の開始を距離1ごとに遅らせる量（1回分に対する割合）
     MESSAGE_DURATION = 2000  # ms
 
     # AIタイプ
@@ -26,3 +30,4 @@ class Constants:
     AI_TYPE_MINIMAX = "minimax"
     AI_TYPE_STRONGER = "stronger"
     AI_TYPE_WORLD = "world"
+    AI_TYPE_MCTS = "mcts"
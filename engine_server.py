@@ -0,0 +1,541 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import multiprocessing
+import struct
+import threading
+import time
+from game_record import square_name
+from ai.world_class_ai import WorldAI, AI_BLACK, AI_WHITE, AI_EMPTY
+
+BOARD_SIZE = 8
+
+# 盤面文字列（x * 8 + y の順に 64 文字）で使う記号
+CELL_CODES = {"B": AI_BLACK, "W": AI_WHITE, ".": AI_EMPTY}
+PLAYER_CODES = {"B": AI_BLACK, "W": AI_WHITE}
+
+JOB_KINDS = ("bestmove", "analyse", "solve")
+
+# 完全読みを受け付ける最大の空きマス数（これ以下でも time_limit を過ぎれば打ち切る）
+MAX_SOLVE_EMPTIES = 16
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+HTTP_STATUS = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class RequestError(Exception):
+    """リクエストの内容が不正な場合の例外"""
+
+
+def parse_board(text):
+    """盤面文字列を AI 形式の2次元配列に変換する"""
+    if not isinstance(text, str) or len(text) != BOARD_SIZE * BOARD_SIZE:
+        raise RequestError("board は 64 文字の文字列で指定してください")
+    try:
+        cells = [CELL_CODES[ch] for ch in text.upper()]
+    except KeyError:
+        raise RequestError("board に使える文字は B / W / . です")
+    return [cells[i : i + BOARD_SIZE] for i in range(0, len(cells), BOARD_SIZE)]
+
+
+def parse_player(text):
+    """手番文字列 ("B" / "W") を AI 形式に変換する"""
+    if not isinstance(text, str) or text.upper() not in PLAYER_CODES:
+        raise RequestError('player は "B" か "W" で指定してください')
+    return PLAYER_CODES[text.upper()]
+
+
+def _move_json(move):
+    if move is None:
+        return {"move": None}
+    x, y = move
+    return {"move": square_name(x, y), "x": x, "y": y}
+
+
+# ---- ワーカープロセス ----
+
+
+def _run_job(engine, kind, board, player, time_limit, multipv=1):
+    """ワーカー内で1件のジョブを処理する"""
+    if kind == "solve":
+        empties = sum(row.count(AI_EMPTY) for row in board)
+        if empties > MAX_SOLVE_EMPTIES:
+            return {"error": f"空きマスが多すぎます（{MAX_SOLVE_EMPTIES}以下）"}
+        # 読み切りも time_limit の時間予算を守る（間に合わなければエラーを返す）
+        score, move = engine.solve_endgame(board, player, time_limit)
+        if score is None:
+            return {
+                "error": f"{time_limit:.2f}秒以内に読み切れませんでした",
+                "timeout": True,
+            }
+        result = _move_json(move)
+        result["score"] = score
+        return result
+
+    if kind == "analyse":
+        started = time.time()
+        lines = engine.analyze(board, player, time_limit, multipv)
+        result = _move_json(lines[0]["move"] if lines else None)
+        result["lines"] = [
+            dict(
+                _move_json(line["move"]),
+                score=line["score"],
+                bound=line["bound"],
+                depth=line["depth"],
+                pv=[square_name(x, y) for x, y in line["pv"]],
+            )
+            for line in lines
+        ]
+        result["nodes"] = engine.nodes_expanded
+        result["elapsed"] = round(time.time() - started, 3)
+        return result
+
+    return _move_json(engine.get_move(board, player, time_limit))
+
+
+def _worker_main(conn):
+    """ワーカープロセスの本体。ジョブのまとまりを受け取り、1件ずつ結果を返す
+
+    トランスポジションテーブルは手番側の視点で値を持つため、AIは手番ごとに持つ。
+    プロセスが生きている間は同じAIを使い続けるので、テーブルは温まったままになる。
+    """
+    engines = {AI_BLACK: WorldAI(None), AI_WHITE: WorldAI(None)}
+    conn.send(("ready", None, None))
+    while True:
+        batch = conn.recv()
+        if batch is None:
+            break
+        for job_id, kind, board, player, deadline, time_limit, multipv in batch:
+            # 待ち時間も含めて時間予算を守る
+            budget = max(0.05, min(time_limit, deadline - time.time()))
+            try:
+                result = _run_job(engines[player], kind, board, player, budget, multipv)
+            except Exception as e:
+                result = {"error": f"AI Error: {e}"}
+            conn.send(("result", job_id, result))
+        conn.send(("idle", None, None))
+    conn.close()
+
+
+class EngineWorker:
+    """ワーカープロセス1つ分の接続"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_worker_main, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.reader = None
+        self.ready = False  # 準備完了の通知を受け取ったか
+        self.alive = True  # プロセスとの接続が生きているか
+        self.pending = set()  # 送ったが結果を受け取っていないジョブのID
+
+    def start_reader(self, loop):
+        """結果を受け取るスレッドを開始する（接続が切れたらプールに知らせる）"""
+
+        def read():
+            try:
+                while True:
+                    message = self.conn.recv()
+                    loop.call_soon_threadsafe(self.pool._on_message, self, message)
+            except (EOFError, OSError):
+                pass
+            try:
+                loop.call_soon_threadsafe(self.pool._on_worker_lost, self)
+            except RuntimeError:
+                # イベントループが既に閉じている（停止後）
+                pass
+
+        self.reader = threading.Thread(target=read, daemon=True)
+        self.reader.start()
+
+    def send_batch(self, batch):
+        self.pending.update(job[0] for job in batch)
+        self.conn.send(batch)
+
+    def stop(self):
+        self.alive = False
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class EnginePool:
+    """起動済みのワーカープロセスにジョブを振り分けるプール
+
+    空いているワーカーが出るまでにたまったジョブはまとめて1回で送り、
+    プロセス間通信の往復を減らす。1回に送るのは、たまったジョブを空いている
+    ワーカーで均等に分けた数まで（最大 batch_size 件）とし、一度にたまった
+    ジョブが1つのプロセスで順番に処理されないようにする。
+
+    ワーカーのプロセスが落ちた場合は、そのワーカーに送ったジョブを
+    エラーで終わらせ、代わりのワーカーを起動する。
+    """
+
+    def __init__(self, workers=2, batch_size=8, max_time_limit=10.0):
+        self.num_workers = workers
+        self.batch_size = batch_size
+        self.max_time_limit = max_time_limit
+        self.workers = []
+        self.queue = None
+        self.idle_workers = None
+        self.futures = {}
+        self.job_ids = itertools.count()
+        self._loop = None
+        self._ready = 0
+        self._ready_event = None
+        self._dispatcher = None
+        self._stopping = False
+
+    async def start(self):
+        """ワーカーを起動し、全員の準備ができるまで待つ"""
+        self._loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.idle_workers = asyncio.Queue()
+        self._ready_event = asyncio.Event()
+        self._stopping = False
+        # スレッドを作る前にプロセスを全て起動しておく
+        self.workers = [EngineWorker(self) for _ in range(self.num_workers)]
+        for worker in self.workers:
+            worker.start_reader(self._loop)
+        await self._ready_event.wait()
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self):
+        """ワーカーを停止する"""
+        self._stopping = True
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        for worker in self.workers:
+            await asyncio.get_running_loop().run_in_executor(None, worker.stop)
+        for future in self.futures.values():
+            if not future.done():
+                future.set_exception(RuntimeError("エンジンが停止しました"))
+        self.futures.clear()
+
+    def _on_message(self, worker, message):
+        kind, job_id, result = message
+        if kind == "ready":
+            worker.ready = True
+            self.idle_workers.put_nowait(worker)
+            if not self._ready_event.is_set():
+                self._ready += 1
+                if self._ready == len(self.workers):
+                    self._ready_event.set()
+        elif kind == "idle":
+            self.idle_workers.put_nowait(worker)
+        elif kind == "result":
+            worker.pending.discard(job_id)
+            future = self.futures.pop(job_id, None)
+            if future is not None and not future.done():
+                future.set_result(result)
+
+    def _on_worker_lost(self, worker):
+        """ワーカーとの接続が切れたときの処理（イベントループのスレッドで呼ばれる）"""
+        if self._stopping or not worker.alive:
+            return
+        worker.alive = False
+        for job_id in worker.pending:
+            future = self.futures.pop(job_id, None)
+            if future is not None and not future.done():
+                future.set_exception(RuntimeError("エンジンのプロセスが終了しました"))
+        worker.pending.clear()
+        if worker in self.workers:
+            self.workers.remove(worker)
+        # 準備完了前に落ちたワーカーは起動し直しても同じように落ちるので補充しない
+        if worker.ready:
+            replacement = EngineWorker(self)
+            self.workers.append(replacement)
+            replacement.start_reader(self._loop)
+
+    async def _next_idle_worker(self):
+        """生きている空きワーカーを返す（落ちたワーカーは読み飛ばす）"""
+        while True:
+            worker = await self.idle_workers.get()
+            if worker.alive:
+                return worker
+
+    async def _dispatch(self):
+        while True:
+            job = await self.queue.get()
+            worker = await self._next_idle_worker()
+            # たまったジョブを空いているワーカーで均等に分ける
+            waiting = 1 + self.queue.qsize()
+            idle = 1 + self.idle_workers.qsize()
+            limit = min(self.batch_size, -(-waiting // idle))
+            batch = [job]
+            while len(batch) < limit and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                worker.send_batch(batch)
+            except (BrokenPipeError, OSError):
+                # 送る前にプロセスが落ちていた。ジョブはまだ動いていないので並べ直す
+                worker.pending.difference_update(job[0] for job in batch)
+                self._on_worker_lost(worker)
+                for job in batch:
+                    self.queue.put_nowait(job)
+
+    async def submit(self, kind, board, player, time_limit=1.0, multipv=1):
+        """ジョブを投入し、結果の辞書を返す（multipv は analyse で返す候補手の数）"""
+        if kind not in JOB_KINDS:
+            raise RequestError(f"不明な処理です: {kind}")
+        time_limit = min(max(float(time_limit), 0.05), self.max_time_limit)
+        job_id = next(self.job_ids)
+        future = asyncio.get_running_loop().create_future()
+        self.futures[job_id] = future
+        deadline = time.time() + time_limit
+        await self.queue.put(
+            (job_id, kind, board, player, deadline, time_limit, multipv)
+        )
+        return await future
+
+
+# ---- HTTP / WebSocket ----
+
+
+class EngineServer:
+    """エンジンプールを HTTP と WebSocket で公開するサーバー
+
+    HTTP:      POST /bestmove, /analyse, /solve
+               （JSON: board, player, time_limit。analyse は multipv も指定可）
+    WebSocket: /ws に {"id": ..., "type": "bestmove", "board": ..., ...} を送る
+    """
+
+    def __init__(self, pool, host="127.0.0.1", port=8765):
+        self.pool = pool
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def start(self):
+        await self.pool.start()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.pool.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def handle_request(self, kind, payload):
+        """JSONの内容を検証してプールに渡す"""
+        if not isinstance(payload, dict):
+            raise RequestError("JSONオブジェクトを送ってください")
+        board = parse_board(payload.get("board"))
+        player = parse_player(payload.get("player", "B"))
+        try:
+            time_limit = float(payload.get("time_limit", 1.0))
+        except (TypeError, ValueError):
+            raise RequestError("time_limit は数値で指定してください")
+        multipv = payload.get("multipv", 1)
+        if not isinstance(multipv, int) or not 1 <= multipv <= 64:
+            raise RequestError("multipv は 1 以上の整数で指定してください")
+        return await self.pool.submit(kind, board, player, time_limit, multipv)
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._handle_websocket(reader, writer, headers)
+                return
+            body = b""
+            length = int(headers.get("content-length", 0))
+            if length:
+                body = await reader.readexactly(length)
+            status, response = await self._handle_http(method, path, body)
+            self._write_http(writer, status, response)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_http(self, method, path, body):
+        if method == "OPTIONS":
+            return 204, None
+        if path == "/health":
+            return 200, {"status": "ok", "workers": len(self.pool.workers)}
+        kind = path.strip("/")
+        if kind not in JOB_KINDS:
+            return 404, {"error": f"不明なパスです: {path}"}
+        if method != "POST":
+            return 405, {"error": "POST で送ってください"}
+        try:
+            payload = json.loads(body or b"{}")
+            return 200, await self.handle_request(kind, payload)
+        except json.JSONDecodeError:
+            return 400, {"error": "JSONとして読めません"}
+        except RequestError as e:
+            return 400, {"error": str(e)}
+        except RuntimeError as e:
+            # エンジンのプロセスが落ちた・停止した
+            return 500, {"error": str(e)}
+
+    def _write_http(self, writer, status, response):
+        body = b"" if response is None else json.dumps(response).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {HTTP_STATUS[status]}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            # ブラウザ版（Pygbag）から呼べるようにする
+            "Access-Control-Allow-Origin: *",
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+            "Access-Control-Allow-Headers: Content-Type",
+            "Connection: close",
+        ]
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+
+    async def _handle_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(
+            hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()
+        ).decode("ascii")
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        await writer.drain()
+
+        send_lock = asyncio.Lock()
+        tasks = set()
+
+        async def send(opcode, payload):
+            async with send_lock:
+                writer.write(encode_frame(opcode, payload))
+                await writer.drain()
+
+        async def answer(message):
+            request_id = None
+            try:
+                payload = json.loads(message)
+                if isinstance(payload, dict):
+                    request_id = payload.get("id")
+                    result = await self.handle_request(payload.get("type"), payload)
+                else:
+                    result = {"error": "JSONオブジェクトを送ってください"}
+            except json.JSONDecodeError:
+                result = {"error": "JSONとして読めません"}
+            except (RequestError, RuntimeError) as e:
+                result = {"error": str(e)}
+            result = dict(result, id=request_id)
+            await send(0x1, json.dumps(result).encode("utf-8"))
+
+        while True:
+            opcode, payload = await read_frame(reader)
+            if opcode == 0x8:  # close
+                await send(0x8, payload[:2])
+                break
+            if opcode == 0x9:  # ping
+                await send(0xA, payload)
+            elif opcode == 0x1:
+                # 1接続から複数の問い合わせを並行して受け付ける
+                task = asyncio.create_task(answer(payload.decode("utf-8")))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        for task in list(tasks):
+            task.cancel()
+
+
+def encode_frame(opcode, payload):
+    """WebSocketのフレームを作る（サーバーからはマスクしない）"""
+    header = bytearray([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header.append(length)
+    elif length < 1 << 16:
+        header.append(126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(127)
+        header += struct.pack("!Q", length)
+    return bytes(header) + payload
+
+
+async def read_frame(reader):
+    """WebSocketのメッセージを1つ読む（分割されたフレームは連結する）"""
+    message = bytearray()
+    message_opcode = None
+    while True:
+        first, second = await reader.readexactly(2)
+        fin = first & 0x80
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", await reader.readexactly(8))
+        mask = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+        if mask is not None:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+        if opcode >= 0x8:
+            # 制御フレームは分割されない
+            return opcode, payload
+        if opcode != 0x0:
+            message_opcode = opcode
+        message += payload
+        if fin:
+            return message_opcode, bytes(message)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="オセロAIのエンジンサーバー")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--max-time-limit", type=float, default=10.0)
+    args = parser.parse_args()
+
+    pool = EnginePool(args.workers, args.batch_size, args.max_time_limit)
+    server = EngineServer(pool, args.host, args.port)
+    print(f"エンジンサーバーを起動します: http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
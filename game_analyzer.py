@@ -1,39 +1,42 @@
-import copy
 from constants import Constants
 
-# あなたのプロジェクトで最も強いAIをインポート
-from ai.world_class_ai import WorldAI
+# 分析にはプロジェクトで最も強いAI（WorldAI）を使う。
+# エンジンはプールから借りて使い回す（キャッシュが温まったまま次の分析に使える）。
+# WorldAI のモジュールは最初に分析するときに読み込む（起動を速くするため）
+from ai.engine_pool import shared_engine_pool
 
 
 class GameAnalyzer:
     """盤面を分析してアドバイスを提供するクラス"""
 
-    def __init__(self):
-        self.ai = None
+    def __init__(self, engine_pool=None):
+        self.engine_pool = shared_engine_pool if engine_pool is None else engine_pool
 
     def analyze(self, game_logic):
         """
         現在の盤面を受け取り、AIが考える最善手を返す
         戻り値: (x, y) のタプル、または打てる場所がない場合は None
         """
-        # 1. 盤面状態を壊さないようにDeepCopy
-        copied_logic = copy.deepcopy(game_logic)
-
-        # 2. AIインスタンスを作成
-        analyzer_ai = WorldAI(copied_logic)
-
-        # 3. WorldAIが計算できる形式（intの2次元配列）にデータを変換
-        #    WorldAI内のヘルパーメソッドを利用します
-        raw_board = copied_logic.board
-        current_turn = copied_logic.state.turn
-
-        ai_board = analyzer_ai._convert_board(raw_board)
-        ai_player = analyzer_ai._convert_to_ai_player(current_turn)
-
-        # 4. AIに思考させる
-        #    get_move(board, player, time_limit) を呼び出す
-        #    ※アドバイス用なので時間は短め(2秒)に設定していますが、
-        #      精度を上げたい場合は time_limit=5 などにしてください
-        best_move = analyzer_ai.get_move(ai_board, ai_player, time_limit=5)
-
-        return best_move
+        # 1. エンジンを借りる（盤面と手番はエンジン側の GameLogic に写されるので、
+        #    game_logic は変更されない）
+        with self.engine_pool.borrow(Constants.AI_TYPE_WORLD, game_logic) as engine:
+            # 2. WorldAIが計算できる形式（intの2次元配列）にデータを変換
+            #    WorldAI内のヘルパーメソッドを利用します
+            ai_board = engine._convert_board(engine.game_logic.state.board)
+            ai_player = engine._convert_to_ai_player(engine.game_logic.state.turn)
+
+            # 3. AIに思考させる
+            #    get_move(board, player, time_limit) を呼び出す
+            #    ※精度を上げたい場合は time_limit を長くしてください
+            return engine.get_move(ai_board, ai_player, time_limit=5)
+
+    def analyze_moves(self, game_logic, num_moves=3, time_limit=5):
+        """
+        現在の盤面で評価の高い手を最大 num_moves 手、評価値つきで返す
+        戻り値: WorldAI.analyze と同じ辞書のリスト
+                (move, score, bound, depth, pv。score は手番側から見た値)
+        """
+        with self.engine_pool.borrow(Constants.AI_TYPE_WORLD, game_logic) as engine:
+            ai_board = engine._convert_board(engine.game_logic.state.board)
+            ai_player = engine._convert_to_ai_player(engine.game_logic.state.turn)
+            return engine.analyze(ai_board, ai_player, time_limit, num_moves)
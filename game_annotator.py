@@ -0,0 +1,112 @@
+import argparse
+import sys
+from constants import Constants
+from game_record import GameRecord, iter_positions, iter_transcripts, square_name
+from ai.world_class_ai import WorldAI, AI_BLACK, AI_WHITE
+
+# 悪手とみなす損失（終盤は石数差、中盤は評価値の単位）
+BLUNDER_DISCS = 6
+BLUNDER_EVAL = 500
+
+# この空きマス数以下の局面は完全読みの値（石数差）になる
+EXACT_EMPTIES = 14
+
+
+def annotate_game(
+    move_history,
+    time_limit=1.0,
+    blunder_discs=BLUNDER_DISCS,
+    blunder_eval=BLUNDER_EVAL,
+):
+    """棋譜の全ての手を評価し、手ごとの損失と悪手の判定を返す
+
+    move_history は GameController.record_move が作る {"x", "y", "color"} のリスト。
+    局面は終局側から順に調べる。手番ごとに同じAIを使い回すので、終盤の完全読みや
+    トランスポジションテーブルの内容が、それより前の局面の探索に再利用される。
+
+    戻り値: 手順通りに並んだ辞書のリスト
+        ply, move, color, best_move, best_score, score, loss, exact, blunder, pv
+    score / best_score は手番側から見た値、loss = best_score - score。
+    """
+    record = GameRecord(move_history)
+    positions = [
+        ([row[:] for row in board], color, move)
+        for board, color, move in iter_positions(record)
+    ]
+    engines = {AI_BLACK: WorldAI(None), AI_WHITE: WorldAI(None)}
+
+    annotations = [None] * len(positions)
+    for ply in range(len(positions) - 1, -1, -1):
+        board, color, move = positions[ply]
+        engine = engines[AI_BLACK if color == Constants.BLACK else AI_WHITE]
+        ai_board = engine._convert_board(board)
+        ai_player = engine._convert_to_ai_player(color)
+        empties = sum(row.count(None) for row in board)
+
+        results = engine.analyze(
+            ai_board, ai_player, time_limit, num_moves=1, include_moves=(move,)
+        )
+        best = results[0]
+        played = next(r for r in results if r["move"] == move)
+        exact = empties <= EXACT_EMPTIES
+        loss = None
+        if best["score"] is not None and played["score"] is not None:
+            loss = max(0, best["score"] - played["score"])
+        threshold = blunder_discs if exact else blunder_eval
+        annotations[ply] = {
+            "ply": ply,
+            "move": move,
+            "color": color,
+            "best_move": best["move"],
+            "best_score": best["score"],
+            "score": played["score"],
+            "loss": loss,
+            "exact": exact,
+            "blunder": loss is not None and loss >= threshold,
+            "pv": best["pv"],
+        }
+    return annotations
+
+
+def format_annotations(annotations):
+    """annotate_game の結果を1手1行の文字列にする"""
+    lines = []
+    for a in annotations:
+        side = "B" if a["color"] == Constants.BLACK else "W"
+        line = f"{a['ply'] + 1:2d} {side} {square_name(*a['move'])}"
+        if a["loss"] is not None:
+            unit = "discs" if a["exact"] else "eval"
+            line += f"  best {square_name(*a['best_move'])}"
+            line += f"  loss {a['loss']:.0f} {unit}"
+        if a["blunder"]:
+            line += "  ??"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="棋譜（1行1局のテキスト）の全ての手を評価し、悪手を指摘する"
+    )
+    parser.add_argument("path", nargs="?", help="棋譜ファイル（省略時は標準入力）")
+    parser.add_argument("--time-limit", type=float, default=1.0)
+    parser.add_argument("--blunder-discs", type=int, default=BLUNDER_DISCS)
+    parser.add_argument("--blunder-eval", type=float, default=BLUNDER_EVAL)
+    args = parser.parse_args()
+
+    stream = open(args.path, encoding="utf-8") if args.path else sys.stdin
+    with stream:
+        for number, record in enumerate(iter_transcripts(stream), 1):
+            annotations = annotate_game(
+                record.to_move_history(),
+                args.time_limit,
+                args.blunder_discs,
+                args.blunder_eval,
+            )
+            blunders = sum(1 for a in annotations if a["blunder"])
+            print(f"# game {number}: {record.to_transcript()} ({blunders} blunders)")
+            print(format_annotations(annotations))
+
+
+if __name__ == "__main__":
+    main()
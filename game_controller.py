@@ -5,19 +5,29 @@ from constants import Constants
 from game_logic import GameLogic
 from renderer import Renderer
 from game_reviewer import GameReviewer
-from ai.random_ai import RandomAI
-from ai.minimax_ai import MinimaxAI
-from ai.stronger_ai import StrongerAI
-from ai.world_class_ai import WorldAI
+from game_record import GameRecord, write_transcripts
+from ai.executor import AIExecutor, ProcessAIExecutor
+from ai.registry import AI_TYPES, create_ai
 
 
 class GameController:
     """ゲームの実行と制御を管理するクラス"""
 
-    def __init__(self, ai_type=Constants.AI_TYPE_MINIMAX, screen=None):
-        """ゲームコントローラの初期化"""
-        self.game_logic = GameLogic()
+    def __init__(
+        self, ai_type=Constants.AI_TYPE_MINIMAX, screen=None, use_process=False
+    ):
+        """ゲームコントローラの初期化
+
+        use_process を True にするとAIの探索を常駐する子プロセスで行う
+        （描画ループとGILを奪い合わないので、思考中もFPSが落ちない）。
+        """
+        self.game_logic = GameLogic(pygame.time.get_ticks)
         self.ai = self.create_ai(ai_type)
+        # AIの思考はワーカーで行い、選ばれた手はメインスレッドで打つ
+        if use_process:
+            self.ai_executor = ProcessAIExecutor(self.ai)
+        else:
+            self.ai_executor = AIExecutor(self.ai)
         self.screen = screen
         self.renderer = Renderer(self.screen, self.game_logic, self.ai)
 
@@ -25,49 +35,40 @@ class GameController:
         # 形式: {"color": color, "x": x, "y": y}
         self.move_history = []
 
-        # ★追加: AIの手を検知するために、前のターンの盤面状態を保持（簡易的な方法）
-        self.previous_board = self.copy_board(self.game_logic.board)
-
-    def copy_board(self, board):
-        """盤面のコピーを作成するヘルパー関数"""
-        return [row[:] for row in board]
-
     def create_ai(self, ai_type):
-        """指定されたタイプのAIを作成"""
-        # (変更なし)
-        if ai_type == Constants.AI_TYPE_RANDOM:
-            return RandomAI(self.game_logic)
-        elif ai_type == Constants.AI_TYPE_MINIMAX:
-            return MinimaxAI(self.game_logic)
-        elif ai_type == Constants.AI_TYPE_STRONGER:
-            return StrongerAI(self.game_logic)
-        elif ai_type == Constants.AI_TYPE_WORLD:
-            return WorldAI(self.game_logic)
-        else:
-            return MinimaxAI(self.game_logic)
+        """指定されたタイプのAIを作成（不明なタイプは Minimax）
+
+        AIのモジュールはここで初めて読み込まれる。
+        """
+        if ai_type not in AI_TYPES:
+            ai_type = Constants.AI_TYPE_MINIMAX
+        return create_ai(ai_type, self.game_logic)
 
     def record_move(self, x, y, color):
         """★追加: 手を記録する"""
         self.move_history.append({"x": x, "y": y, "color": color})
-        # 次の比較用に現在の盤面を保存
-        self.previous_board = self.copy_board(self.game_logic.board)
-
-    def detect_ai_move(self):
-        """★追加: AIが打った場所を特定して記録する"""
-        current_board = self.game_logic.board
-        for y in range(Constants.BOARD_SIZE):
-            for x in range(Constants.BOARD_SIZE):
-                # 前の盤面では空だったのに、今は石がある場所を探す
-                if (
-                    self.previous_board[y][x] is None
-                    and current_board[y][x] == Constants.WHITE
-                ):
-                    self.record_move(x, y, Constants.WHITE)
-                    return
+
+    def apply_ai_move(self, move):
+        """AIが選んだ手をメインスレッドで打ち、棋譜に記録する"""
+        state = self.game_logic.state
+        if state.game_over or state.is_player_turn():
+            return
+        if move is not None:
+            color = state.turn
+            if self.game_logic.place_stone(*move):
+                self.record_move(move[0], move[1], color)
+        elif not self.game_logic.pass_turn():
+            state.set_message("AIエラー: 有効な手が見つかりません")
+
+    def save_game_record(self, path):
+        """棋譜を1行1局のテキスト形式でファイルに追記する"""
+        with open(path, "a", encoding="utf-8") as f:
+            write_transcripts(f, [GameRecord(self.move_history)])
 
     def handle_event(self, event):
         """イベント処理"""
         if event.type == pygame.QUIT:
+            self.ai_executor.cancel()
             return False
 
         elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -91,11 +92,19 @@ class GameController:
         elif event.type == pygame.KEYDOWN:
             # (変更なし)
             if event.key == pygame.K_u:
+                self.ai_executor.cancel()
                 self.game_logic.undo_move()
                 # 注意: Undo機能を使う場合、本来はhistoryからも削除する必要がありますが、今回は割愛
             elif event.key == pygame.K_SPACE:
                 self.game_logic.toggle_pause()
+            elif event.key == pygame.K_t:
+                # ターボモード: AI同士の対戦などでアニメーションを待たない
+                if self.game_logic.toggle_turbo():
+                    self.game_logic.state.set_message("ターボ: ON")
+                else:
+                    self.game_logic.state.set_message("ターボ: OFF")
             elif event.key == pygame.K_ESCAPE:
+                self.ai_executor.cancel()
                 return False
 
         return True
@@ -104,21 +113,19 @@ class GameController:
         """ゲーム状態の更新"""
         self.game_logic.update_animation()
 
-        # AIの手番処理
+        # AIの手番処理（思考はワーカーで行い、結果は毎フレーム確認する）
         if (
             not self.game_logic.state.is_animating
             and not self.game_logic.state.game_over
             and not self.game_logic.state.is_player_turn()
             and not self.game_logic.state.paused
-            and not self.ai.thinking
+            and not self.ai_executor.busy
         ):
-            self.ai.start_thinking()
+            self.ai_executor.submit()
 
-        # ★追加: AIが思考中でなく、アニメーション中でもない時、
-        # 盤面が変わっていればAIが着手したとみなして記録する
-        if not self.game_logic.state.is_player_turn() and not self.ai.thinking:
-            # 前回の盤面と石の数が違えば、AIが打ったということ
-            self.detect_ai_move()
+        done, move = self.ai_executor.poll()
+        if done:
+            self.apply_ai_move(move)
 
     def run(self):
         """ゲームループの実行"""
@@ -140,8 +147,14 @@ class GameController:
             self.renderer.draw_animations()
             pygame.display.flip()
 
+        self.ai_executor.close()
+
         # ゲーム終了時の処理
         if self.game_logic.state.game_over:
+            try:
+                self.save_game_record(Constants.GAME_RECORD_FILE)
+            except OSError as e:
+                print(f"棋譜を保存できませんでした: {e}")
             result = self.game_logic.game_result()
             self.animate_end(result)
 
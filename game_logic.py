@@ -1,22 +1,27 @@
-import copy
-import pygame
 from constants import Constants
 from game_state import GameState
-from board import Board
+from board import RAYS, Board
+from move_cache import shared_move_cache
 
 
 class GameLogic:
     """オセロのゲームロジックを管理するクラス"""
 
-    def __init__(self):
-        """ゲームロジックの初期化"""
-        self.state = GameState()
+    def __init__(self, get_ticks=None, move_cache=None):
+        """ゲームロジックの初期化（get_ticks は GameState に渡す時刻関数）"""
+        self.state = GameState(get_ticks)
+        # 合法手のキャッシュ（既定ではAIと共有する）
+        self.move_cache = shared_move_cache if move_cache is None else move_cache
 
     @property
     def board(self):
         """外部から .board でアクセスされたら state.board を返す"""
         return self.state.board.cells
 
+    def reset(self):
+        """同じ GameLogic のまま対局を初期状態に戻す（合法手のキャッシュは残す）"""
+        self.state.reset()
+
     def get_current_board(self):
         return self.state.board
 
@@ -40,23 +45,19 @@ class GameLogic:
 
         opponent = Constants.WHITE if color == Constants.BLACK else Constants.BLACK
 
-        # 全方向を探索
-        for dx, dy in Constants.DIRECTIONS:
-            nx, ny = x + dx, y + dy
+        # 全方向を探索（列は盤の範囲チェック済み）
+        for ray in RAYS[x][y]:
             has_opponent_between = False
 
             # この方向に対して、反転できる石があるか確認
-            while self.is_valid_position(nx, ny):
-                if board[nx][ny] == opponent:
+            for nx, ny in ray:
+                cell = board[nx][ny]
+                if cell == opponent:
                     has_opponent_between = True
-                elif board[nx][ny] == color:
-                    if has_opponent_between:
-                        return True
-                    break
-                else:
-                    break
-                nx += dx
-                ny += dy
+                    continue
+                if cell == color and has_opponent_between:
+                    return True
+                break
 
         return False
 
@@ -73,21 +74,17 @@ class GameLogic:
         stones_to_flip = []
         opponent = Constants.WHITE if color == Constants.BLACK else Constants.BLACK
 
-        for dx, dy in Constants.DIRECTIONS:
-            nx, ny = x + dx, y + dy
+        for ray in RAYS[x][y]:
             temp_flips = []
 
-            while self.is_valid_position(nx, ny):
-                if board[nx][ny] == opponent:
+            for nx, ny in ray:
+                cell = board[nx][ny]
+                if cell == opponent:
                     temp_flips.append((nx, ny))
-                elif board[nx][ny] == color:
-                    if temp_flips:  # 少なくとも1つの相手の石がある場合
-                        stones_to_flip.extend(temp_flips)
-                    break
-                else:
-                    break
-                nx += dx
-                ny += dy
+                    continue
+                if cell == color:
+                    stones_to_flip.extend(temp_flips)
+                break
 
         return stones_to_flip
 
@@ -108,35 +105,26 @@ class GameLogic:
         self.state.board.set_cell(x, y, self.state.turn)
         stones_to_flip = self.get_stones_to_flip(x, y)
 
-        # 配置する石のアニメーションを追加
-        self.state.animation_queue.append(
-            {
-                "type": "place",
-                "position": (x, y),
-                "color": self.state.turn,
-                "progress": 0,
-            }
+        opponent = (
+            Constants.WHITE if self.state.turn == Constants.BLACK else Constants.BLACK
         )
-
-        # 反転する石のアニメーションを追加
-        for fx, fy in stones_to_flip:
-            self.state.animation_queue.append(
-                {
-                    "type": "flip",
-                    "position": (fx, fy),
-                    "from_color": (
-                        Constants.WHITE
-                        if self.state.turn == Constants.BLACK
-                        else Constants.BLACK
-                    ),
-                    "to_color": self.state.turn,
-                    "progress": 0,
-                }
-            )
+        if self.state.turbo:
+            # ターボモードではアニメーションせずに反転する
+            for fx, fy in stones_to_flip:
+                self.state.board.set_cell(fx, fy, self.state.turn)
+        else:
+            # 置く石と返る石のアニメーションを同時に再生する。
+            # 返る石は置いた石から離れるほど遅れて始まる
+            animations = self.state.animation_queue
+            animations.add_place(x, y, self.state.turn)
+            for fx, fy in stones_to_flip:
+                distance = max(abs(fx - x), abs(fy - y))
+                delay = (distance - 1) * Constants.ANIMATION_STAGGER
+                animations.add_flip(fx, fy, opponent, self.state.turn, delay)
 
         # ターン交代
         self.state.switch_turn()
-        self.state.is_animating = True
+        self.state.is_animating = bool(self.state.animation_queue)
         self.state.pass_occurred = False
 
         return True
@@ -145,16 +133,23 @@ class GameLogic:
         """指定の盤面上で、color の着手可能な手のリストを返す"""
         if color is None:
             color = self.state.turn
+        # 同じ盤面は毎フレーム問い合わせられるのでキャッシュする
         if board is None:
             board = self.state.board.cells
-
-        valid_moves = []
-        for x in range(Constants.BOARD_SIZE):
-            for y in range(Constants.BOARD_SIZE):
-                if self.is_valid_move(x, y, color, board):
-                    valid_moves.append((x, y))
-
-        return valid_moves
+            key = (self.state.board.key(), color)
+        else:
+            key = (hash(tuple(tuple(column) for column in board)), color)
+        valid_moves = self.move_cache.get(key)
+        if valid_moves is None:
+            valid_moves = []
+            for x in range(Constants.BOARD_SIZE):
+                for y in range(Constants.BOARD_SIZE):
+                    if self.is_valid_move(x, y, color, board):
+                        valid_moves.append((x, y))
+            self.move_cache.put(key, valid_moves)
+
+        # 呼び出し側が書き換えてもキャッシュが壊れないようコピーを返す
+        return list(valid_moves)
 
     def has_valid_move(self, color=None, board=None):
         """現在の盤面で、color の有効な着手が存在するかを判定する"""
@@ -171,15 +166,17 @@ class GameLogic:
 
     def make_move_for_board(self, board, x, y, color):
         """与えられた盤面のコピーに対して、(x,y) に color の石を置き反転処理を行い新盤面を返す"""
-        if not self.is_valid_position(x, y) or not self.is_valid_move(
-            x, y, color, board
-        ):
-            return copy.deepcopy(board)  # 無効な手の場合は盤面をそのままコピーして返す
-
-        new_board = copy.deepcopy(board)
-        new_board[x][y] = color
+        # 色は不変なタプルなので、列ごとのコピーで十分
+        new_board = [column[:] for column in board]
+        if not self.is_valid_position(x, y) or board[x][y] is not None:
+            return new_board  # 無効な手の場合は盤面をそのままコピーして返す
 
+        # 返る石が無ければ無効な手（着手判定と反転で列を2度たどらない）
         stones_to_flip = self.get_stones_to_flip(x, y, color, board)
+        if not stones_to_flip:
+            return new_board
+
+        new_board[x][y] = color
         for fx, fy in stones_to_flip:
             new_board[fx][fy] = color
 
@@ -218,18 +215,10 @@ class GameLogic:
         delta_time = self.state.calculate_delta_time()
 
         if self.state.animation_queue:
-            # アニメーションの進行（フレームレート非依存）
-            animation = self.state.animation_queue[0]
-            animation["progress"] += (
-                Constants.ANIMATION_SPEED * delta_time * 60
-            )  # 60FPSを基準に調整
-
-            if animation["progress"] >= 1.0:
-                if animation["type"] == "flip":
-                    x, y = animation["position"]
-                    self.state.board.set_cell(x, y, animation["to_color"])
-                self.state.animation_queue.pop(0)
-
+            # アニメーションの進行（フレームレート非依存、60FPSを基準に調整）
+            self.state.animation_queue.advance(
+                Constants.ANIMATION_SPEED * delta_time * 60, self.state.board
+            )
             self.state.is_animating = bool(self.state.animation_queue)
 
         else:
@@ -262,6 +251,18 @@ class GameLogic:
                 else:
                     self.state.game_over = True
 
+    def finish_animations(self):
+        """再生待ちのアニメーションを全て終わらせ、盤面に反映する"""
+        self.state.animation_queue.finish(self.state.board)
+        self.state.is_animating = False
+
+    def toggle_turbo(self):
+        """ターボモード（アニメーションなし）を切り替える"""
+        self.state.turbo = not self.state.turbo
+        if self.state.turbo:
+            self.finish_animations()
+        return self.state.turbo
+
     def toggle_pause(self):
         """ゲームの一時停止を切り替える"""
         self.state.paused = not self.state.paused
@@ -288,9 +289,11 @@ class GameLogic:
         self.state.turn = Constants.BLACK  # 初期ターンに戻す
 
         # 履歴を再生
+        self.state.animation_queue.clear()
         for x, y, color in history_to_replay:
             self.state.turn = color  # 色を設定
             self.place_stone(x, y)
+            self.finish_animations()
 
         return True
 
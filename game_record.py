@@ -0,0 +1,300 @@
+import re
+from constants import Constants
+from game_logic import GameLogic
+
+COLUMN_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+# GGFのタグ（例: PB[name]、B[f5/1.23]）
+GGF_TAG_PATTERN = re.compile(r"([A-Z]+)\[([^\]]*)\]")
+
+
+def square_name(x, y):
+    """座標 (x, y) を "f5" 形式の文字列に変換する"""
+    return f"{COLUMN_LETTERS[x]}{y + 1}"
+
+
+def parse_square(text):
+    """ "f5" 形式の文字列を座標 (x, y) に変換する"""
+    text = text.strip().lower()
+    if len(text) < 2 or text[0] not in COLUMN_LETTERS:
+        raise ValueError(f"不正な座標です: {text!r}")
+    x = COLUMN_LETTERS.index(text[0])
+    y = int(text[1:]) - 1
+    if not (0 <= x < Constants.BOARD_SIZE and 0 <= y < Constants.BOARD_SIZE):
+        raise ValueError(f"盤面外の座標です: {text!r}")
+    return x, y
+
+
+class GameRecord:
+    """1局分の棋譜
+
+    moves は GameController.move_history と同じ {"x", "y", "color"} の辞書のリスト。
+    """
+
+    def __init__(self, moves=None, black_player="", white_player="", date=""):
+        self.moves = list(moves) if moves else []
+        self.black_player = black_player
+        self.white_player = white_player
+        self.date = date
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __eq__(self, other):
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return self.moves == other.moves
+
+    def to_move_history(self):
+        """GameReviewer に渡せる形式の棋譜を返す"""
+        return [dict(move) for move in self.moves]
+
+    def to_transcript(self):
+        """ "f5d6c3..." 形式の文字列に変換する"""
+        return "".join(square_name(move["x"], move["y"]) for move in self.moves)
+
+    def final_board(self):
+        """棋譜を最後まで再生した盤面を返す"""
+        _, board = _replay(self.moves)
+        return board
+
+    def score(self):
+        """最終局面の石数差（黒 - 白）を返す"""
+        black, white = _rules.count_stones(self.final_board())
+        return black - white
+
+    @classmethod
+    def from_transcript(cls, text, **info):
+        """ "f5d6c3..." 形式の文字列から棋譜を作る（パスは自動で補う）"""
+        text = re.sub(r"\s+", "", text)
+        if len(text) % 2 != 0:
+            raise ValueError(f"棋譜の長さが不正です: {text!r}")
+        squares = [parse_square(text[i : i + 2]) for i in range(0, len(text), 2)]
+        return cls(_assign_colors(squares), **info)
+
+
+# 着手判定だけに使う GameLogic（盤面は常に引数で渡す）
+_rules = GameLogic()
+
+
+def _initial_board():
+    board = [[None] * Constants.BOARD_SIZE for _ in range(Constants.BOARD_SIZE)]
+    mid = Constants.BOARD_SIZE // 2
+    board[mid - 1][mid - 1] = Constants.WHITE
+    board[mid - 1][mid] = Constants.BLACK
+    board[mid][mid - 1] = Constants.BLACK
+    board[mid][mid] = Constants.WHITE
+    return board
+
+
+def _apply_move(board, x, y, color):
+    """盤面をその場で更新する（合法手であることは呼び出し側で確認する）"""
+    for fx, fy in _rules.get_stones_to_flip(x, y, color, board):
+        board[fx][fy] = color
+    board[x][y] = color
+
+
+def _opponent(color):
+    return Constants.WHITE if color == Constants.BLACK else Constants.BLACK
+
+
+def _assign_colors(squares):
+    """座標列を再生し、パスを考慮して各手の色を決める"""
+    board = _initial_board()
+    color = Constants.BLACK
+    moves = []
+    for x, y in squares:
+        if not _rules.is_valid_move(x, y, color, board):
+            if _rules.has_valid_move(color, board):
+                raise ValueError(
+                    f"{len(moves) + 1}手目 {square_name(x, y)} は打てません"
+                )
+            # 手番側が打てないのでパス
+            color = _opponent(color)
+            if not _rules.is_valid_move(x, y, color, board):
+                raise ValueError(
+                    f"{len(moves) + 1}手目 {square_name(x, y)} は打てません"
+                )
+        _apply_move(board, x, y, color)
+        moves.append({"x": x, "y": y, "color": color})
+        color = _opponent(color)
+    return moves
+
+
+def _replay(moves):
+    """色付きの棋譜を再生し、(次の手番, 盤面) を返す"""
+    board = _initial_board()
+    color = Constants.BLACK
+    for move in moves:
+        x, y, color = move["x"], move["y"], move["color"]
+        if not _rules.is_valid_move(x, y, color, board):
+            raise ValueError(f"{square_name(x, y)} は打てません")
+        _apply_move(board, x, y, color)
+        color = _opponent(color)
+    return color, board
+
+
+def iter_positions(record):
+    """各手を打つ直前の (盤面, 手番, 着手) を順に返すジェネレータ
+
+    盤面は同じリストを更新しながら返すので、保持する場合はコピーすること。
+    """
+    board = _initial_board()
+    for move in record.moves:
+        x, y, color = move["x"], move["y"], move["color"]
+        yield board, color, (x, y)
+        if not _rules.is_valid_move(x, y, color, board):
+            raise ValueError(f"{square_name(x, y)} は打てません")
+        _apply_move(board, x, y, color)
+
+
+# ---- テキスト棋譜（1行1局） ----
+
+
+def write_transcripts(stream, records):
+    """棋譜を1行1局のテキストとして書き出す"""
+    for record in records:
+        stream.write(record.to_transcript() + "\n")
+
+
+def iter_transcripts(stream):
+    """1行1局のテキスト棋譜を1局ずつ読み込むジェネレータ（# 以降はコメント）"""
+    for line in stream:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            yield GameRecord.from_transcript(line)
+
+
+# ---- GGF ----
+
+
+def _ggf_initial_board():
+    """GGFのBOタグで使う初期配置の文字列（行ごと、最後は手番）"""
+    board = _initial_board()
+    rows = []
+    for y in range(Constants.BOARD_SIZE):
+        row = ""
+        for x in range(Constants.BOARD_SIZE):
+            cell = board[x][y]
+            if cell == Constants.BLACK:
+                row += "*"
+            elif cell == Constants.WHITE:
+                row += "O"
+            else:
+                row += "-"
+        rows.append(row)
+    return f"{Constants.BOARD_SIZE} {' '.join(rows)} *"
+
+
+def format_ggf(record):
+    """棋譜をGGF形式の文字列に変換する"""
+    size = Constants.BOARD_SIZE
+    parts = ["(;GM[Othello]"]
+    if record.date:
+        parts.append(f"DT[{record.date}]")
+    parts.append(f"PB[{record.black_player}]PW[{record.white_player}]")
+    parts.append(f"TY[{size}]RE[{record.score():+d}]")
+    parts.append(f"BO[{_ggf_initial_board()}]")
+
+    color = Constants.BLACK
+    for move in record.moves:
+        if move["color"] != color:
+            # 色が連続している場合は間にパスが入っている
+            parts.append(f"{'B' if color == Constants.BLACK else 'W'}[PA]")
+        tag = "B" if move["color"] == Constants.BLACK else "W"
+        parts.append(f"{tag}[{square_name(move['x'], move['y']).upper()}]")
+        color = _opponent(move["color"])
+    parts.append(";)")
+    return "".join(parts)
+
+
+def parse_ggf(text):
+    """GGF形式の1局分の文字列を棋譜に変換する"""
+    tags = GGF_TAG_PATTERN.findall(text)
+    info = {}
+    squares = []
+    for name, value in tags:
+        if name in ("B", "W"):
+            square = value.split("/", 1)[0].strip()
+            if square.upper() != "PA":
+                squares.append(parse_square(square))
+        elif name == "TY" and value.strip() != str(Constants.BOARD_SIZE):
+            raise ValueError(f"対応していない盤面サイズです: {value}")
+        elif name == "BO":
+            if value.split() != _ggf_initial_board().split():
+                raise ValueError("初期配置が標準ではない棋譜には対応していません")
+        elif name == "PB":
+            info["black_player"] = value
+        elif name == "PW":
+            info["white_player"] = value
+        elif name == "DT":
+            info["date"] = value
+    return GameRecord(_assign_colors(squares), **info)
+
+
+def write_ggf(stream, records):
+    """棋譜をGGF形式で1行1局として書き出す"""
+    for record in records:
+        stream.write(format_ggf(record) + "\n")
+
+
+def iter_ggf(stream, chunk_size=1 << 16, skip_invalid=True):
+    """GGFファイルを少しずつ読みながら1局ずつ返すジェネレータ
+
+    巨大なアーカイブでもファイル全体をメモリに載せずに処理できる。
+    skip_invalid が True の場合、解釈できない局は読み飛ばす。
+    """
+    buffer = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        if chunk:
+            buffer += chunk
+        while True:
+            start = buffer.find("(;")
+            if start < 0:
+                buffer = buffer[-1:] if buffer.endswith("(") else ""
+                break
+            end = buffer.find(";)", start + 2)
+            if end < 0:
+                buffer = buffer[start:]
+                break
+            game_text = buffer[start : end + 2]
+            buffer = buffer[end + 2 :]
+            try:
+                yield parse_ggf(game_text)
+            except ValueError:
+                if not skip_invalid:
+                    raise
+        if not chunk:
+            return
+
+
+# ---- バイナリ形式（1手1バイト） ----
+
+
+def encode_binary(record):
+    """棋譜を「手数1バイト + 1手1バイト」のバイト列に変換する"""
+    size = Constants.BOARD_SIZE
+    data = bytearray([len(record.moves)])
+    for move in record.moves:
+        data.append(move["x"] * size + move["y"])
+    return bytes(data)
+
+
+def write_binary(stream, records):
+    """棋譜をバイナリ形式で連続して書き出す"""
+    for record in records:
+        stream.write(encode_binary(record))
+
+
+def iter_binary(stream):
+    """バイナリ形式の棋譜を1局ずつ読み込むジェネレータ"""
+    size = Constants.BOARD_SIZE
+    while True:
+        header = stream.read(1)
+        if not header:
+            return
+        data = stream.read(header[0])
+        if len(data) < header[0]:
+            raise ValueError("棋譜データが途中で途切れています")
+        yield GameRecord(_assign_colors([divmod(code, size) for code in data]))
@@ -8,6 +8,11 @@ from renderer import Renderer
 from game_analyzer import GameAnalyzer
 
 
+def format_score(score):
+    """評価値を符号付きの短い文字列にする"""
+    return f"{score:+.0f}"
+
+
 class GameReviewer:
     """ゲーム終了後にオセロを振り返るためのクラス"""
 
@@ -16,32 +21,36 @@ class GameReviewer:
         self.full_history = move_history
         self.current_step = len(move_history)
 
-        self.logic = GameLogic()
+        # GameLogic は1つを使い回し、手数を移動するたびに初期状態から打ち直す。
+        # 再現はアニメーションなしで行う
+        self.logic = GameLogic(pygame.time.get_ticks)
+        self.logic.state.turbo = True
         self.renderer = Renderer(self.screen, self.logic, None)
 
         # ★追加: 分析機とアドバイス保持用の変数
         self.analyzer = GameAnalyzer()
         self.current_advice = None  # (x, y) または None
+        self.current_analysis = []  # 上位の候補手と評価値 (GameAnalyzer.analyze_moves)
         self.is_analyzing = False  # 計算中フラグ（フリーズ防止のUI用）
 
         self.font = pygame.font.SysFont(None, 36)
+        self.score_font = pygame.font.SysFont(None, 24)
 
         self.replay_to_step(self.current_step)
 
     def replay_to_step(self, step):
         """指定した手数まで盤面を再現する"""
-        self.logic = GameLogic()
-        self.renderer.game_logic = self.logic
+        self.logic.reset()
 
         # ★追加: 盤面が変わったらアドバイスはクリアする
         self.current_advice = None
+        self.current_analysis = []
         self.is_analyzing = False
 
         for i in range(step):
             if i < len(self.full_history):
                 move = self.full_history[i]
                 self.logic.place_stone(move["x"], move["y"])
-                self.logic.state.is_animating = False
 
     def handle_event(self, event):
         """キー操作などの処理"""
@@ -78,8 +87,10 @@ class GameReviewer:
         self.draw_ui()  # "Thinking..." を表示させるために一度描画更新
         pygame.display.flip()
 
-        # AIに計算させる
-        self.current_advice = self.analyzer.analyze(self.logic)
+        # AIに計算させる（上位3手の評価値もまとめて求める）
+        self.current_analysis = self.analyzer.analyze_moves(self.logic, num_moves=3)
+        if self.current_analysis:
+            self.current_advice = self.current_analysis[0]["move"]
         self.is_analyzing = False
 
     def draw_ui(self):
@@ -113,13 +124,33 @@ class GameReviewer:
         elif self.current_advice:
             ax, ay = self.current_advice
 
+            # 候補手ごとの評価値をマスの上に表示する（上界しか分からない手は "<=" 付き）
+            for result in self.current_analysis:
+                if result["score"] is None:
+                    continue
+                mx, my = result["move"]
+                label = format_score(result["score"])
+                if result["bound"] == "upper":
+                    label = "<=" + label
+                text_score = self.score_font.render(label, True, (255, 215, 0))
+                score_rect = text_score.get_rect(
+                    center=(
+                        mx * Constants.GRID_SIZE + Constants.GRID_SIZE // 2,
+                        my * Constants.GRID_SIZE + Constants.GRID_SIZE // 2 + 22,
+                    )
+                )
+                self.screen.blit(text_score, score_rect)
+
             # 1. 金色の円を描画
             center_x = ax * Constants.GRID_SIZE + Constants.GRID_SIZE // 2
             center_y = ay * Constants.GRID_SIZE + Constants.GRID_SIZE // 2
             pygame.draw.circle(self.screen, (255, 215, 0), (center_x, center_y), 15, 4)
 
             # 2. 座標を画面下のUIエリアに表示
-            advice_text = self.font.render(f"Advice: ({ax}, {ay})", True, (255, 215, 0))
+            advice_str = f"Advice: ({ax}, {ay})"
+            if self.current_analysis and self.current_analysis[0]["score"] is not None:
+                advice_str += f" {format_score(self.current_analysis[0]['score'])}"
+            advice_text = self.font.render(advice_str, True, (255, 215, 0))
             # 画面中央より少し右に表示
             self.screen.blit(
                 advice_text, (Constants.SIZE // 2 + 50, Constants.SIZE + 10)
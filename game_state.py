@@ -1,24 +1,62 @@
-import pygame
+import time
 from constants import Constants
 from board import Board
+from animation import AnimationScheduler
+
+
+def monotonic_ticks():
+    """起動からの経過時間をミリ秒で返す（pygame.time.get_ticks の代わり）"""
+    return int(time.monotonic() * 1000)
 
 
 class GameState:
-    """ゲームの状態を管理するクラス"""
+    """ゲームの状態を管理するクラス
+
+    時刻の取得は get_ticks で差し替えられる。pygameを使う画面側からは
+    pygame.time.get_ticks を渡し、サーバーやAIの計算ではpygameを読み込まない。
+    """
 
-    def __init__(self):
+    __slots__ = (
+        "get_ticks",
+        "board",
+        "turn",
+        "game_over",
+        "animation_queue",
+        "is_animating",
+        "message",
+        "message_time",
+        "pass_occurred",
+        "move_history",
+        "paused",
+        "turbo",
+        "last_frame_time",
+    )
+
+    def __init__(self, get_ticks=None):
         """ゲーム状態の初期化"""
+        self.get_ticks = get_ticks or monotonic_ticks
         self.board = Board()
+        self.animation_queue = AnimationScheduler()
+        self.turbo = False  # True ならアニメーションせずに即座に反映する
+        self.reset()
+
+    def reset(self):
+        """対局を初期状態に戻す
+
+        盤面とアニメーションキューは作り直さずに中身だけ戻す。
+        ターボモードの設定は対局をまたいで保持する。
+        """
+        self.board.reset()
         self.turn = Constants.BLACK  # 初期ターンは黒
         self.game_over = False
-        self.animation_queue = []
+        self.animation_queue.clear()
         self.is_animating = False
         self.message = None
         self.message_time = 0
         self.pass_occurred = False
         self.move_history = []
         self.paused = False
-        self.last_frame_time = pygame.time.get_ticks()  # フレーム時間管理用
+        self.last_frame_time = self.get_ticks()  # フレーム時間管理用
 
     def switch_turn(self):
         """ターンを交代"""
@@ -27,12 +65,12 @@ class GameState:
     def set_message(self, text):
         """一時的なメッセージをセット"""
         self.message = text
-        self.message_time = pygame.time.get_ticks()
+        self.message_time = self.get_ticks()
 
     def update_message(self):
         """メッセージの表示時間を管理"""
         if self.message:
-            current_time = pygame.time.get_ticks()
+            current_time = self.get_ticks()
             if current_time - self.message_time > Constants.MESSAGE_DURATION:
                 self.message = None
 
@@ -42,7 +80,7 @@ class GameState:
 
     def calculate_delta_time(self):
         """前回フレームからの経過時間を計算（秒単位）"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.get_ticks()
         delta_time = (
             current_time - self.last_frame_time
         ) / 1000.0  # ミリ秒から秒に変換
@@ -13,7 +13,7 @@ async def main_async():
     clock = pygame.time.Clock()
 
     # ゲームコントローラーの初期化
-    game_controller = GameController(Constants.AI_TYPE_MEDIUM, screen)
+    game_controller = GameController(Constants.AI_TYPE_MINIMAX, screen)
 
     running = True
     while running:
@@ -55,15 +55,21 @@ def main():
     # 中級 AI_TYPE_MINIMAX = "minimax"
     # 上級 AI_TYPE_STRONGER = "stronger"
     # 最上級 AI_TYPE_WORLD = "world"
-    controller = GameController(Constants.AI_TYPE_WORLD, screen)
+    # モンテカルロ木探索 AI_TYPE_MCTS = "mcts"
+    # AIの探索は子プロセスで行い、描画ループを止めない
+    controller = GameController(Constants.AI_TYPE_WORLD, screen, use_process=True)
     controller.run()
 
 
 if __name__ == "__main__":
     # Pygbag環境で実行する場合はasyncio.run(main_async())を使用
     # それ以外の環境では通常のmain()を使用
+    import multiprocessing
     import platform
 
+    # PyInstaller でexe化した場合に子プロセスが main を再実行しないようにする
+    multiprocessing.freeze_support()
+
     if platform.system() == "Emscripten":  # Pygbag環境の判定
         asyncio.run(main_async())
     else:
@@ -0,0 +1,57 @@
+import threading
+from collections import OrderedDict
+
+
+class MoveCache:
+    """合法手リストのキャッシュ（上限つき、古いものから捨てる LRU）
+
+    キーは (盤面のハッシュ, 手番)。ゲームロジックとAIで同じインスタンスを共有する。
+    AIの思考スレッドとメインスレッドから同時に使われるため、
+    辞書と統計の更新はロックの中で行う。
+    """
+
+    def __init__(self, max_size=1 << 16):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """キャッシュ済みの手のリストを返す（無ければ None）"""
+        with self._lock:
+            moves = self._entries.get(key)
+            if moves is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return moves
+
+    def put(self, key, moves):
+        """手のリストを登録し、上限を超えたら最も古いものを捨てる"""
+        with self._lock:
+            self._entries[key] = moves
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self):
+        """ヒット率（まだ一度も引いていなければ 0.0）"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return hits / total if total else 0.0
+
+
+# ゲームロジックとAIが共有するキャッシュ
+shared_move_cache = MoveCache()
@@ -0,0 +1,211 @@
+import json
+import os
+import random
+import numpy as np
+from constants import Constants
+from game_logic import GameLogic
+from game_record import GameRecord, iter_positions
+from ai.bitboard import board_to_bitboards
+from ai.world_class_ai import WorldAI, AI_BLACK, AI_WHITE
+
+# 列ごとのデータ型（1列 = 1ファイル）
+COLUMNS = {
+    "black": np.uint64,  # 黒石のビットボード
+    "white": np.uint64,  # 白石のビットボード
+    "side": np.int8,  # 手番 (黒: 1, 白: -1)
+    "ply": np.uint8,  # 何手目か（0始まり）
+    "final_score": np.int8,  # 最終石数差（手番側から見た値）
+    "search_score": np.float32,  # 探索による評価値（無ければ NaN）
+}
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+
+def _chunk_file(path, chunk_name, column):
+    return os.path.join(path, f"{chunk_name}.{column}.npy")
+
+
+class PositionDatasetWriter:
+    """局面を列ごとの .npy ファイルにチャンク単位で書き出すクラス
+
+    1局面あたり (黒, 白, 手番, 手数, 最終スコア, 探索スコア) を保持する。
+    チャンクが一杯になるたびにファイルへ書き出し、index.json に一覧を記録する。
+    既存のデータセットに対して開いた場合は末尾に追加する。
+    """
+
+    def __init__(self, path, chunk_size=1 << 20):
+        self.path = path
+        self.chunk_size = chunk_size
+        os.makedirs(path, exist_ok=True)
+
+        self.chunks = []
+        index_path = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as f:
+                self.chunks = json.load(f)["chunks"]
+
+        self._buffer = {
+            name: np.empty(chunk_size, dtype=dtype) for name, dtype in COLUMNS.items()
+        }
+        self._count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_position(
+        self, black, white, side, ply, final_score, search_score=float("nan")
+    ):
+        """1局面を追加する"""
+        i = self._count
+        buffer = self._buffer
+        buffer["black"][i] = black
+        buffer["white"][i] = white
+        buffer["side"][i] = side
+        buffer["ply"][i] = ply
+        buffer["final_score"][i] = final_score
+        buffer["search_score"][i] = search_score
+        self._count += 1
+        if self._count == self.chunk_size:
+            self.flush()
+
+    def add_game(self, record, search_scores=None):
+        """棋譜 (GameRecord) の全局面を追加する
+
+        search_scores を渡す場合は各手の直前局面に対する手番側視点の評価値のリスト。
+        """
+        final_score = record.score()  # 黒視点
+        for ply, (board, color, _) in enumerate(iter_positions(record)):
+            black, white = board_to_bitboards(board, Constants.BLACK, Constants.WHITE)
+            side = 1 if color == Constants.BLACK else -1
+            score = float("nan")
+            if search_scores is not None and search_scores[ply] is not None:
+                score = search_scores[ply]
+            self.add_position(black, white, side, ply, final_score * side, score)
+
+    def flush(self):
+        """バッファ中の局面を新しいチャンクとして書き出す"""
+        if self._count == 0:
+            return
+        chunk_name = f"chunk_{len(self.chunks):05d}"
+        for name, values in self._buffer.items():
+            np.save(_chunk_file(self.path, chunk_name, name), values[: self._count])
+        self.chunks.append({"name": chunk_name, "count": self._count})
+        self._count = 0
+        self._write_index()
+
+    def _write_index(self):
+        """インデックスを書き換える（途中で落ちても壊れないよう置き換えで更新）"""
+        index = {
+            "version": INDEX_VERSION,
+            "columns": {name: np.dtype(dtype).str for name, dtype in COLUMNS.items()},
+            "chunks": self.chunks,
+            "total": sum(chunk["count"] for chunk in self.chunks),
+        }
+        index_path = os.path.join(self.path, INDEX_FILE)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp_path, index_path)
+
+    def close(self):
+        """残りの局面を書き出す"""
+        self.flush()
+
+
+class PositionDataset:
+    """PositionDatasetWriter で書き出したデータセットを読み込むクラス
+
+    各チャンクはメモリマップで開くため、必要になるまでディスクから読み込まれない。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE), encoding="utf-8") as f:
+            index = json.load(f)
+        if index["version"] != INDEX_VERSION:
+            raise ValueError(
+                f"対応していないデータセットのバージョンです: {index['version']}"
+            )
+        self.chunks = index["chunks"]
+        self.total = index["total"]
+
+    def __len__(self):
+        return self.total
+
+    def load_chunk(self, chunk_index, columns=None):
+        """チャンクを {列名: メモリマップ配列} として返す"""
+        chunk_name = self.chunks[chunk_index]["name"]
+        columns = columns or list(COLUMNS)
+        return {
+            name: np.load(_chunk_file(self.path, chunk_name, name), mmap_mode="r")
+            for name in columns
+        }
+
+    def iter_chunks(self, columns=None):
+        """チャンクを順に返すジェネレータ"""
+        for chunk_index in range(len(self.chunks)):
+            yield self.load_chunk(chunk_index, columns)
+
+    def __iter__(self):
+        """1局面ずつ (黒, 白, 手番, 手数, 最終スコア, 探索スコア) を返す"""
+        for chunk in self.iter_chunks():
+            yield from zip(
+                *(chunk[name].tolist() for name in COLUMNS),
+            )
+
+
+def play_self_play_game(black_ai, white_ai, time_limit=0.1, random_moves=4, rng=None):
+    """WorldAI 同士で1局打ち、(棋譜, 各手の探索スコア) を返す
+
+    序盤の random_moves 手はランダムに打ち、対局ごとに局面を散らす。
+    探索スコアは反復深化で登録されたルート局面の評価値（無ければ None）。
+    トランスポジションテーブルは手番側の視点で値を持つため、AIは色ごとに分ける。
+    """
+    rng = rng or random.Random()
+    logic = GameLogic()
+    board = logic.state.board.cells
+    color = Constants.BLACK
+    moves = []
+    search_scores = []
+    while True:
+        valid_moves = logic.get_valid_moves(color, board)
+        if not valid_moves:
+            color = Constants.WHITE if color == Constants.BLACK else Constants.BLACK
+            if not logic.get_valid_moves(color, board):
+                break
+            continue
+
+        score = None
+        if len(moves) < random_moves:
+            move = rng.choice(valid_moves)
+        else:
+            ai = black_ai if color == Constants.BLACK else white_ai
+            ai_board = ai._convert_board(board)
+            ai_player = AI_BLACK if color == Constants.BLACK else AI_WHITE
+            move = ai.get_move(ai_board, ai_player, time_limit)
+            entry = ai.transposition_table.get(ai.hash_board(ai_board))
+            if entry is not None and entry["best_move"] == move:
+                score = entry["value"]
+
+        board = logic.make_move_for_board(board, move[0], move[1], color)
+        moves.append({"x": move[0], "y": move[1], "color": color})
+        search_scores.append(score)
+        color = Constants.WHITE if color == Constants.BLACK else Constants.BLACK
+
+    return GameRecord(moves), search_scores
+
+
+def write_self_play_games(writer, num_games, time_limit=0.1, seed=None):
+    """自己対局を num_games 局行い、その全局面をデータセットに追加する"""
+    rng = random.Random(seed)
+    black_ai = WorldAI(None)
+    white_ai = WorldAI(None)
+    for _ in range(num_games):
+        record, search_scores = play_self_play_game(
+            black_ai, white_ai, time_limit, rng=rng
+        )
+        writer.add_game(record, search_scores)
@@ -1,6 +1,7 @@
 import math
 import pygame
 from constants import Constants
+from animation import FLIP, PLACE
 
 
 class Renderer:
@@ -228,16 +229,13 @@ class Renderer:
     def draw_animations(self):
         """アニメーションを描画"""
         for animation in self.game_logic.state.animation_queue:
-            if animation["type"] == "place":
-                x, y = animation["position"]
-                color = animation["color"]
-                progress = animation["progress"]
-                self.draw_stone(x, y, color, progress)
-            elif animation["type"] == "flip":
-                x, y = animation["position"]
-                from_color = animation["from_color"]
-                to_color = animation["to_color"]
-                progress = animation["progress"]
+            x, y = animation.x, animation.y
+            progress = min(animation.progress, 1.0)
+            if animation.kind == PLACE:
+                self.draw_stone(x, y, animation.to_color, progress)
+            elif animation.kind == FLIP:
+                from_color = animation.from_color
+                to_color = animation.to_color
 
                 # 進行度0.5を境に色を切り替え
                 if progress < 0.5:
@@ -0,0 +1,83 @@
+import unittest
+
+from animation import FLIP, PLACE, AnimationScheduler
+from board import Board
+from constants import Constants
+from game_logic import GameLogic
+from game_state import GameState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAnimation(unittest.TestCase):
+    def test_advance_concurrently(self):
+        """全てのアニメーションが同時に進み、delay の分だけ遅れて始まるか"""
+        board = Board()
+        scheduler = AnimationScheduler()
+        scheduler.add_place(2, 3, Constants.BLACK)
+        scheduler.add_flip(3, 3, Constants.WHITE, Constants.BLACK)
+        scheduler.add_flip(4, 3, Constants.WHITE, Constants.BLACK, delay=0.5)
+        scheduler.advance(1.0, board)
+        self.assertEqual(board.get_cell(3, 3), Constants.BLACK)
+        self.assertEqual([(a.position, a.progress) for a in scheduler], [((4, 3), 0.5)])
+        scheduler.advance(0.5, board)
+        self.assertFalse(scheduler)
+        self.assertEqual(board.get_cell(4, 3), Constants.BLACK)
+
+    def test_place_stone_queues_records(self):
+        """着手で置く石と返る石のアニメーションが登録されるか"""
+        clock = FakeClock()
+        logic = GameLogic(clock)
+        logic.place_stone(2, 3)
+        kinds = [(a.kind, a.position) for a in logic.state.animation_queue]
+        self.assertEqual(kinds, [(PLACE, (2, 3)), (FLIP, (3, 3))])
+
+        # 大きくフレームが遅れても1回の更新で全て終わる
+        clock.now += 1000
+        logic.update_animation()
+        self.assertFalse(logic.state.is_animating)
+        self.assertEqual(logic.state.board.get_cell(3, 3), Constants.BLACK)
+
+    def test_finish_animations(self):
+        logic = GameLogic(FakeClock())
+        logic.place_stone(2, 3)
+        logic.finish_animations()
+        self.assertFalse(logic.state.animation_queue)
+        self.assertEqual(logic.state.board.get_cell(3, 3), Constants.BLACK)
+        self.assertTrue(logic.place_stone(2, 2))
+
+    def test_stagger_by_distance(self):
+        """遠くの返る石ほど遅れて始まるか"""
+        logic = GameLogic(FakeClock())
+        board = logic.state.board
+        for x in range(1, 4):
+            board.set_cell(x, 0, Constants.WHITE)
+        board.set_cell(4, 0, Constants.BLACK)
+        logic.place_stone(0, 0)
+        delays = [a.delay for a in logic.state.animation_queue if a.kind == FLIP]
+        self.assertEqual(delays[0], 0)
+        self.assertEqual(delays, sorted(delays))
+        self.assertAlmostEqual(delays[2], 2 * Constants.ANIMATION_STAGGER)
+
+    def test_turbo(self):
+        """ターボモードではアニメーションせずに即座に反映されるか"""
+        logic = GameLogic(FakeClock())
+        logic.toggle_turbo()
+        logic.place_stone(2, 3)
+        self.assertFalse(logic.state.is_animating)
+        self.assertEqual(logic.state.board.get_cell(3, 3), Constants.BLACK)
+
+    def test_game_state_slots(self):
+        state = GameState(FakeClock())
+        with self.assertRaises(AttributeError):
+            state.unknown_attribute = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from board import RAYS, Board, build_rays
+from constants import Constants
+
+
+class TestBoardCodes(unittest.TestCase):
+    def test_codes_follow_cells(self):
+        """set_cell でコード列も更新されるか"""
+        board = Board()
+        self.assertEqual(board.count_stones(), (2, 2))
+        board.set_cell(2, 3, Constants.BLACK)
+        board.set_cell(3, 3, Constants.BLACK)
+        self.assertEqual(board.codes[2 * Constants.BOARD_SIZE + 3], 1)
+        self.assertEqual(board.codes[3 * Constants.BOARD_SIZE + 3], 1)
+        self.assertEqual(board.count_stones(), (4, 1))
+        self.assertEqual(board.code_rows()[3][4], 1)
+        self.assertEqual(board.code_rows()[4][4], -1)
+
+    def test_key_round_trip(self):
+        """key() の64バイトから同じ盤面を復元できるか"""
+        board = Board()
+        board.set_cell(2, 3, Constants.BLACK)
+        key = board.key()
+        self.assertEqual(len(key), 64)
+        restored = Board()
+        restored.load_key(key)
+        self.assertEqual(restored.cells, board.cells)
+        self.assertEqual(restored.key(), key)
+        self.assertNotEqual(Board().key(), key)
+
+    def test_set_cells_and_copy(self):
+        """set_cells / copy でもコード列が盤面と一致するか"""
+        board = Board()
+        cells = [[Constants.WHITE] * 8 for _ in range(8)]
+        cells[0][0] = None
+        board.set_cells(cells)
+        self.assertEqual(board.count_stones(), (0, 63))
+        copied = board.copy()
+        copied.set_cell(0, 0, Constants.BLACK)
+        self.assertEqual(board.key()[0], 0)
+        self.assertEqual(copied.count_stones(), (1, 63))
+
+
+class TestRays(unittest.TestCase):
+    def test_rays(self):
+        """各マスの列が盤内に収まり、方向の順に端まで続いているか"""
+        # 角からは3方向、辺の途中からは5方向、中央付近からは8方向
+        self.assertEqual(len(RAYS[0][0]), 3)
+        self.assertEqual(len(RAYS[0][3]), 5)
+        self.assertEqual(len(RAYS[3][3]), 8)
+        self.assertEqual(
+            RAYS[0][0][0], ((0, 1), (0, 2), (0, 3), (0, 4), (0, 5), (0, 6), (0, 7))
+        )
+        # 長さ1の列（(1, 1) から左上など）は含めない
+        self.assertNotIn(((0, 0),), RAYS[1][1])
+        for column in RAYS:
+            for rays in column:
+                for ray in rays:
+                    self.assertGreaterEqual(len(ray), 2)
+                    for x, y in ray:
+                        self.assertTrue(0 <= x < Constants.BOARD_SIZE)
+                        self.assertTrue(0 <= y < Constants.BOARD_SIZE)
+        self.assertEqual(len(build_rays(4)[0][0]), 3)
+        # min_length=1 なら長さ1の列も含める（隣接マスを求めるとき用）
+        self.assertIn(((0, 0),), build_rays(min_length=1)[1][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,289 @@
+import asyncio
+import base64
+import json
+import os
+import time
+import unittest
+
+from engine_server import (
+    MAX_SOLVE_EMPTIES,
+    EnginePool,
+    EngineServer,
+    RequestError,
+    _run_job,
+    encode_frame,
+    parse_board,
+    parse_player,
+    read_frame,
+)
+from game_record import square_name
+from ai.world_class_ai import AI_BLACK, AI_WHITE, WorldAI
+
+# 初期局面（x * 8 + y の順）
+INITIAL = "".join(
+    {(3, 3): "W", (4, 4): "W", (3, 4): "B", (4, 3): "B"}.get((x, y), ".")
+    for x in range(8)
+    for y in range(8)
+)
+
+# 空きマスが左上の4つだけの終盤局面
+ENDGAME = "..BBBBBB" + ".WBBBBBB" + "B" * 40 + "WWWWWWWW"
+
+
+def play_until(empties):
+    """初期局面から最後の合法手を打ち進め、空きマスが empties 個の (盤面, 手番) を返す"""
+    engine = WorldAI(None)
+    board = parse_board(INITIAL)
+    player = AI_BLACK
+    while sum(row.count(0) for row in board) > empties:
+        moves = engine.get_valid_moves(board, player)
+        if moves:
+            board = engine.make_move(board, moves[-1], player)
+        player = -player
+    return board, player
+
+
+def board_string(board):
+    codes = {AI_BLACK: "B", AI_WHITE: "W"}
+    return "".join(codes.get(cell, ".") for row in board for cell in row)
+
+
+class TestParsing(unittest.TestCase):
+    def test_parse_board(self):
+        """盤面文字列が x * 8 + y の順に読めるか"""
+        board = parse_board(INITIAL)
+        self.assertEqual(board[3][4], AI_BLACK)
+        self.assertEqual(board[3][3], AI_WHITE)
+        with self.assertRaises(RequestError):
+            parse_board("B" * 10)
+        with self.assertRaises(RequestError):
+            parse_board("X" * 64)
+
+    def test_parse_player(self):
+        self.assertEqual(parse_player("w"), AI_WHITE)
+        with self.assertRaises(RequestError):
+            parse_player("red")
+
+
+class TestSolveBudget(unittest.TestCase):
+    def test_solve_respects_time_limit(self):
+        """完全読みも time_limit を過ぎたら打ち切ってエラーを返すか"""
+        board, player = play_until(MAX_SOLVE_EMPTIES)
+        started = time.time()
+        result = _run_job(WorldAI(None), "solve", board, player, 0.3)
+        self.assertLess(time.time() - started, 2)
+        self.assertTrue(result.get("timeout"))
+        self.assertIn("error", result)
+
+
+class TestEnginePool(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.pool = EnginePool(workers=2, max_time_limit=5.0)
+        self.loop.run_until_complete(self.pool.start())
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.pool.stop())
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(asyncio.wait_for(coroutine, 30))
+
+    def test_batches_are_spread(self):
+        """一度にたまったジョブが空いているワーカー全員に分けて送られるか"""
+        sent = {}
+        for worker in self.pool.workers:
+            original = worker.send_batch
+
+            def record(batch, worker=worker, original=original):
+                sent.setdefault(worker, []).append(len(batch))
+                original(batch)
+
+            worker.send_batch = record
+        board = parse_board(INITIAL)
+
+        async def burst():
+            self.pool._dispatcher.cancel()
+            jobs = [
+                asyncio.ensure_future(
+                    self.pool.submit("bestmove", board, AI_BLACK, 0.05)
+                )
+                for _ in range(4)
+            ]
+            await asyncio.sleep(0)
+            self.pool._dispatcher = asyncio.create_task(self.pool._dispatch())
+            return await asyncio.gather(*jobs)
+
+        results = self.run_async(burst())
+        self.assertEqual(len(results), 4)
+        self.assertEqual(len(sent), 2)
+        self.assertEqual(sorted(sum(sizes) for sizes in sent.values()), [2, 2])
+
+    def test_crashed_worker(self):
+        """ワーカーが落ちたら送ったジョブがエラーになり、代わりのワーカーが動くか"""
+        board = parse_board(INITIAL)
+
+        async def crash():
+            job = asyncio.ensure_future(
+                self.pool.submit("bestmove", board, AI_BLACK, 5.0)
+            )
+            while not any(worker.pending for worker in self.pool.workers):
+                await asyncio.sleep(0.01)
+            busy = next(worker for worker in self.pool.workers if worker.pending)
+            busy.process.kill()
+            with self.assertRaises(RuntimeError):
+                await job
+            self.assertNotIn(busy, self.pool.workers)
+            self.assertEqual(len(self.pool.workers), 2)
+            # 代わりのワーカーも含めて問い合わせに答えられる
+            return await asyncio.gather(
+                *(self.pool.submit("bestmove", board, AI_BLACK, 0.05) for _ in range(4))
+            )
+
+        for result in self.run_async(crash()):
+            self.assertIn("move", result)
+
+
+class TestEngineServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+        cls.server = EngineServer(EnginePool(workers=2, max_time_limit=0.2), port=0)
+        cls.loop.run_until_complete(cls.server.start())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.run_until_complete(cls.server.stop())
+        cls.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(asyncio.wait_for(coroutine, 30))
+
+    async def http(self, method, path, payload=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+        body = b"" if payload is None else json.dumps(payload).encode()
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        status = int(head.split()[1])
+        return status, json.loads(body) if body else None
+
+    def test_health(self):
+        status, body = self.run_async(self.http("GET", "/health"))
+        self.assertEqual(status, 200)
+        self.assertEqual(body["workers"], 2)
+
+    def test_bestmove(self):
+        """初期局面で合法手が返るか"""
+        status, body = self.run_async(
+            self.http("POST", "/bestmove", {"board": INITIAL, "player": "B"})
+        )
+        self.assertEqual(status, 200)
+        self.assertIn(body["move"], ("d3", "c4", "f5", "e6"))
+
+    def test_solve(self):
+        """完全読みで最終石数差が返るか"""
+        status, body = self.run_async(
+            self.http("POST", "/solve", {"board": ENDGAME, "player": "W"})
+        )
+        self.assertEqual(status, 200)
+        self.assertIsInstance(body["score"], int)
+        self.assertIsNotNone(body["move"])
+
+    def test_endgame_budget(self):
+        """完全読みの範囲の局面でも bestmove / analyse が time_limit を守るか"""
+        board, player = play_until(14)
+        payload = {
+            "board": board_string(board),
+            "player": "B" if player == AI_BLACK else "W",
+            "time_limit": 0.2,
+        }
+        legal = {
+            square_name(x, y) for x, y in WorldAI(None).get_valid_moves(board, player)
+        }
+        for path in ("/bestmove", "/analyse"):
+            started = time.time()
+            status, body = self.run_async(self.http("POST", path, payload))
+            self.assertLess(time.time() - started, 3)
+            self.assertEqual(status, 200)
+            self.assertIn(body["move"], legal)
+
+    def test_bad_request(self):
+        status, body = self.run_async(self.http("POST", "/bestmove", {"board": "x"}))
+        self.assertEqual(status, 400)
+        self.assertIn("error", body)
+        status, _ = self.run_async(self.http("GET", "/unknown"))
+        self.assertEqual(status, 404)
+
+    def test_concurrent_requests(self):
+        """同時に投げた問い合わせが全て返るか"""
+
+        async def many():
+            return await asyncio.gather(
+                *(
+                    self.http(
+                        "POST",
+                        "/bestmove",
+                        {"board": INITIAL, "player": "B", "time_limit": 0.05},
+                    )
+                    for _ in range(6)
+                )
+            )
+
+        results = self.run_async(many())
+        self.assertTrue(all(status == 200 for status, _ in results))
+
+    def test_websocket(self):
+        """WebSocketでIDつきの問い合わせに答えるか"""
+
+        async def session():
+            reader, writer = await asyncio.open_connection(
+                "127.0.0.1", self.server.port
+            )
+            key = base64.b64encode(os.urandom(16)).decode()
+            writer.write(
+                (
+                    "GET /ws HTTP/1.1\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                    f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+                ).encode()
+            )
+            head = await reader.readuntil(b"\r\n\r\n")
+            self.assertIn(b"101", head.split(b"\r\n")[0])
+
+            message = json.dumps(
+                {
+                    "id": 7,
+                    "type": "analyse",
+                    "board": INITIAL,
+                    "player": "B",
+                    "multipv": 2,
+                }
+            ).encode()
+            # クライアントからのフレームはマスクする
+            mask = os.urandom(4)
+            masked = bytes(b ^ mask[i % 4] for i, b in enumerate(message))
+            frame = encode_frame(0x1, masked)
+            writer.write(bytes([frame[0], frame[1] | 0x80]) + frame[2 : -len(masked)])
+            writer.write(mask + masked)
+            await writer.drain()
+            opcode, payload = await read_frame(reader)
+            writer.write(encode_frame(0x8, b"\x03\xe8"))
+            await writer.drain()
+            writer.close()
+            return opcode, json.loads(payload)
+
+        opcode, reply = self.run_async(session())
+        self.assertEqual(opcode, 0x1)
+        self.assertEqual(reply["id"], 7)
+        self.assertIn("nodes", reply)
+        self.assertEqual(len(reply["lines"]), 2)
+        self.assertEqual(reply["lines"][0]["move"], reply["move"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from game_annotator import annotate_game, format_annotations
+from game_record import GameRecord
+
+TRANSCRIPT = "f5d6c3d3c4f4f6f3e6e7"
+
+
+class TestGameAnnotator(unittest.TestCase):
+    def setUp(self):
+        self.history = GameRecord.from_transcript(TRANSCRIPT).to_move_history()
+
+    def test_annotate_every_move(self):
+        """全ての手に最善手と損失が付くか"""
+        annotations = annotate_game(self.history, time_limit=0.05)
+        self.assertEqual([a["ply"] for a in annotations], list(range(10)))
+        for a, move in zip(annotations, self.history):
+            self.assertEqual(a["move"], (move["x"], move["y"]))
+            self.assertGreaterEqual(a["loss"], 0)
+            self.assertEqual(a["pv"][0], a["best_move"])
+            if a["move"] == a["best_move"]:
+                self.assertEqual(a["loss"], 0)
+        self.assertEqual(len(format_annotations(annotations).splitlines()), 10)
+
+    def test_blunder_threshold(self):
+        """損失がしきい値以上の手だけが悪手になるか"""
+        annotations = annotate_game(self.history, time_limit=0.05, blunder_eval=1)
+        for a in annotations:
+            self.assertEqual(a["blunder"], a["loss"] >= 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
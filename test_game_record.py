@@ -0,0 +1,93 @@
+import io
+import unittest
+
+from constants import Constants
+from game_record import (
+    GameRecord,
+    encode_binary,
+    format_ggf,
+    iter_binary,
+    iter_ggf,
+    iter_transcripts,
+    parse_square,
+    square_name,
+    write_binary,
+    write_ggf,
+    write_transcripts,
+)
+
+# 途中でパスが発生する60手の棋譜
+GAME_WITH_PASS = (
+    "c4c3c2c5c6e3f6b7e2f3d6e1a8e6f4g5g4f5h4d3g3g2h1f2d1h6d7d2h5c1"
+    "g1e7h7b3d8c7b1c8a3a4b4a5a6g6f1f8b5h2g7h3e8f7b8g8h8a7b2b6a1a2"
+)
+
+
+class TestGameRecord(unittest.TestCase):
+    def test_square_names(self):
+        """座標と "f5" 形式の相互変換"""
+        self.assertEqual(square_name(5, 4), "f5")
+        self.assertEqual(parse_square("F5"), (5, 4))
+        with self.assertRaises(ValueError):
+            parse_square("z9")
+
+    def test_transcript_round_trip(self):
+        """テキスト棋譜の読み書き"""
+        record = GameRecord.from_transcript("f5d6c3")
+        self.assertEqual(
+            record.moves,
+            [
+                {"x": 5, "y": 4, "color": Constants.BLACK},
+                {"x": 3, "y": 5, "color": Constants.WHITE},
+                {"x": 2, "y": 2, "color": Constants.BLACK},
+            ],
+        )
+        self.assertEqual(record.to_transcript(), "f5d6c3")
+
+    def test_illegal_move_is_rejected(self):
+        """打てない手を含む棋譜はエラーになる"""
+        with self.assertRaises(ValueError):
+            GameRecord.from_transcript("a1")
+
+    def test_streaming_transcripts(self):
+        """1行1局のファイルを1局ずつ読み込めるか"""
+        records = [GameRecord.from_transcript(GAME_WITH_PASS)] * 3
+        stream = io.StringIO()
+        write_transcripts(stream, records)
+        stream.seek(0)
+        self.assertEqual(list(iter_transcripts(stream)), records)
+
+    def test_ggf_round_trip(self):
+        """GGFの読み書き（パスを含む）"""
+        record = GameRecord.from_transcript(
+            GAME_WITH_PASS, black_player="alice", white_player="bob"
+        )
+        text = format_ggf(record)
+        self.assertIn("[PA]", text)
+        # 小さなチャンクで読ませ、局の境界がチャンクをまたいでも読めることを確認
+        stream = io.StringIO()
+        write_ggf(stream, [record, record])
+        stream.seek(0)
+        parsed = list(iter_ggf(stream, chunk_size=7))
+        self.assertEqual(parsed, [record, record])
+        self.assertEqual(parsed[0].black_player, "alice")
+        self.assertEqual(parsed[0].score(), record.score())
+
+    def test_ggf_skips_unsupported_games(self):
+        """対応していない局は読み飛ばされる"""
+        stream = io.StringIO("(;GM[Othello]TY[10]B[f5];)(;GM[Othello]B[f5]W[d6];)")
+        parsed = list(iter_ggf(stream))
+        self.assertEqual([r.to_transcript() for r in parsed], ["f5d6"])
+
+    def test_binary_round_trip(self):
+        """1手1バイトのバイナリ形式の読み書き"""
+        record = GameRecord.from_transcript(GAME_WITH_PASS)
+        self.assertEqual(len(encode_binary(record)), len(record) + 1)
+        stream = io.BytesIO()
+        write_binary(stream, [record, record])
+        stream.seek(0)
+        self.assertEqual(list(iter_binary(stream)), [record, record])
+
+
+if __name__ == "__main__":
+    unittest.main()
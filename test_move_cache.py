@@ -0,0 +1,56 @@
+import threading
+import unittest
+
+from constants import Constants
+from game_logic import GameLogic
+from move_cache import MoveCache
+
+
+class TestMoveCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """上限を超えると最も長く使われていないものが捨てられるか"""
+        cache = MoveCache(max_size=2)
+        cache.put("a", [1])
+        cache.put("b", [2])
+        self.assertEqual(cache.get("a"), [1])
+        cache.put("c", [3])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), [1])
+        self.assertEqual(len(cache), 2)
+        self.assertAlmostEqual(cache.hit_rate, 2 / 3)
+
+    def test_threads(self):
+        """複数のスレッドから同時に使っても壊れず、統計が合うか"""
+        cache = MoveCache(max_size=8)
+
+        def work(offset):
+            for i in range(5000):
+                key = (i + offset) % 32
+                if cache.get(key) is None:
+                    cache.put(key, [key])
+
+        threads = [threading.Thread(target=work, args=(k,)) for k in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(cache.hits + cache.misses, 4 * 5000)
+        self.assertLessEqual(len(cache), 8)
+
+    def test_game_logic_uses_cache(self):
+        """同じ盤面の2回目はキャッシュから返り、書き換えても影響しないか"""
+        cache = MoveCache()
+        logic = GameLogic(move_cache=cache)
+        moves = logic.get_valid_moves(Constants.BLACK)
+        self.assertEqual(len(moves), 4)
+        moves.clear()
+        self.assertEqual(len(logic.get_valid_moves(Constants.BLACK)), 4)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        x, y = logic.get_valid_moves(Constants.BLACK)[0]
+        board = logic.make_move_for_board(logic.board, x, y, Constants.BLACK)
+        self.assertEqual(len(logic.get_valid_moves(Constants.WHITE, board)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
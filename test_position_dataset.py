@@ -0,0 +1,78 @@
+import math
+import random
+import tempfile
+import unittest
+
+from game_record import GameRecord
+from position_dataset import (
+    PositionDataset,
+    PositionDatasetWriter,
+    play_self_play_game,
+)
+from ai.world_class_ai import WorldAI
+
+TRANSCRIPT = "f5d6c3d3c4f4f6f3e6e7"
+
+
+class TestPositionDataset(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_write_and_read_chunks(self):
+        """チャンクをまたいで書き出した局面が順番通りに読めるか"""
+        with PositionDatasetWriter(self.path, chunk_size=4) as writer:
+            for i in range(10):
+                writer.add_position(1 << i, 1 << (63 - i), 1 if i % 2 else -1, i, i)
+
+        dataset = PositionDataset(self.path)
+        self.assertEqual(len(dataset), 10)
+        self.assertEqual(len(dataset.chunks), 3)
+        rows = list(dataset)
+        self.assertEqual(rows[3][:5], (1 << 3, 1 << 60, 1, 3, 3))
+        self.assertEqual(rows[9][1], 1 << 54)
+        self.assertTrue(math.isnan(rows[0][5]))
+
+    def test_append_to_existing_dataset(self):
+        """既存のデータセットに追記できるか"""
+        with PositionDatasetWriter(self.path, chunk_size=4) as writer:
+            writer.add_position(1, 2, 1, 0, 0)
+        with PositionDatasetWriter(self.path, chunk_size=4) as writer:
+            writer.add_position(3, 4, -1, 1, 0)
+        dataset = PositionDataset(self.path)
+        self.assertEqual([row[0] for row in dataset], [1, 3])
+
+    def test_add_game(self):
+        """棋譜の全局面が手番側視点のスコア付きで追加されるか"""
+        record = GameRecord.from_transcript(TRANSCRIPT)
+        scores = [float(i) for i in range(len(record))]
+        with PositionDatasetWriter(self.path) as writer:
+            writer.add_game(record, scores)
+
+        chunk = PositionDataset(self.path).load_chunk(0)
+        self.assertEqual(len(chunk["ply"]), len(record))
+        self.assertEqual(int(chunk["black"][0]), (1 << 28) | (1 << 35))
+        self.assertEqual(int(chunk["white"][0]), (1 << 27) | (1 << 36))
+        self.assertEqual(list(chunk["side"][:2]), [1, -1])
+        final = record.score()
+        self.assertEqual(list(chunk["final_score"][:2]), [final, -final])
+        self.assertEqual(float(chunk["search_score"][4]), 4.0)
+
+    def test_self_play_game(self):
+        """自己対局で終局まで打てるか（テスト時間短縮のため終盤以外はランダム）"""
+        record, scores = play_self_play_game(
+            WorldAI(None),
+            WorldAI(None),
+            time_limit=0.01,
+            random_moves=54,
+            rng=random.Random(1),
+        )
+        self.assertGreater(len(record), 40)
+        self.assertEqual(len(scores), len(record))
+
+
+if __name__ == "__main__":
+    unittest.main()